@@ -1,16 +1,372 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Iterator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from psycopg2.extensions import connection as PGConnection
 
-from app.core.database import get_db
-from app.schemas.storm import StormCollection
-from app.services.storm_service import StormService
+from app.core.admission import admission_control
+from app.core.compression import encode_body, negotiate_encoding
+from app.core.conditional import dataset_validators, is_not_modified
+from app.core.config import settings
+from app.core.database import get_db, lift_statement_timeout
+from app.core.profiling import ProfiledRoute
+from app.core.timing import stage
+from app.schemas.storm import (
+    NearbyStormCollection,
+    Snapshot,
+    Storm,
+    StormBatchRequest,
+    StormCollection,
+    StormSearchResults,
+)
+from app.services.export import copy_query, stream_copy
+from app.services.formats import negotiate_media_type
+from app.services.simplify import tolerance_for_zoom
+from app.services.storm_service import (
+    STORM_METADATA_COLUMNS,
+    STORM_SERIES_COLUMNS,
+    StormService,
+    encode_collection,
+    month_cache_key,
+    series_columns,
+)
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Parse a comma-separated ``fields`` parameter into time series names in schema order.
+
+    Storm identifiers and metadata are always returned, so naming them is
+    accepted but has no effect. Unknown names are rejected with 422.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(STORM_SERIES_COLUMNS) - set(STORM_METADATA_COLUMNS) - {"ID"}
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return tuple(field for field in STORM_SERIES_COLUMNS if field in requested)
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """Parse ``minlon,minlat,maxlon,maxlat``, rejecting malformed boxes with 422.
+
+    ``minlon > maxlon`` is allowed and denotes a box spanning the antimeridian.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="bbox must be minlon,minlat,maxlon,maxlat")
+    if not all(-180 <= lon <= 180 for lon in (min_lon, max_lon)):
+        raise HTTPException(status_code=422, detail="bbox longitudes must be within [-180, 180]")
+    if not -90 <= min_lat <= max_lat <= 90:
+        raise HTTPException(
+            status_code=422, detail="bbox latitudes must satisfy -90 <= minlat <= maxlat <= 90"
+        )
+    return min_lon, min_lat, max_lon, max_lat
+
+
+@router.get(
+    "/storms",
+    response_model=StormCollection,
+    dependencies=[Depends(admission_control("storms_bbox"))],
+)
+def get_storms_in_bbox(
+    request: Request,
+    bbox: str = Query(
+        ...,
+        description="minlon,minlat,maxlon,maxlat; minlon > maxlon spans the antimeridian",
+        examples=["120,5,160,35"],
+    ),
+    start: datetime | None = Query(None, description="Earliest genesis time (inclusive)"),
+    end: datetime | None = Query(None, description="Latest genesis time (exclusive)"),
+    fields: str | None = Query(
+        None,
+        description="Comma-separated time series to return (e.g. time,lat,lon,wind); all if omitted",
+    ),
+    db: PGConnection = Depends(get_db),
+) -> Response:
+    """Get all storms whose tracks pass through a bounding box
+
+    A storm matches if any segment between consecutive track points
+    intersects the box, even when no observation falls inside it.
+    """
+    box = parse_bbox(bbox)
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
+    series = parse_fields(fields)
+
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    collection = StormService(db).get_storms_in_bbox(box, start, end, series)
+    body, applied = encode_body(encode_collection(collection, media_type, series), encoding)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@router.get(
+    "/storms/near",
+    response_model=NearbyStormCollection,
+    dependencies=[Depends(admission_control("storms_near"))],
+)
+def get_storms_near(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the location (degrees)"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude of the location (degrees)"),
+    radius_km: float = Query(..., gt=0, le=20_000, description="Search radius (km)"),
+    start: datetime | None = Query(None, description="Earliest genesis time (inclusive)"),
+    end: datetime | None = Query(None, description="Latest genesis time (exclusive)"),
+    fields: str | None = Query(
+        None,
+        description="Comma-separated time series to return (e.g. time,lat,lon,wind); all if omitted",
+    ),
+    db: PGConnection = Depends(get_db),
+) -> Response:
+    """Get all storms passing within a distance of a location, nearest first
+
+    Each storm comes with the time, position and great-circle distance of its
+    closest approach, measured along the track between observations.
+    """
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
+    series = parse_fields(fields)
+
+    collection = StormService(db).get_storms_near(lat, lon, radius_km, start, end, series)
+    unrequested = set(STORM_SERIES_COLUMNS) - set(series_columns(series))
+    body = collection.model_dump_json(exclude={"storms": {"__all__": {"storm": unrequested}}})
+    body, applied = encode_body(body.encode("utf-8"), negotiate_encoding(request.headers.get("accept-encoding")))
+    headers = {"Vary": "Accept-Encoding"}
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/storms/search",
+    response_model=StormSearchResults,
+    dependencies=[Depends(admission_control("storms_search"))],
+)
+def search_storms(
+    q: str = Query(..., min_length=1, max_length=50, description="Prefix of a storm name, ID or ATCF ID"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of storms to return"),
+    after: str | None = Query(None, max_length=50, description="`next_after` of the previous page"),
+    db: PGConnection = Depends(get_db),
+) -> StormSearchResults:
+    """Search storms by name, ID or ATCF ID prefix, ignoring case
+
+    Returns lightweight summaries without time series.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=422, detail="q must not be blank")
+    return StormService(db).search_storms(q, limit, after)
+
 
-router = APIRouter()
+@router.get(
+    "/snapshot",
+    response_model=Snapshot,
+    dependencies=[Depends(admission_control("snapshot"))],
+)
+def get_snapshot(
+    time: datetime = Query(..., description="Instant of the snapshot (UTC unless an offset is given)"),
+    db: PGConnection = Depends(get_db),
+) -> Snapshot:
+    """Get the position of every storm active at an instant
 
+    Positions, winds and pressures are interpolated between the observations
+    surrounding the instant; storms are included from their first to their
+    last observation.
+    """
+    return StormService(db).get_snapshot(time)
+
+
+@router.get(
+    "/storms/{year}/{month}",
+    response_model=StormCollection,
+    dependencies=[Depends(admission_control("storms_month"))],
+)
+def get_storms(
+    request: Request,
+    year: int = Path(..., ge=1, le=9998),
+    month: int = Path(..., ge=1, le=12),
+    tolerance: float | None = Query(
+        None, gt=0, description="Simplify tracks to this tolerance (degrees)"
+    ),
+    zoom: int | None = Query(
+        None, ge=0, le=22, description="Simplify tracks to one pixel at this web map zoom level"
+    ),
+    fields: str | None = Query(
+        None,
+        description="Comma-separated time series to return (e.g. time,lat,lon,wind); all if omitted",
+    ),
+    db: PGConnection = Depends(get_db),
+) -> Response:
+    """Get all storms for a given calendar month
+
+    Besides JSON, the storms can be requested in a columnar binary layout with
+    ``Accept: application/vnd.apache.arrow.stream`` or ``application/msgpack``.
+    """
+    if tolerance is not None and zoom is not None:
+        raise HTTPException(status_code=422, detail="Specify at most one of tolerance and zoom")
+    if zoom is not None:
+        # One cache entry per zoom level
+        tolerance = tolerance_for_zoom(zoom)
+    series = parse_fields(fields)
+
+    service = StormService(db)
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"Cache-Control": settings.STORM_CACHE_CONTROL, "Vary": "Accept, Accept-Encoding"}
+
+    # Read the dataset version once: the ETag, the cached payload and its
+    # compressed variants must all belong to the same version. With the
+    # in-memory backend it is the version of the snapshot the body comes from.
+    dataset = service.dataset_version()
+    representation = service.month_representation(tolerance, series, media_type)
+    cache_key = month_cache_key(dataset.version, year, month, representation)
+    # Each media type and content coding is a distinct representation with its own strong ETag
+    validators = dataset_validators(
+        dataset, "storms_month", year, month, representation, encoding or "identity"
+    )
+    if validators is not None:
+        headers.update(validators.headers)
+        if is_not_modified(request.headers, validators):
+            # Answered from the dataset version alone; the storm query never runs
+            return Response(status_code=304, headers=headers)
+
+    # Already serialized (and possibly cached); returned without re-validation
+    body = service.get_month_payload(year, month, tolerance, series, media_type, cache_key=cache_key)
+    with stage("compress"):
+        body, applied = encode_body(body, encoding, cache_key=cache_key)
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@router.get(
+    "/storms/range",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    dependencies=[Depends(admission_control("storms_range"))],
+)
+def get_storms_range(
+    start: datetime = Query(..., description="Earliest genesis time (inclusive)"),
+    end: datetime = Query(..., description="Latest genesis time (exclusive)"),
+    itersize: int | None = Query(
+        None, ge=1, le=100_000, description="Rows fetched per database round trip"
+    ),
+    db: PGConnection = Depends(get_db),
+) -> StreamingResponse:
+    """Stream all storms with genesis in [start, end) as newline-delimited JSON
+
+    One Storm object per line, ordered by genesis. Suitable for season or
+    multi-decade exports: rows are read from a server-side cursor and each
+    storm is sent as soon as it is complete.
+    """
+    if end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
 
-@router.get("/storms/{year}/{month}", response_model=StormCollection)
-def get_storms(year: int, month: int, db: PGConnection = Depends(get_db)) -> StormCollection:
-    """Get all storms for a given calendar month"""
     service = StormService(db)
-    return service.get_storms_by_month(year, month)
 
+    def lines() -> Iterator[bytes]:
+        for storm in service.iter_storms_by_genesis(start, end, itersize):
+            yield storm.model_dump_json().encode("utf-8") + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/storms/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/gzip": {}, "text/csv": {}}}},
+    dependencies=[Depends(admission_control("storms_export"))],
+)
+def export_storms(
+    basin: str | None = Query(None, max_length=10, description="Only storms formed in this basin"),
+    season_from: int | None = Query(None, description="Earliest season (inclusive)"),
+    season_to: int | None = Query(None, description="Latest season (inclusive)"),
+    compression: Literal["gzip", "none"] = Query("gzip"),
+    db: PGConnection = Depends(get_db),
+) -> StreamingResponse:
+    """Export track points as CSV, one row per storms table row
+
+    Streams the output of PostgreSQL ``COPY ... TO STDOUT`` directly, for
+    bulk analytics downloads of the whole archive.
+    """
+    # The COPY runs as long as the client takes to read it
+    lift_statement_timeout(db)
+    compress = compression == "gzip"
+    filename = "storms.csv.gz" if compress else "storms.csv"
+    chunks = stream_copy(db, copy_query(db, basin, season_from, season_to), compress=compress)
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if compress else "text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/storms/batch",
+    response_model=StormCollection,
+    dependencies=[Depends(admission_control("storms_batch"))],
+)
+def get_storms_batch(
+    request: Request,
+    batch: StormBatchRequest,
+    fields: str | None = Query(
+        None,
+        description="Comma-separated time series to return (e.g. time,lat,lon,wind); all if omitted",
+    ),
+    db: PGConnection = Depends(get_db),
+) -> Response:
+    """Get several storms by IBTrACS ID in one request
+
+    Storms are returned in the order requested; unknown IDs are skipped.
+    """
+    if len(batch.ids) > settings.STORM_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.STORM_BATCH_MAX_IDS} IDs can be requested at once",
+        )
+    series = parse_fields(fields)
+
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    collection = StormService(db).get_storms_by_ids(batch.ids, series)
+    body, applied = encode_body(encode_collection(collection, media_type, series), encoding)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+# Declared last so the fixed /storms/... paths above take precedence
+@router.get(
+    "/storms/{storm_id}",
+    response_model=Storm,
+    dependencies=[Depends(admission_control("storm"))],
+)
+def get_storm(
+    storm_id: str = Path(..., max_length=50),
+    fields: str | None = Query(
+        None,
+        description="Comma-separated time series to return (e.g. time,lat,lon,wind); all if omitted",
+    ),
+    db: PGConnection = Depends(get_db),
+) -> Response:
+    """Get a single storm by IBTrACS ID"""
+    series = parse_fields(fields)
+    storms = StormService(db).get_storms_by_ids([storm_id], series).storms
+    if not storms:
+        raise HTTPException(status_code=404, detail=f"Storm {storm_id} not found")
+    unrequested = set(STORM_SERIES_COLUMNS) - set(series_columns(series))
+    return Response(
+        content=storms[0].model_dump_json(exclude=unrequested),
+        media_type="application/json",
+    )
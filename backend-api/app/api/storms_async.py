@@ -0,0 +1,126 @@
+"""
+Async handlers for the storm routes served from asyncpg (``DB_ASYNC``)
+
+Included ahead of ``app.api.storms`` so these paths take precedence; the
+routes behave exactly like their threadpool counterparts.
+"""
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.api.storms import parse_fields
+from app.core.admission import admission_control
+from app.core.compression import encode_body, negotiate_encoding
+from app.core.conditional import dataset_validators, is_not_modified
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.profiling import ProfiledRoute
+from app.core.timing import stage
+from app.schemas.storm import StormBatchRequest, StormCollection
+from app.services.async_storm_service import AsyncStormService
+from app.services.formats import negotiate_media_type
+from app.services.simplify import tolerance_for_zoom
+from app.services.storm_service import encode_collection, month_cache_key
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get(
+    "/storms/{year}/{month}",
+    response_model=StormCollection,
+    dependencies=[Depends(admission_control("storms_month"))],
+)
+async def get_storms(
+    request: Request,
+    year: int = Path(..., ge=1, le=9998),
+    month: int = Path(..., ge=1, le=12),
+    tolerance: float | None = Query(
+        None, gt=0, description="Simplify tracks to this tolerance (degrees)"
+    ),
+    zoom: int | None = Query(
+        None, ge=0, le=22, description="Simplify tracks to one pixel at this web map zoom level"
+    ),
+    fields: str | None = Query(
+        None,
+        description="Comma-separated time series to return (e.g. time,lat,lon,wind); all if omitted",
+    ),
+    conn: asyncpg.Connection = Depends(get_async_db),
+) -> Response:
+    """Get all storms for a given calendar month
+
+    Besides JSON, the storms can be requested in a columnar binary layout with
+    ``Accept: application/vnd.apache.arrow.stream`` or ``application/msgpack``.
+    """
+    if tolerance is not None and zoom is not None:
+        raise HTTPException(status_code=422, detail="Specify at most one of tolerance and zoom")
+    if zoom is not None:
+        tolerance = tolerance_for_zoom(zoom)
+    series = parse_fields(fields)
+
+    service = AsyncStormService(conn)
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"Cache-Control": settings.STORM_CACHE_CONTROL, "Vary": "Accept, Accept-Encoding"}
+
+    # One dataset version for the ETag, the cached payload and its compressed variants
+    dataset = await service.dataset_version()
+    representation = service.month_representation(tolerance, series, media_type)
+    cache_key = month_cache_key(dataset.version, year, month, representation)
+    validators = dataset_validators(
+        dataset, "storms_month", year, month, representation, encoding or "identity"
+    )
+    if validators is not None:
+        headers.update(validators.headers)
+        if is_not_modified(request.headers, validators):
+            return Response(status_code=304, headers=headers)
+
+    body = await service.get_month_payload(
+        year, month, tolerance, series, media_type, cache_key=cache_key
+    )
+
+    def compress() -> tuple[bytes, str | None]:
+        with stage("compress"):
+            return encode_body(body, encoding, cache_key=cache_key)
+
+    # Compression is CPU-bound; keep it off the event loop
+    body, applied = await run_in_threadpool(compress)
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@router.post(
+    "/storms/batch",
+    response_model=StormCollection,
+    dependencies=[Depends(admission_control("storms_batch"))],
+)
+async def get_storms_batch(
+    request: Request,
+    batch: StormBatchRequest,
+    fields: str | None = Query(
+        None,
+        description="Comma-separated time series to return (e.g. time,lat,lon,wind); all if omitted",
+    ),
+    conn: asyncpg.Connection = Depends(get_async_db),
+) -> Response:
+    """Get several storms by IBTrACS ID in one request
+
+    Storms are returned in the order requested; unknown IDs are skipped.
+    """
+    if len(batch.ids) > settings.STORM_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.STORM_BATCH_MAX_IDS} IDs can be requested at once",
+        )
+    series = parse_fields(fields)
+
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    collection = await AsyncStormService(conn).get_storms_by_ids(batch.ids, series)
+    body, applied = await run_in_threadpool(
+        lambda: encode_body(encode_collection(collection, media_type, series), encoding)
+    )
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=media_type, headers=headers)
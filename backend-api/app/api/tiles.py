@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from psycopg2.extensions import connection as PGConnection
+
+from app.core.admission import admission_control
+from app.core.compression import encode_body, negotiate_encoding
+from app.core.conditional import dataset_validators, is_not_modified
+from app.core.config import settings
+from app.core.database import get_db
+from app.services.tiles import TILE_MEDIA_TYPE, TileService
+
+router = APIRouter()
+
+
+@router.get(
+    "/tiles/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {TILE_MEDIA_TYPE: {}}}},
+    dependencies=[Depends(admission_control("tiles"))],
+)
+def get_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=22),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    start: datetime | None = Query(None, description="Earliest genesis time (inclusive)"),
+    end: datetime | None = Query(None, description="Latest genesis time (exclusive)"),
+    db: PGConnection = Depends(get_db),
+) -> Response:
+    """Get storm tracks crossing a web map tile as a Mapbox Vector Tile
+
+    Tracks are in the ``storms`` layer, simplified for the zoom level, with
+    ``ID``, ``name``, ``season``, ``basin`` and ``max_wind`` attributes.
+    """
+    if x >= 2**z or y >= 2**z:
+        raise HTTPException(status_code=404, detail="Tile not found")
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
+
+    service = TileService(db)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"Cache-Control": settings.STORM_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    # From the snapshot the tile is rendered from, which lags the current
+    # version while another request reloads the dataset
+    validators = dataset_validators(
+        service.dataset_version(), "tile", z, x, y, start, end, encoding or "identity"
+    )
+    if validators is not None:
+        headers.update(validators.headers)
+        if is_not_modified(request.headers, validators):
+            return Response(status_code=304, headers=headers)
+
+    body, applied = encode_body(service.get_tile(z, x, y, start, end), encoding)
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=TILE_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Callable
+
+from app.core.config import settings
+from app.core.timing import stage
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of being admitted."""
+
+
+class _Waiter:
+    __slots__ = ("weight", "loop", "future")
+
+    def __init__(self, weight: int, loop: asyncio.AbstractEventLoop):
+        self.weight = weight
+        self.loop = loop
+        self.future = loop.create_future()
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdmissionController:
+    """Weighted concurrency limiter with a bounded FIFO wait queue.
+
+    Each request holds ``weight`` units of ``capacity`` while it runs.
+    Requests that do not fit wait in arrival order; when ``max_queue``
+    requests are already waiting, or a request has waited ``queue_timeout``
+    seconds, it is shed with ``Overloaded`` so load beyond what the database
+    can serve is turned away instead of piling up connections.
+
+    Waiters may live on different event loops (e.g. one per test client
+    request), so state is guarded by a thread lock and waiters are woken
+    through their own loop.
+    """
+
+    def __init__(self, capacity: int, max_queue: int, queue_timeout: float):
+        if capacity < 1 or max_queue < 0:
+            raise ValueError("Invalid admission limits: require capacity >= 1 and max_queue >= 0")
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._waiters: deque[_Waiter] = deque()
+        self._in_use = 0
+        self._counters = {
+            "admitted": 0,
+            "queued": 0,
+            "shed_queue_full": 0,
+            "shed_timeout": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _wake(self) -> None:
+        """Admit waiters from the head of the queue while they fit (caller holds the lock)."""
+        while self._waiters and self._in_use + self._waiters[0].weight <= self.capacity:
+            waiter = self._waiters.popleft()
+            try:
+                waiter.loop.call_soon_threadsafe(_grant, waiter.future)
+            except RuntimeError:
+                # The waiter's event loop is gone
+                continue
+            self._in_use += waiter.weight
+
+    async def acquire(self, weight: int = 1) -> int:
+        """
+        Wait for ``weight`` units of capacity
+
+        Args:
+            weight: Cost of the request; capped at the capacity, so the most
+                expensive requests still run, alone
+
+        Returns:
+            The weight held, to pass to ``release``
+
+        Raises:
+            Overloaded: The wait queue is full or the wait timed out
+        """
+        weight = max(1, min(weight, self.capacity))
+        with self._lock:
+            if not self._waiters and self._in_use + weight <= self.capacity:
+                self._in_use += weight
+                self._counters["admitted"] += 1
+                return weight
+            if len(self._waiters) >= self.max_queue:
+                self._counters["shed_queue_full"] += 1
+                raise Overloaded("Server is busy; too many requests are queued")
+            waiter = _Waiter(weight, asyncio.get_running_loop())
+            self._waiters.append(waiter)
+            self._counters["queued"] += 1
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait((waiter.future,), timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    self._wake()
+                    raise
+            # Admitted just as the request was cancelled
+            self.release(weight)
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                # A heavy waiter leaving the head may let lighter ones in
+                self._wake()
+                self._counters["shed_timeout"] += 1
+                raise Overloaded(f"Server is busy; not admitted within {self.queue_timeout}s")
+            self._counters["admitted"] += 1
+            self._counters["wait_seconds_total"] += waited
+            self._counters["wait_seconds_max"] = max(self._counters["wait_seconds_max"], waited)
+        return weight
+
+    def release(self, weight: int) -> None:
+        """Return capacity taken by ``acquire`` and admit waiters that now fit."""
+        with self._lock:
+            self._in_use -= weight
+            self._wake()
+
+    def stats(self) -> dict[str, float]:
+        """Return the current load, queue depth and lifetime counters."""
+        with self._lock:
+            return {
+                "in_use": self._in_use,
+                "capacity": self.capacity,
+                "queue_depth": len(self._waiters),
+                "max_queue": self.max_queue,
+                **self._counters,
+            }
+
+
+admission = AdmissionController(
+    capacity=settings.ADMISSION_CAPACITY,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+)
+
+
+def admission_control(route: str) -> Callable[[], AsyncIterator[None]]:
+    """
+    Build a dependency admitting requests to ``route`` through ``admission``
+
+    The request's weight is ``settings.ADMISSION_WEIGHTS[route]`` (default 1).
+    Capacity is held until the response, including a streamed body, is sent.
+    """
+
+    async def admit() -> AsyncIterator[None]:
+        if not settings.ADMISSION_ENABLED:
+            yield
+            return
+        controller = admission
+        with stage("admission"):
+            weight = await controller.acquire(settings.ADMISSION_WEIGHTS.get(route, 1))
+        try:
+            yield
+        finally:
+            controller.release(weight)
+
+    return admit
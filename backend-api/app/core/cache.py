@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.core.config import settings
+
+
+class ResponseCache:
+    """Thread-safe in-process cache of serialized responses.
+
+    Entries are bounded by their total size in bytes and expire ``ttl``
+    seconds after being stored. When the cache is full, the least recently
+    used entry is evicted (``policy="lru"``) or the oldest one (``"fifo"``).
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, policy: str = "lru"):
+        if policy not in ("lru", "fifo"):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = policy
+
+        self._lock = threading.Lock()
+        # key -> (value, size, expires_at); ordered oldest/least recent first
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            value, size, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._bytes -= size
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            if self.policy == "lru":
+                self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """Store ``value`` (``size`` bytes), evicting entries to stay under the bound."""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            while self._entries and self._bytes + size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._counters["evictions"] += 1
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of cache occupancy and lifetime counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._counters,
+            }
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    policy=settings.RESPONSE_CACHE_EVICTION,
+)
+
+tile_cache = ResponseCache(
+    max_bytes=settings.TILE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    policy=settings.RESPONSE_CACHE_EVICTION,
+)
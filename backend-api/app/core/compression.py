@@ -0,0 +1,72 @@
+import gzip
+from typing import Callable, Hashable
+
+import brotli
+import zstandard
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.negotiation import parse_quality_list
+
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def _zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(body)
+
+
+# Supported content codings, in server preference order for equal q-values
+ENCODERS: dict[str, Callable[[bytes], bytes]] = {
+    "br": _brotli,
+    "zstd": _zstd,
+    "gzip": _gzip,
+}
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the content coding to use for an ``Accept-Encoding`` header.
+
+    Returns None when the response should be sent uncompressed.
+    """
+    if not settings.COMPRESSION_ENABLED or not accept_encoding:
+        return None
+
+    qualities = parse_quality_list(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in ENCODERS:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def encode_body(
+    body: bytes, encoding: str | None, cache_key: Hashable | None = None
+) -> tuple[bytes, str | None]:
+    """Compress ``body`` with ``encoding`` if it is large enough to be worth it.
+
+    When ``cache_key`` identifies a cached uncompressed body, the compressed
+    bytes are cached next to it so hot responses are compressed only once.
+
+    Returns:
+        The body to send and the content coding actually applied (or None)
+    """
+    if encoding is None or len(body) < settings.COMPRESSION_MIN_SIZE:
+        return body, None
+
+    if cache_key is None or not settings.RESPONSE_CACHE_ENABLED:
+        return ENCODERS[encoding](body), encoding
+
+    key = (cache_key, encoding)
+    compressed = response_cache.get(key)
+    if compressed is None:
+        compressed = ENCODERS[encoding](body)
+        response_cache.put(key, compressed, len(compressed))
+    return compressed, encoding
@@ -0,0 +1,70 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Mapping
+
+from app.core.dataset import DatasetVersion
+
+
+class Validators:
+    """Strong ETag and Last-Modified validators for one representation of a resource."""
+
+    def __init__(self, etag: str, last_modified: datetime | None):
+        self.etag = etag
+        # HTTP dates have whole-second precision
+        self.last_modified = last_modified.replace(microsecond=0) if last_modified else None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the parts identifying a representation."""
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def dataset_validators(dataset: DatasetVersion, *parts: Any) -> Validators | None:
+    """Validators for a response derived only from the dataset and ``parts``.
+
+    Returns None for an unversioned dataset, since its contents can change
+    without anything the validators could be derived from.
+    """
+    if dataset.version == 0:
+        return None
+    last_modified = None
+    if dataset.updated_at is not None:
+        # The updater records naive UTC timestamps
+        last_modified = dataset.updated_at.replace(tzinfo=timezone.utc)
+    return Validators(make_etag(dataset.version, *parts), last_modified)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request_headers: Mapping[str, str], validators: Validators) -> bool:
+    """Whether a GET with these headers can be answered with ``304 Not Modified``."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        return _etag_matches(if_none_match, validators.etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return validators.last_modified <= since
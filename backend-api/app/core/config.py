@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +23,104 @@ class Settings(BaseSettings):
     DB_USER: Optional[str] = None
     DB_PASSWORD: Optional[str] = None
 
+    # Connection pool
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    # Seconds an idle connection above the minimum is kept open
+    DB_POOL_MAX_IDLE: float = 300.0
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT: float = 30.0
+    # Run a cheap "SELECT 1" before handing out a pooled connection
+    DB_POOL_CHECK_ON_CHECKOUT: bool = True
+    # Milliseconds before Postgres cancels a statement (0 disables); set on
+    # every pooled connection, so it bounds each query of a request
+    DB_STATEMENT_TIMEOUT: int = 30_000
+    # Serve the month and batch storm routes from async handlers on an
+    # asyncpg pool (same bounds) instead of the threadpool; postgres backend only
+    DB_ASYNC: bool = False
+
+    # "aggregate" builds one row per storm in Postgres (array_agg),
+    # "rows" fetches one row per track point and groups in Python
+    STORM_QUERY_MODE: Literal["aggregate", "rows"] = "aggregate"
+
+    # "postgres" queries the storms table per request; "memory" loads it into
+    # NumPy column arrays at startup and answers storm queries from RAM
+    STORM_BACKEND: Literal["postgres", "memory"] = "postgres"
+    # Bbox, near, snapshot, search and tile queries are always answered from the
+    # in-memory copy; load it at startup rather than in the first such request.
+    # Always done with the "memory" backend.
+    COLUMNAR_PRELOAD: bool = False
+    # Without a dataset version, reload the in-memory copy after this many seconds
+    COLUMNAR_UNVERSIONED_MAX_AGE: float = 300.0
+
+    # Most IDs accepted by POST /storms/batch
+    STORM_BATCH_MAX_IDS: int = 100
+
+    # Rows fetched per round trip by streaming (server-side cursor) endpoints
+    STREAM_ITERSIZE: int = 2000
+
+    # Serve month queries as JSON built by Postgres, bypassing Pydantic
+    STORM_JSON_FAST_PATH: bool = False
+
+    # In-process cache of month responses, keyed on the dataset version
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Seconds before a cached response is recomputed even if the version is unchanged
+    RESPONSE_CACHE_TTL: float = 24 * 60 * 60
+    RESPONSE_CACHE_EVICTION: Literal["lru", "fifo"] = "lru"
+    # Share one month query among concurrent identical requests
+    SINGLE_FLIGHT_ENABLED: bool = True
+    # Seconds between reads of the updater's dataset version
+    DATASET_VERSION_REFRESH_INTERVAL: float = 30.0
+
+    # Admission control: requests hold their route's weight (default 1) of
+    # ADMISSION_CAPACITY while running; up to ADMISSION_MAX_QUEUE wait for
+    # ADMISSION_QUEUE_TIMEOUT seconds, and the rest get 503 + Retry-After
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_CAPACITY: int = 16
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_QUEUE_TIMEOUT: float = 10.0
+    ADMISSION_RETRY_AFTER: int = 2
+    ADMISSION_WEIGHTS: dict[str, int] = {
+        "storms_bbox": 2,
+        "storms_range": 4,
+        "storms_export": 8,
+        "storms_batch": 2,
+    }
+
+    # Request latency, stage timing, row and size histograms on /metrics
+    # (Prometheus text format); off, the instrumentation is a no-op
+    METRICS_ENABLED: bool = False
+    # With metrics on, also report stage timings in a Server-Timing header
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Opt-in cProfile of single storm requests sending X-Profile-Token; needs
+    # both the flag and a token. Profiles (.pstats) go to PROFILING_DIR, at
+    # most one per PROFILING_MIN_INTERVAL seconds
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str | None = None
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MIN_INTERVAL: float = 60.0
+
+    # Vector tiles: coordinate extent, buffer (in extent units) around each tile,
+    # and an in-process cache of rendered tiles keyed on the dataset version
+    TILE_EXTENT: int = 4096
+    TILE_BUFFER: int = 64
+    TILE_CACHE_ENABLED: bool = True
+    TILE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Cache-Control sent with storm responses; clients and CDNs may store them
+    # but revalidate with If-None-Match / If-Modified-Since
+    STORM_CACHE_CONTROL: str = "public, no-cache"
+
+    # Negotiated gzip / brotli / zstd compression of storm responses
+    COMPRESSION_ENABLED: bool = True
+    # Bodies smaller than this many bytes are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
     @property
     def database_url(self) -> str:
         """Return the PostgreSQL connection string to use."""
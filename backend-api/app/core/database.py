@@ -1,22 +1,333 @@
+import asyncio
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator
 
+import asyncpg
 import psycopg2
+from psycopg2 import extensions
+from psycopg2.extensions import connection as PGConnection
 from psycopg2.extras import RealDictCursor
 
 from app.core.config import settings
+from app.core.timing import stage
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool.
+
+    Connections are created lazily up to ``max_size``. Idle connections above
+    ``min_size`` are closed once they have been unused for ``max_idle``
+    seconds, and each connection is optionally health-checked on checkout.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float = 300.0,
+        timeout: float = 30.0,
+        check_on_checkout: bool = True,
+        **connect_kwargs: Any,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: require 0 <= min_size <= max_size and max_size >= 1")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.check_on_checkout = check_on_checkout
+        self._connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition()
+        # Idle connections with the monotonic time they were returned
+        self._idle: deque[tuple[PGConnection, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkout_waits": 0,
+            "checkout_timeouts": 0,
+            "health_check_failures": 0,
+        }
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+            self._counters["connections_created"] += 1
+
+    def _connect(self) -> PGConnection:
+        return psycopg2.connect(self.dsn, **self._connect_kwargs)
+
+    def _discard(self, conn: PGConnection) -> None:
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        self._counters["connections_closed"] += 1
+
+    def _is_healthy(self, conn: PGConnection) -> bool:
+        if conn.closed:
+            return False
+        if not self.check_on_checkout:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def _prune_idle(self, now: float) -> None:
+        """Close connections idle for longer than ``max_idle`` (caller holds the lock)."""
+        while len(self._idle) > 0 and self._size > self.min_size:
+            conn, returned_at = self._idle[0]
+            if now - returned_at <= self.max_idle:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._discard(conn)
+
+    def getconn(self) -> PGConnection:
+        """Check out a healthy connection, waiting up to ``timeout`` seconds."""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                self._prune_idle(time.monotonic())
+
+                conn = None
+                if self._idle:
+                    # Most recently returned first, so stale ones age out
+                    conn, _ = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["checkout_timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {self.timeout}s"
+                        )
+                    if not waited:
+                        self._counters["checkout_waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+                    continue
+
+            # Connect / health-check outside the lock
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._counters["connections_created"] += 1
+            elif not self._is_healthy(conn):
+                with self._cond:
+                    self._counters["health_check_failures"] += 1
+                    self._size -= 1
+                    self._discard(conn)
+                    self._cond.notify()
+                continue
+
+            with self._cond:
+                self._counters["checkouts"] += 1
+            return conn
+
+    def putconn(self, conn: PGConnection, discard: bool = False) -> None:
+        """Return a connection to the pool, rolling back any open transaction."""
+        if not discard and not conn.closed:
+            status = conn.info.transaction_status
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+        with self._cond:
+            if discard or conn.closed or self._closed:
+                self._size -= 1
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[PGConnection]:
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            # Broken (closed) connections are discarded by putconn
+            self.putconn(conn)
+
+    def close(self) -> None:
+        """Close all idle connections; in-use ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of pool sizes and lifetime counters."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self._counters,
+            }
+
+
+def lift_statement_timeout(conn: PGConnection) -> None:
+    """Disable ``DB_STATEMENT_TIMEOUT`` until the end of the current transaction.
+
+    The pool rolls the transaction back when the connection is returned, so
+    the next request gets the timeout again.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SET LOCAL statement_timeout = 0")
 
 
 @contextmanager
-def _get_connection():
-    conn = psycopg2.connect(settings.database_url, cursor_factory=RealDictCursor)
-    try:
-        yield conn
-    finally:
-        conn.close()
+def statement_timeout_lifted(conn: PGConnection) -> Iterator[None]:
+    """Disable ``DB_STATEMENT_TIMEOUT`` for the statements run inside the block.
+
+    For bulk reads that must not be cancelled, such as loading the in-memory
+    dataset; the timeout is restored for the rest of the transaction.
+    """
+    lift_statement_timeout(conn)
+    yield
+    with conn.cursor() as cursor:
+        cursor.execute("SET LOCAL statement_timeout TO DEFAULT")
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    settings.database_url,
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    max_idle=settings.DB_POOL_MAX_IDLE,
+                    timeout=settings.DB_POOL_TIMEOUT,
+                    check_on_checkout=settings.DB_POOL_CHECK_ON_CHECKOUT,
+                    cursor_factory=RealDictCursor,
+                    options=f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}",
+                )
+    return _pool
+
+
+def pool_stats() -> dict[str, int] | None:
+    """Return the process-wide pool's stats, or None if it was never used."""
+    pool = _pool
+    return None if pool is None else pool.stats()
+
+
+def close_pool() -> None:
+    """Close the process-wide connection pool, if one was created."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
 
 def get_db():
     """Dependency for database connection."""
-    with _get_connection() as conn:
+    pool = get_pool()
+    with stage("pool"):
+        conn = pool.getconn()
+    try:
         yield conn
+    finally:
+        # Broken (closed) connections are discarded by putconn
+        pool.putconn(conn)
+
 
+_async_pool: asyncpg.Pool | None = None
+
+
+async def open_async_pool() -> asyncpg.Pool:
+    """Create the process-wide asyncpg pool on the running event loop.
+
+    Call once at startup: an asyncpg pool can only be used from the loop
+    it was created on.
+    """
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = await asyncpg.create_pool(
+            settings.database_url,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_IDLE,
+            # Startup parameter, so the RESET ALL on release keeps it
+            server_settings={"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)},
+        )
+    return _async_pool
+
+
+async def close_async_pool() -> None:
+    """Close the process-wide asyncpg pool, if one was opened."""
+    global _async_pool
+    if _async_pool is not None:
+        pool, _async_pool = _async_pool, None
+        await pool.close()
+
+
+def async_pool_stats() -> dict[str, int] | None:
+    """Return a snapshot of the asyncpg pool sizes, or None if it is not open."""
+    if _async_pool is None:
+        return None
+    size = _async_pool.get_size()
+    idle = _async_pool.get_idle_size()
+    return {
+        "size": size,
+        "idle": idle,
+        "in_use": size - idle,
+        "min_size": _async_pool.get_min_size(),
+        "max_size": _async_pool.get_max_size(),
+    }
+
+
+async def get_async_db() -> AsyncIterator[asyncpg.Connection]:
+    """Dependency for an asyncpg connection (async storm routes)."""
+    pool = await open_async_pool()
+    try:
+        with stage("pool"):
+            conn = await pool.acquire(timeout=settings.DB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PoolTimeout(f"No database connection available within {settings.DB_POOL_TIMEOUT}s")
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
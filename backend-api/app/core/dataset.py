@@ -0,0 +1,89 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import asyncpg
+from psycopg2.extensions import connection as PGConnection
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class DatasetVersion:
+    """Version of the storms dataset, bumped by the db-updater after each run."""
+
+    version: int
+    updated_at: datetime | None
+
+
+# Reported when the updater has never recorded a version
+UNVERSIONED = DatasetVersion(version=0, updated_at=None)
+
+
+def read_dataset_version(db: PGConnection) -> DatasetVersion:
+    """Read the current dataset version from the updater's metadata table."""
+    with db.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('dataset_metadata') IS NOT NULL AS present")
+        if not cursor.fetchone()["present"]:
+            return UNVERSIONED
+        cursor.execute("SELECT version, updated_at FROM dataset_metadata")
+        row = cursor.fetchone()
+    if row is None:
+        return UNVERSIONED
+    return DatasetVersion(version=row["version"], updated_at=row["updated_at"])
+
+
+async def read_dataset_version_async(conn: asyncpg.Connection) -> DatasetVersion:
+    """Async variant of ``read_dataset_version`` for an asyncpg connection."""
+    if not await conn.fetchval("SELECT to_regclass('dataset_metadata') IS NOT NULL"):
+        return UNVERSIONED
+    row = await conn.fetchrow("SELECT version, updated_at FROM dataset_metadata")
+    if row is None:
+        return UNVERSIONED
+    return DatasetVersion(version=row["version"], updated_at=row["updated_at"])
+
+
+class DatasetVersionTracker:
+    """Caches the dataset version, re-reading it at most every ``refresh_interval`` seconds."""
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._current: DatasetVersion | None = None
+        self._checked_at = 0.0
+
+    def get(self, db: PGConnection) -> DatasetVersion:
+        with self._lock:
+            current = self._current
+            fresh = time.monotonic() - self._checked_at < self.refresh_interval
+        if current is not None and fresh:
+            return current
+
+        current = read_dataset_version(db)
+        with self._lock:
+            self._current = current
+            self._checked_at = time.monotonic()
+        return current
+
+    async def get_async(self, conn: asyncpg.Connection) -> DatasetVersion:
+        """Like ``get``, reading the version over an asyncpg connection."""
+        with self._lock:
+            current = self._current
+            fresh = time.monotonic() - self._checked_at < self.refresh_interval
+        if current is not None and fresh:
+            return current
+
+        current = await read_dataset_version_async(conn)
+        with self._lock:
+            self._current = current
+            self._checked_at = time.monotonic()
+        return current
+
+    def invalidate(self) -> None:
+        """Force the next ``get`` to re-read the version from the database."""
+        with self._lock:
+            self._current = None
+
+
+dataset_versions = DatasetVersionTracker(settings.DATASET_VERSION_REFRESH_INTERVAL)
@@ -0,0 +1,208 @@
+"""
+Request metrics in the Prometheus text exposition format
+
+Request latency, per-stage time (see ``app.core.timing``), rows read and
+response sizes are recorded by ``MetricsMiddleware`` into histograms
+labelled by route template. The stats of the connection pools, caches,
+in-memory dataset, single-flight groups and admission controller are read
+when ``/metrics`` is scraped.
+"""
+import bisect
+import math
+import threading
+from typing import Callable, Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import admission as admission_module
+from app.core.cache import response_cache, tile_cache
+from app.core.config import settings
+from app.core.database import async_pool_stats, pool_stats
+from app.core.singleflight import async_month_flights, month_flights
+from app.core.timing import RequestTimings, start_request
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "ibtracs"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(float(4**power) for power in range(4, 14))  # 256 B .. 64 MiB
+ROW_BUCKETS = (1.0, 10.0, 100.0, 1_000.0, 10_000.0, 100_000.0, 1_000_000.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with a fixed set of label names."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # Label values -> (per-bucket counts with a final +Inf bucket, sum)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total[0]) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+request_duration = Histogram(
+    f"{PREFIX}_request_duration_seconds",
+    "Time to serve a request, until the response has been sent.",
+    LATENCY_BUCKETS,
+    ("method", "route", "status"),
+)
+stage_duration = Histogram(
+    f"{PREFIX}_request_stage_seconds",
+    "Time spent in each stage of serving a request (sql, group, validate, encode, ...).",
+    LATENCY_BUCKETS,
+    ("route", "stage"),
+)
+response_size = Histogram(
+    f"{PREFIX}_response_size_bytes",
+    "Size of response bodies as sent, after compression.",
+    SIZE_BUCKETS,
+    ("route",),
+)
+response_rows = Histogram(
+    f"{PREFIX}_response_rows",
+    "Database rows read to serve a request, for requests that read any.",
+    ROW_BUCKETS,
+    ("route",),
+)
+HISTOGRAMS = (request_duration, stage_duration, response_size, response_rows)
+
+
+def _columnar_stats() -> dict[str, float] | None:
+    # Imported here: the services import the core modules, not the reverse
+    from app.services.columnar import columnar_engine
+
+    return columnar_engine.stats()
+
+
+def _tile_render_stats() -> dict[str, float] | None:
+    from app.services.tiles import tile_metrics
+
+    return tile_metrics.stats()
+
+
+# Gauges read at scrape time: metric name prefix -> stats snapshot (None if unavailable)
+COLLECTORS: dict[str, Callable[[], dict[str, float] | None]] = {
+    "db_pool": pool_stats,
+    "db_async_pool": async_pool_stats,
+    "response_cache": response_cache.stats,
+    "tile_cache": tile_cache.stats,
+    "tile_render": _tile_render_stats,
+    "columnar": _columnar_stats,
+    "single_flight": month_flights.stats,
+    "async_single_flight": async_month_flights.stats,
+    "admission": lambda: admission_module.admission.stats(),
+}
+
+
+def render_metrics() -> str:
+    """Render all histograms and collected stats in the Prometheus text format."""
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+    for prefix, collect in COLLECTORS.items():
+        stats = collect()
+        if stats is None:
+            continue
+        for key, value in stats.items():
+            if value is None or isinstance(value, str):
+                continue
+            name = f"{PREFIX}_{prefix}_{key}"
+            lines += [f"# TYPE {name} gauge", f"{name} {_number(value)}"]
+    return "\n".join(lines) + "\n"
+
+
+def observe_request(scope: Scope, status: int, size: int, timings: RequestTimings, seconds: float) -> None:
+    route = scope.get("route")
+    label = getattr(route, "path", "unmatched")
+    request_duration.observe(seconds, scope["method"], label, str(status))
+    for name, stage_seconds in timings.stages.items():
+        stage_duration.observe(stage_seconds, label, name)
+    response_size.observe(size, label)
+    if timings.rows:
+        response_rows.observe(timings.rows, label)
+
+
+class MetricsMiddleware:
+    """
+    Times requests and reports their stages in a ``Server-Timing`` header
+
+    A pure ASGI middleware; with ``METRICS_ENABLED`` off it only forwards
+    the call, and the stage instrumentation sees no current request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request()
+        status = 500
+        size = 0
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    # Stages running while a streamed body is sent are not included
+                    header = (b"server-timing", timings.server_timing().encode("latin-1"))
+                    message = {**message, "headers": [*message.get("headers", []), header]}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            observe_request(scope, status, size, timings, timings.elapsed())
@@ -0,0 +1,24 @@
+def parse_quality_list(header: str | None) -> dict[str, float]:
+    """Parse an ``Accept``-style header into ``{token: q-value}``.
+
+    Tokens are lower-cased; a missing or malformed ``q`` parameter counts
+    as 1.0 and 0.0 respectively.
+    """
+    qualities: dict[str, float] = {}
+    if not header:
+        return qualities
+    for item in header.split(","):
+        token, *params = item.split(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[token] = quality
+    return qualities
@@ -0,0 +1,164 @@
+"""
+Opt-in profiling of single requests
+
+With ``PROFILING_ENABLED`` and a ``PROFILING_TOKEN`` configured, a request
+to a profiled router carrying ``X-Profile-Token: <token>`` runs its handler
+under cProfile and the profile is written to ``PROFILING_DIR`` as a
+``.pstats`` file (open with ``python -m pstats`` or snakeviz, or convert for
+speedscope). The file name is returned in the ``X-Profile`` header. At most
+one request is profiled per ``PROFILING_MIN_INTERVAL`` seconds.
+
+cProfile sees the thread it runs in: for threadpool handlers that is the
+handler alone; for async handlers, everything on the event loop meanwhile,
+but not the work they hand to the threadpool.
+Streamed bodies are produced after the handler returns and are not included.
+"""
+import asyncio
+import cProfile
+import functools
+import hmac
+import os
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+TOKEN_HEADER = "X-Profile-Token"
+RESULT_HEADER = "X-Profile"
+
+
+class ProfileRateLimiter:
+    """Allows one profile per ``min_interval`` seconds across the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = -float("inf")
+        self._counters = {"profiles": 0, "rate_limited": 0}
+
+    def allow(self, min_interval: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last < min_interval:
+                self._counters["rate_limited"] += 1
+                return False
+            self._last = now
+            self._counters["profiles"] += 1
+            return True
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+profile_limiter = ProfileRateLimiter()
+
+
+class _ProfileRun:
+    """Where the profile of the current request is saved."""
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def save(self, profiler: cProfile.Profile) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        profiler.dump_stats(self.path)
+
+
+_current: ContextVar[_ProfileRun | None] = ContextVar("profile_run", default=None)
+
+
+def _is_authorized(request: Request) -> bool:
+    token = request.headers.get(TOKEN_HEADER)
+    if token is None or not settings.PROFILING_ENABLED or not settings.PROFILING_TOKEN:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), settings.PROFILING_TOKEN.encode("utf-8"))
+
+
+def _profile_path(request: Request) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_")
+    return os.path.join(settings.PROFILING_DIR, f"{stamp}-{path}-{uuid.uuid4().hex[:8]}.pstats")
+
+
+def _profiled(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an endpoint to run under cProfile when the current request asks for it.
+
+    The wrapper keeps the endpoint's signature (and sync or async kind), so
+    FastAPI resolves its parameters and picks the threadpool as before.
+    Routes are rebuilt by ``include_router``, so wrapped endpoints are marked
+    and not wrapped again.
+    """
+    if getattr(endpoint, "__profiled__", False):
+        return endpoint
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            run = _current.get()
+            if run is None:
+                return await endpoint(*args, **kwargs)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profiler.disable()
+                run.save(profiler)
+
+        async_wrapper.__profiled__ = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        run = _current.get()
+        if run is None:
+            return endpoint(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+            run.save(profiler)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class for routers whose requests may be profiled (see module docstring)."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            if not _is_authorized(request):
+                return await handler(request)
+            if not profile_limiter.allow(settings.PROFILING_MIN_INTERVAL):
+                response = await handler(request)
+                response.headers[RESULT_HEADER] = "rate-limited"
+                return response
+
+            run = _ProfileRun(_profile_path(request))
+            token = _current.set(run)
+            try:
+                response = await handler(request)
+            finally:
+                _current.reset(token)
+            response.headers[RESULT_HEADER] = os.path.basename(run.path)
+            return response
+
+        return profiled_handler
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from app.core.timing import stage
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight computation and its outcome."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent identical computations.
+
+    The first caller for a key runs the computation; callers arriving with
+    the same key while it is in flight wait for it and share its result (or
+    its exception) instead of running their own copy. Nothing is kept once
+    the computation finishes, so later callers start a new one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._counters = {"executions": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Return ``fn()``, sharing one call among concurrent callers with the same ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters["executions"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            with stage("coalesced"):
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of computations in flight and lifetime counters."""
+        with self._lock:
+            return {"in_flight": len(self._calls), **self._counters}
+
+
+class AsyncSingleFlight:
+    """``SingleFlight`` for coroutines running on one event loop."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._counters = {"executions": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await fn()``, sharing one call among concurrent callers with the same ``key``."""
+        while key in self._calls:
+            call = self._calls[key]
+            self._counters["coalesced"] += 1
+            try:
+                # Shielded so a cancelled waiter does not cancel the shared call
+                with stage("coalesced"):
+                    return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+                # The caller running it was cancelled; take over or join the next flight
+
+        call = self._calls[key] = asyncio.get_running_loop().create_future()
+        self._counters["executions"] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            # Mark retrieved, so a flight nobody waited on does not log "never retrieved"
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of computations in flight and lifetime counters."""
+        return {"in_flight": len(self._calls), **self._counters}
+
+
+# Month payloads, keyed like the response cache
+month_flights = SingleFlight()
+async_month_flights = AsyncSingleFlight()
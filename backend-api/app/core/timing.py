@@ -0,0 +1,63 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class RequestTimings:
+    """Stage durations and row counts collected while serving one request."""
+
+    __slots__ = ("started", "stages", "rows")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # Stage name -> seconds, in the order stages first ran
+        self.stages: dict[str, float] = {}
+        self.rows = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Format the stages and the total so far as a ``Server-Timing`` header value."""
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+# Set by the metrics middleware; None when metrics are disabled, so the
+# instrumentation below costs a single lookup. Threadpool handlers see it too,
+# as the threadpool runs them in a copy of the request's context.
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> RequestTimings:
+    """Begin collecting timings for the request running in the current context."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as stage ``name`` of the current request; repeated stages add up."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def add_rows(count: int) -> None:
+    """Count database rows read by the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.rows += count
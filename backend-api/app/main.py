@@ -1,13 +1,61 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+import asyncpg
+import psycopg2
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from psycopg2.errors import QueryCanceled
 
 from app.api.storms import router as storms_router
+from app.api.storms_async import router as storms_async_router
+from app.api.tiles import router as tiles_router
+from app.core.admission import Overloaded
 from app.core.config import settings
+from app.core.database import (
+    PoolTimeout,
+    close_async_pool,
+    close_pool,
+    get_pool,
+    open_async_pool,
+)
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.services.columnar import columnar_engine
+
+logger = logging.getLogger(__name__)
+
+
+def use_async_routes() -> bool:
+    """Whether storm routes are served by the asyncpg handlers (see ``DB_ASYNC``)."""
+    return settings.DB_ASYNC and settings.STORM_BACKEND == "postgres"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.COLUMNAR_PRELOAD or settings.STORM_BACKEND == "memory":
+        # Load the in-memory dataset before serving so no request pays for the
+        # full-table read (bbox, near, snapshot, search and tiles always need it)
+        try:
+            with get_pool().connection() as conn:
+                columnar_engine.get(conn)
+        except (psycopg2.Error, PoolTimeout):
+            # Serve anyway; the first request that needs the dataset loads it
+            logger.exception("Could not preload the in-memory dataset; it will be loaded on first use")
+    if use_async_routes():
+        # Created on the serving event loop, which the asyncpg pool is bound to
+        await open_async_pool()
+    yield
+    await close_async_pool()
+    close_pool()
+
 
 app = FastAPI(
     title="IBTrACS API",
     description="API for querying International Best Track Archive for Climate Stewardship (IBTrACS) tropical cyclone data",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 cors_origins = settings.cors_origins
@@ -20,8 +68,51 @@ if cors_origins is not None:
         allow_credentials=True,
     )
 
+# Added last, so it is outermost and times the whole middleware stack
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Report pool exhaustion as a temporary outage rather than a server error"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    """Shed load with a hint of when to retry"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+    )
+
+
+@app.exception_handler(QueryCanceled)
+@app.exception_handler(asyncpg.QueryCanceledError)
+async def statement_timeout_handler(request: Request, exc: Exception):
+    """Report a query cancelled by ``DB_STATEMENT_TIMEOUT`` as a temporary outage"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Query took too long; try a narrower request"},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+    )
+
+
 # Include routers
+if use_async_routes():
+    # First, so its handlers take precedence over the threadpool ones
+    app.include_router(storms_async_router)
 app.include_router(storms_router)
+app.include_router(tiles_router)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus metrics, when METRICS_ENABLED is set"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
 
 
 @app.get("/")
@@ -100,3 +100,66 @@ class StormCollection(BaseModel):
             }
         }
 
+
+class NearbyStorm(BaseModel):
+    """Schema for a storm passing near a location, with its closest approach"""
+
+    storm: Storm = Field(..., description="The storm")
+    closest_time: datetime = Field(..., description="Time of closest approach, interpolated along the track")
+    closest_lat: float = Field(..., description="Latitude of the interpolated closest-approach position (degrees)")
+    closest_lon: float = Field(..., description="Longitude of the interpolated closest-approach position (degrees)")
+    distance_km: float = Field(..., description="Great-circle distance at closest approach (km)")
+
+
+class NearbyStormCollection(BaseModel):
+    """Schema for the storms passing near a location, nearest first"""
+
+    storms: list[NearbyStorm] = Field(..., description="Storms ordered by closest approach distance")
+
+
+class StormPosition(BaseModel):
+    """Schema for a storm's state at an instant, interpolated between observations"""
+
+    ID: str = Field(..., description="Unique ID assigned by IBTrACS")
+    ATCF_ID: Optional[str] = Field(None, description="ATCF ID, if available")
+    name: str = Field(..., description='Storm name or "NOT_NAMED"')
+    basin: str = Field(..., description="Basin in which the storm formed")
+    season: int = Field(..., description="Season/year of storm formation")
+    lat: float = Field(..., description="Storm latitude (degrees)")
+    lon: float = Field(..., description="Storm longitude (degrees)")
+    wind: float | None = Field(..., description="Maximum sustained wind (kt)")
+    mslp: float | None = Field(..., description="Central pressure (hPa)")
+
+
+class Snapshot(BaseModel):
+    """Schema for all storms active at an instant"""
+
+    time: datetime = Field(..., description="Instant of the snapshot")
+    storms: list[StormPosition] = Field(..., description="Active storms, ordered by genesis")
+
+
+class StormSummary(BaseModel):
+    """Schema for a storm's identifiers and headline figures, without time series"""
+
+    ID: str = Field(..., description="Unique ID assigned by IBTrACS")
+    ATCF_ID: Optional[str] = Field(None, description="ATCF ID, if available")
+    name: str = Field(..., description='Storm name or "NOT_NAMED"')
+    basin: str = Field(..., description="Basin in which the storm formed")
+    season: int = Field(..., description="Season/year of storm formation")
+    genesis: datetime = Field(..., description="Time of genesis")
+    max_wind: float | None = Field(..., description="Maximum sustained wind over the storm's life (kt)")
+
+
+class StormSearchResults(BaseModel):
+    """Schema for one page of storm search results"""
+
+    storms: list[StormSummary] = Field(..., description="Matching storms, ordered by ID")
+    next_after: Optional[str] = Field(
+        None, description="Pass as `after` to fetch the next page; null on the last page"
+    )
+
+
+class StormBatchRequest(BaseModel):
+    """Schema for a batch lookup of storms by ID"""
+
+    ids: list[str] = Field(..., min_length=1, description="IBTrACS storm IDs")
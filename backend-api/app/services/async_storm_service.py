@@ -0,0 +1,183 @@
+"""
+Async storm queries over asyncpg
+
+Mirrors the postgres backend of ``StormService`` for the async routes: the
+SQL, row assembly, cache keys and payload encodings are shared, only the
+database round trips differ. Assembly and encoding are CPU-bound, so they
+run in the threadpool rather than on the event loop.
+"""
+from typing import Iterable
+
+import asyncpg
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.dataset import DatasetVersion, dataset_versions
+from app.core.singleflight import async_month_flights
+from app.core.timing import add_rows, stage
+from app.schemas.storm import StormCollection
+from app.services.formats import JSON_MEDIA_TYPE
+from app.services.storm_service import (
+    GENESIS_RANGE_FILTER,
+    ID_FILTER,
+    MONTH_JSON_QUERY,
+    collection_from_rows,
+    encode_collection,
+    json_query,
+    month_bounds,
+    month_cache_key,
+    month_query_fields,
+    month_representation,
+    simplify_collection,
+    storms_query,
+    use_json_fast_path,
+)
+
+
+def numbered_placeholders(query: str) -> str:
+    """Rewrite psycopg2 ``%s`` placeholders as asyncpg's ``$1, $2, ...``."""
+    head, *rest = query.split("%s")
+    return head + "".join(f"${number}{part}" for number, part in enumerate(rest, 1))
+
+
+class AsyncStormService:
+    """Async counterpart of ``StormService`` for the postgres backend."""
+
+    def __init__(self, conn: asyncpg.Connection, mode: str | None = None):
+        self.conn = conn
+        # "aggregate": one row per storm built by Postgres; "rows": one row per track point
+        self.mode = mode or settings.STORM_QUERY_MODE
+
+    async def get_storms_by_month(
+        self, year: int, month: int, fields: tuple[str, ...] | None = None
+    ) -> StormCollection:
+        """Async ``StormService.get_storms_by_month``."""
+        return await self._query_storms(GENESIS_RANGE_FILTER, month_bounds(year, month), fields)
+
+    async def get_storms_by_ids(
+        self, storm_ids: Iterable[str], fields: tuple[str, ...] | None = None
+    ) -> StormCollection:
+        """Async ``StormService.get_storms_by_ids``."""
+        requested = list(dict.fromkeys(storm_ids))
+        collection = await self._query_storms(ID_FILTER, (requested,), fields)
+        position = {storm_id: index for index, storm_id in enumerate(requested)}
+        storms = sorted(collection.storms, key=lambda storm: position[storm.ID])
+        return StormCollection.model_construct(storms=storms)
+
+    async def _query_storms(
+        self, where: str, params: tuple, fields: tuple[str, ...] | None = None
+    ) -> StormCollection:
+        with stage("sql"):
+            rows = await self.conn.fetch(
+                numbered_placeholders(storms_query(where, fields, self.mode)), *params
+            )
+        add_rows(len(rows))
+        return await run_in_threadpool(collection_from_rows, rows, fields, self.mode)
+
+    async def get_storms_by_month_json(
+        self, year: int, month: int, fields: tuple[str, ...] | None = None
+    ) -> bytes:
+        """Async ``StormService.get_storms_by_month_json``."""
+        query = MONTH_JSON_QUERY if fields is None else json_query(GENESIS_RANGE_FILTER, fields)
+        with stage("sql"):
+            body = await self.conn.fetchval(numbered_placeholders(query), *month_bounds(year, month))
+        return body.encode("utf-8")
+
+    def month_representation(
+        self,
+        tolerance: float | None = None,
+        fields: tuple[str, ...] | None = None,
+        media_type: str = JSON_MEDIA_TYPE,
+    ) -> str:
+        """Same as ``StormService.month_representation`` with the postgres backend."""
+        return month_representation(
+            tolerance, fields, media_type, use_json_fast_path(tolerance, media_type)
+        )
+
+    async def dataset_version(self) -> DatasetVersion:
+        """Return the current dataset version (refreshed periodically)."""
+        return await dataset_versions.get_async(self.conn)
+
+    async def month_cache_key(
+        self,
+        year: int,
+        month: int,
+        tolerance: float | None = None,
+        fields: tuple[str, ...] | None = None,
+        media_type: str = JSON_MEDIA_TYPE,
+        dataset: DatasetVersion | None = None,
+    ) -> tuple:
+        """Response cache key of ``get_month_payload``, shared with ``StormService``."""
+        if dataset is None:
+            dataset = await self.dataset_version()
+        return month_cache_key(
+            dataset.version, year, month, self.month_representation(tolerance, fields, media_type)
+        )
+
+    async def get_month_payload(
+        self,
+        year: int,
+        month: int,
+        tolerance: float | None = None,
+        fields: tuple[str, ...] | None = None,
+        media_type: str = JSON_MEDIA_TYPE,
+        cache_key: tuple | None = None,
+    ) -> bytes:
+        """
+        Retrieve the serialized StormCollection for a calendar month
+
+        Async ``StormService.get_month_payload``: payloads are read from and
+        stored in the same response cache, and concurrent misses on this
+        event loop share a single build.
+
+        Args:
+            year: Calendar year
+            month: Calendar month (1-12)
+            tolerance: Optional track simplification tolerance in degrees
+            fields: Optional time series to return, in schema order; all if None
+            media_type: JSON, Arrow IPC stream or MessagePack (see ``app.services.formats``)
+            cache_key: ``month_cache_key`` for the dataset version the caller
+                already read; read from the current version if None
+
+        Returns:
+            The StormCollection encoded as ``media_type``
+        """
+        if not (settings.RESPONSE_CACHE_ENABLED or settings.SINGLE_FLIGHT_ENABLED):
+            return await self._build_month_payload(year, month, tolerance, fields, media_type)
+
+        key = cache_key or await self.month_cache_key(year, month, tolerance, fields, media_type)
+        if settings.RESPONSE_CACHE_ENABLED:
+            body = response_cache.get(key)
+            if body is not None:
+                return body
+
+        async def build() -> bytes:
+            body = await self._build_month_payload(year, month, tolerance, fields, media_type)
+            if settings.RESPONSE_CACHE_ENABLED:
+                response_cache.put(key, body, len(body))
+            return body
+
+        if settings.SINGLE_FLIGHT_ENABLED:
+            return await async_month_flights.do(key, build)
+        return await build()
+
+    async def _build_month_payload(
+        self,
+        year: int,
+        month: int,
+        tolerance: float | None,
+        fields: tuple[str, ...] | None,
+        media_type: str,
+    ) -> bytes:
+        if use_json_fast_path(tolerance, media_type):
+            return await self.get_storms_by_month_json(year, month, fields)
+
+        collection = await self.get_storms_by_month(year, month, month_query_fields(tolerance, fields))
+
+        def encode() -> bytes:
+            simplified = simplify_collection(collection, tolerance)
+            with stage("encode"):
+                return encode_collection(simplified, media_type, fields)
+
+        return await run_in_threadpool(encode)
@@ -0,0 +1,398 @@
+"""
+In-memory columnar copy of the storms table
+
+The whole archive (under a million track points) fits comfortably in RAM as
+NumPy arrays. Storms are stored sorted by genesis, then ID; storm ``i`` owns
+the track points ``offsets[i]:offsets[i + 1]`` of every per-point column, so
+a genesis range lookup is two binary searches and each storm is a slice.
+"""
+import io
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Iterable, Iterator
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+from psycopg2.extensions import connection as PGConnection
+
+from app.core.config import settings
+from app.core.database import statement_timeout_lifted
+from app.core.dataset import DatasetVersion, dataset_versions
+from app.schemas.storm import Storm
+from app.services.export import CSV_CONVERT_OPTIONS, copy_to
+from app.services.formats import METADATA_FIELDS, STRING_SERIES
+from app.services.intervals import IntervalIndex
+from app.services.search import PrefixIndex
+from app.services.spatial import SegmentGrid, wrap_longitude
+
+SERIES_FIELDS = tuple(field for field in Storm.model_fields if field not in METADATA_FIELDS)
+FLOAT_SERIES = tuple(field for field in SERIES_FIELDS if field != "time" and field not in STRING_SERIES)
+
+LOAD_QUERY = """
+COPY (SELECT * FROM storms ORDER BY genesis, "ID", time)
+TO STDOUT WITH (FORMAT csv, HEADER true)
+"""
+
+
+@dataclass(frozen=True)
+class DictionaryColumn:
+    """Dictionary-encoded strings: ``values[codes[i]]`` is element ``i``.
+
+    ``values`` ends with a None entry, so nulls are stored as code -1.
+    """
+
+    codes: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def encode(cls, array: pa.ChunkedArray | pa.Array) -> "DictionaryColumn":
+        encoded = pc.dictionary_encode(array)
+        if isinstance(encoded, pa.ChunkedArray):
+            encoded = encoded.combine_chunks()
+        codes = pc.fill_null(encoded.indices, -1).to_numpy().astype(np.int32)
+        values = np.array([*encoded.dictionary.to_pylist(), None], dtype=object)
+        return cls(codes=codes, values=values)
+
+    def take(self, start: int, stop: int) -> list[str | None]:
+        return self.values[self.codes[start:stop]].tolist()
+
+    def subset(self, indices: np.ndarray) -> "DictionaryColumn":
+        return DictionaryColumn(codes=self.codes[indices], values=self.values)
+
+    def __getitem__(self, index: int) -> str | None:
+        return self.values[self.codes[index]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + _object_nbytes(self.values)
+
+
+def _object_nbytes(array: np.ndarray) -> int:
+    """Size of an object array including the Python objects it references."""
+    return array.nbytes + sum(sys.getsizeof(value) for value in array if value is not None)
+
+
+def _instant(value: datetime) -> np.datetime64:
+    """Convert to the naive UTC seconds used by the dataset's time columns."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "s")
+
+
+def float_list(values: np.ndarray) -> list[float | None]:
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.tolist()
+    return np.where(missing, None, values).tolist()
+
+
+class ColumnarDataset:
+    """Immutable snapshot of the storms table as NumPy column arrays."""
+
+    def __init__(self, table: pa.Table, version: int, updated_at: datetime | None = None):
+        """
+        Args:
+            table: All track points with the ``storms`` table columns,
+                ordered by genesis, ID and time
+            version: Dataset version the snapshot was loaded at
+            updated_at: When the updater recorded that version
+        """
+        self.version = version
+        self.updated_at = updated_at
+        self.loaded_at = time.monotonic()
+
+        ids = table.column("ID").to_numpy(zero_copy_only=False).astype(object)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        if len(ids):
+            # A new storm starts wherever the ID changes
+            starts = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+            self.offsets = np.concatenate(([0], starts, [len(ids)])).astype(np.int64)
+        first = self.offsets[:-1]
+
+        # Storm-level columns, from each storm's first track point
+        self.ids = ids[first]
+        self.season = table.column("season").to_numpy()[first].astype(np.int32)
+        self.genesis = table.column("genesis").to_numpy()[first].astype("datetime64[s]")
+        self.metadata = {
+            field: DictionaryColumn.encode(table.column(field)).subset(first)
+            for field in ("ATCF_ID", "name", "basin", "subbasin")
+        }
+
+        # Per-point columns
+        self.time = table.column("time").to_numpy().astype("datetime64[s]")
+        self.floats = {
+            field: table.column(field).to_numpy(zero_copy_only=False).astype(np.float64)
+            for field in FLOAT_SERIES
+        }
+        self.strings = {
+            "classification": DictionaryColumn.encode(table.column("classification")),
+            "basins": DictionaryColumn.encode(_coalesce_blank(table, "basin_time", "basin")),
+            "subbasins": DictionaryColumn.encode(_coalesce_blank(table, "subbasin_time", "subbasin")),
+            "agencies": DictionaryColumn.encode(table.column("agency")),
+        }
+
+    @classmethod
+    def load(cls, db: PGConnection, dataset: DatasetVersion) -> "ColumnarDataset":
+        """Read the whole storms table with ``COPY`` and build a snapshot of ``dataset``."""
+        buffer = io.BytesIO()
+        # A full-table read; not bound by the per-request statement timeout
+        with statement_timeout_lifted(db):
+            copy_to(db, LOAD_QUERY, buffer)
+        buffer.seek(0)
+        table = pa_csv.read_csv(buffer, convert_options=CSV_CONVERT_OPTIONS)
+        return cls(table, dataset.version, dataset.updated_at)
+
+    @property
+    def dataset_version(self) -> DatasetVersion:
+        """The dataset version this snapshot holds, for cache keys and validators."""
+        return DatasetVersion(version=self.version, updated_at=self.updated_at)
+
+    @property
+    def storm_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def point_count(self) -> int:
+        return len(self.time)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint of the snapshot in bytes."""
+        total = self.offsets.nbytes + _object_nbytes(self.ids) + self.season.nbytes
+        total += self.genesis.nbytes + self.time.nbytes
+        total += sum(column.nbytes for column in self.metadata.values())
+        total += sum(column.nbytes for column in self.floats.values())
+        total += sum(column.nbytes for column in self.strings.values())
+        for index in ("segment_grid", "lifetimes", "search_index"):
+            if index in self.__dict__:
+                total += self.__dict__[index].nbytes
+        return total
+
+    @cached_property
+    def segment_grid(self) -> SegmentGrid:
+        """Spatial index over track segments, built on first use."""
+        return SegmentGrid(self.floats["lon"], self.floats["lat"], self.offsets)
+
+    def genesis_range(self, start: datetime, end: datetime) -> tuple[int, int]:
+        """Return the ``[lo, hi)`` storm indices with genesis in ``[start, end)``."""
+        lo = int(np.searchsorted(self.genesis, _instant(start), side="left"))
+        hi = int(np.searchsorted(self.genesis, _instant(end), side="left"))
+        return lo, hi
+
+    @cached_property
+    def id_index(self) -> dict[str, int]:
+        """Storm index of each ID, built on first use."""
+        return {storm_id: index for index, storm_id in enumerate(self.ids.tolist())}
+
+    @cached_property
+    def search_index(self) -> PrefixIndex:
+        """Prefix index of storm IDs, ATCF IDs and names, built on first use."""
+        columns = [self.ids] + [
+            column.values[column.codes] for column in (self.metadata["ATCF_ID"], self.metadata["name"])
+        ]
+        return PrefixIndex(
+            (text, index) for column in columns for index, text in enumerate(column.tolist())
+        )
+
+    @cached_property
+    def lifetimes(self) -> IntervalIndex:
+        """Index of each storm's first and last observation times, built on first use."""
+        return IntervalIndex(self.time[self.offsets[:-1]], self.time[self.offsets[1:] - 1])
+
+    def positions_at(self, instant: datetime) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Interpolate every storm active at ``instant``
+
+        Args:
+            instant: Time of the snapshot; naive values are UTC
+
+        Returns:
+            Indices of the active storms, and their ``lat``, ``lon``, ``wind``
+            and ``mslp`` linearly interpolated between the surrounding
+            observations (NaN where either observation is missing)
+        """
+        moment = _instant(instant)
+        storms = self.lifetimes.containing(moment)
+        last = self.offsets[storms + 1] - 1
+
+        # Bisect all storms at once for their last observation at or before the instant
+        lo, hi = self.offsets[storms].copy(), last.copy()
+        while (searching := lo < hi).any():
+            mid = (lo + hi + 1) // 2
+            before = self.time[mid] <= moment
+            lo = np.where(searching & before, mid, lo)
+            hi = np.where(searching & ~before, mid - 1, hi)
+        after = np.minimum(lo + 1, last)
+
+        span = (self.time[after] - self.time[lo]).astype(np.int64)
+        elapsed = (moment - self.time[lo]).astype(np.int64)
+        fraction = np.where(span > 0, elapsed / np.maximum(span, 1), 0.0)
+
+        values = {}
+        for field in ("lat", "wind", "mslp"):
+            column = self.floats[field]
+            values[field] = column[lo] + fraction * (column[after] - column[lo])
+        # Interpolate longitude the short way round, across the antimeridian if needed
+        lon = self.floats["lon"]
+        values["lon"] = wrap_longitude(lon[lo] + fraction * wrap_longitude(lon[after] - lon[lo]))
+        return storms, values
+
+    @cached_property
+    def max_wind(self) -> np.ndarray:
+        """Maximum sustained wind of each storm; NaN if never reported."""
+        if not self.storm_count:
+            return np.array([], dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            return np.fmax.reduceat(self.floats["wind"], self.offsets[:-1])
+
+    def genesis_mask(
+        self, indices: np.ndarray, start: datetime | None = None, end: datetime | None = None
+    ) -> np.ndarray:
+        """Mask of the storm ``indices`` with genesis in ``[start, end)``; either bound may be None."""
+        genesis = self.genesis[indices]
+        keep = np.ones(len(indices), dtype=bool)
+        if start is not None:
+            keep &= genesis >= _instant(start)
+        if end is not None:
+            keep &= genesis < _instant(end)
+        return keep
+
+    def filter_genesis(
+        self, indices: np.ndarray, start: datetime | None = None, end: datetime | None = None
+    ) -> np.ndarray:
+        """Keep the storm ``indices`` with genesis in ``[start, end)``."""
+        return indices[self.genesis_mask(indices, start, end)]
+
+    def storm(self, index: int, fields: Iterable[str] | None = None) -> Storm:
+        """
+        Build storm ``index`` from its column slices
+
+        Args:
+            index: Storm position in genesis order
+            fields: Optional time series to include; all of them if None.
+                The result is a partial storm (serialize with ``exclude_unset=True``)
+                when fields are given.
+
+        Returns:
+            The storm, constructed without validation
+        """
+        start, stop = int(self.offsets[index]), int(self.offsets[index + 1])
+        values = {
+            "ID": self.ids[index],
+            **{field: column[index] for field, column in self.metadata.items()},
+            "season": int(self.season[index]),
+            "genesis": self.genesis[index].item(),
+        }
+        series = SERIES_FIELDS if fields is None else [f for f in SERIES_FIELDS if f in fields]
+        for field in series:
+            if field == "time":
+                values[field] = self.time[start:stop].tolist()
+            elif field in self.strings:
+                values[field] = self.strings[field].take(start, stop)
+            else:
+                values[field] = float_list(self.floats[field][start:stop])
+        return Storm.model_construct(**values)
+
+    def storms_by_genesis(
+        self,
+        start: datetime,
+        end: datetime,
+        fields: Iterable[str] | None = None,
+        order_by_id: bool = False,
+    ) -> Iterator[Storm]:
+        """Yield storms with genesis in ``[start, end)``, by genesis then ID or by ID alone."""
+        lo, hi = self.genesis_range(start, end)
+        indices = np.arange(lo, hi)
+        if order_by_id:
+            indices = lo + np.argsort(self.ids[lo:hi], kind="stable")
+        for index in indices.tolist():
+            yield self.storm(index, fields)
+
+
+def _coalesce_blank(table: pa.Table, column: str, fallback: str) -> pa.ChunkedArray:
+    """``COALESCE(NULLIF(column, ''), fallback)``"""
+    values = table.column(column)
+    present = pc.fill_null(pc.not_equal(values, ""), False)
+    return pc.if_else(present, values, table.column(fallback))
+
+
+class ColumnarEngine:
+    """
+    Holds the current ColumnarDataset and reloads it when the dataset version changes
+
+    Readers always get a complete snapshot: a reload builds a new dataset
+    and swaps the reference in one assignment. While one request reloads,
+    concurrent requests keep being served from the previous snapshot, so
+    anything derived from a snapshot (cache keys, ETags) must use its
+    ``dataset_version`` rather than the current one.
+
+    Without a dataset version (the updater never ran) changes cannot be
+    detected, so such a snapshot is reloaded once it is older than
+    ``COLUMNAR_UNVERSIONED_MAX_AGE`` seconds.
+    """
+
+    def __init__(self):
+        self._dataset: ColumnarDataset | None = None
+        self._load_lock = threading.Lock()
+        self._loads = 0
+        self._last_load_seconds = 0.0
+
+    def get(self, db: PGConnection) -> ColumnarDataset:
+        """Return a snapshot of the current dataset version, loading it if needed."""
+        current = dataset_versions.get(db)
+        version = current.version
+        dataset = self._dataset
+        if dataset is not None and not self._is_stale(dataset, version):
+            return dataset
+
+        if dataset is not None and not self._load_lock.acquire(blocking=False):
+            # Another request is already reloading
+            return dataset
+        if dataset is None:
+            self._load_lock.acquire()
+        try:
+            dataset = self._dataset
+            if dataset is None or self._is_stale(dataset, version):
+                started = time.perf_counter()
+                dataset = ColumnarDataset.load(db, current)
+                self._dataset = dataset
+                self._loads += 1
+                self._last_load_seconds = time.perf_counter() - started
+            return dataset
+        finally:
+            self._load_lock.release()
+
+    @staticmethod
+    def _is_stale(dataset: "ColumnarDataset", version: int) -> bool:
+        if version == 0:
+            return (
+                dataset.version != 0
+                or time.monotonic() - dataset.loaded_at >= settings.COLUMNAR_UNVERSIONED_MAX_AGE
+            )
+        return dataset.version != version
+
+    def clear(self) -> None:
+        """Drop the loaded snapshot; the next ``get`` reloads it."""
+        self._dataset = None
+
+    def stats(self) -> dict:
+        """Return the loaded snapshot's size and memory footprint."""
+        dataset = self._dataset
+        return {
+            "loaded": dataset is not None,
+            "version": dataset.version if dataset else None,
+            "storms": dataset.storm_count if dataset else 0,
+            "points": dataset.point_count if dataset else 0,
+            "memory_bytes": dataset.nbytes if dataset else 0,
+            "loads": self._loads,
+            "last_load_seconds": self._last_load_seconds,
+        }
+
+
+columnar_engine = ColumnarEngine()
@@ -0,0 +1,186 @@
+"""
+Bulk export of the storms table via PostgreSQL COPY ... TO STDOUT
+"""
+import queue
+import threading
+import zlib
+from typing import IO, Iterator
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from psycopg2.extensions import connection as PGConnection
+
+# Bytes buffered from COPY before a chunk is compressed and handed on
+CHUNK_SIZE = 256 * 1024
+
+STRING_COLUMNS = (
+    "ID", "ATCF_ID", "name", "basin", "subbasin", "classification",
+    "basin_time", "subbasin_time", "agency",
+    # Storm time-series names used by in-memory loads
+    "basins", "subbasins", "agencies",
+)
+
+FLOAT_COLUMNS = (
+    "lat", "lon", "wind", "mslp", "speed", "dist2land", "rmw",
+    *(f"R{speed}_{quadrant}" for speed in (34, 50, 64) for quadrant in ("NE", "SE", "SW", "NW")),
+)
+
+# Options for reading COPY CSV output with pyarrow. Types are explicit since
+# sparse columns such as ATCF_ID or the wind radii would otherwise be inferred
+# as null. Only COPY's unquoted empty field is NULL: pyarrow's default null
+# markers include "NA", the North Atlantic basin code, and a quoted "" is an
+# empty string.
+CSV_CONVERT_OPTIONS = pa_csv.ConvertOptions(
+    column_types={
+        **{column: pa.string() for column in STRING_COLUMNS},
+        **{column: pa.float64() for column in FLOAT_COLUMNS},
+        "season": pa.int32(),
+        "genesis": pa.timestamp("s"),
+        "time": pa.timestamp("s"),
+    },
+    null_values=[""],
+    strings_can_be_null=True,
+    quoted_strings_can_be_null=False,
+)
+
+
+def copy_query(
+    db: PGConnection,
+    basin: str | None = None,
+    season_from: int | None = None,
+    season_to: int | None = None,
+) -> str:
+    """Build a ``COPY ... TO STDOUT`` statement exporting storms as CSV with a header.
+
+    COPY does not accept bind parameters, so filters are inlined with
+    ``mogrify`` (which quotes them safely).
+    """
+    conditions, params = [], []
+    if basin is not None:
+        conditions.append("basin = %s")
+        params.append(basin)
+    if season_from is not None:
+        conditions.append("season >= %s")
+        params.append(season_from)
+    if season_to is not None:
+        conditions.append("season <= %s")
+        params.append(season_to)
+    where = " AND ".join(conditions) or "TRUE"
+
+    with db.cursor() as cursor:
+        select = cursor.mogrify(
+            f'SELECT * FROM storms WHERE {where} ORDER BY "ID", time', params
+        ).decode("utf-8")
+    return f"COPY ({select}) TO STDOUT WITH (FORMAT csv, HEADER true)"
+
+
+def copy_to(db: PGConnection, copy_sql: str, file: IO[bytes]) -> None:
+    """Run ``copy_sql`` and write its raw CSV output to ``file``."""
+    with db.cursor() as cursor:
+        cursor.copy_expert(copy_sql, file)
+
+
+class _ExportCancelled(Exception):
+    pass
+
+
+class _ChunkWriter:
+    """File-like sink for ``copy_expert`` that hands fixed-size chunks to a queue."""
+
+    def __init__(self, chunks: queue.Queue, compress: bool, cancelled: threading.Event):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+        # wbits=31 selects the gzip container
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def _emit(self, data: bytes) -> None:
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        if data:
+            while True:
+                if self._cancelled.is_set():
+                    # Aborts the COPY inside copy_expert
+                    raise _ExportCancelled()
+                try:
+                    self._chunks.put(data, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        if len(self._buffer) >= CHUNK_SIZE:
+            self._emit(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def close(self) -> None:
+        self._emit(bytes(self._buffer))
+        self._buffer.clear()
+        if self._compressor is not None:
+            tail = self._compressor.flush()
+            self._compressor = None
+            self._emit(tail)
+
+
+_DONE = object()
+
+
+def stream_copy(db: PGConnection, copy_sql: str, compress: bool = True) -> Iterator[bytes]:
+    """
+    Stream the output of a ``COPY ... TO STDOUT`` statement in chunks
+
+    The COPY runs in a worker thread writing straight from the driver's
+    buffer into a bounded queue, so no per-row Python objects are created
+    and memory stays flat. Closing the iterator early cancels the COPY.
+
+    Args:
+        db: Connection to run the COPY on (busy until the iterator finishes)
+        copy_sql: Statement from ``copy_query``
+        compress: Gzip the output
+
+    Yields:
+        CSV (or gzip-compressed CSV) chunks
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=8)
+    cancelled = threading.Event()
+    errors: list[BaseException] = []
+
+    def run() -> None:
+        writer = _ChunkWriter(chunks, compress, cancelled)
+        try:
+            copy_to(db, copy_sql, writer)
+            writer.close()
+        except _ExportCancelled:
+            pass
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            while True:
+                try:
+                    chunks.put(_DONE, timeout=0.1)
+                    break
+                except queue.Full:
+                    if cancelled.is_set():
+                        break
+
+    worker = threading.Thread(target=run, name="storms-export", daemon=True)
+    worker.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _DONE:
+                break
+            yield chunk
+        if errors:
+            raise errors[0]
+    finally:
+        cancelled.set()
+        # Unblock the worker if it is waiting on a full queue
+        while worker.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        worker.join()
@@ -0,0 +1,168 @@
+"""
+Columnar binary encodings of StormCollection (Arrow IPC and MessagePack)
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
+
+import msgpack
+import numpy as np
+import pyarrow as pa
+
+from app.core.negotiation import parse_quality_list
+from app.schemas.storm import StormCollection
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Offered media types in server preference order, with accepted aliases
+MEDIA_TYPES: dict[str, tuple[str, ...]] = {
+    JSON_MEDIA_TYPE: (JSON_MEDIA_TYPE,),
+    ARROW_MEDIA_TYPE: (ARROW_MEDIA_TYPE,),
+    MSGPACK_MEDIA_TYPE: (MSGPACK_MEDIA_TYPE, "application/x-msgpack"),
+}
+
+METADATA_FIELDS = ("ID", "ATCF_ID", "name", "basin", "subbasin", "season", "genesis")
+STRING_SERIES = ("classification", "basins", "subbasins", "agencies")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    """Pick the response media type for an ``Accept`` header, defaulting to JSON."""
+    qualities = parse_quality_list(accept)
+    if not qualities:
+        return JSON_MEDIA_TYPE
+
+    best, best_quality = JSON_MEDIA_TYPE, 0.0
+    for media_type, aliases in MEDIA_TYPES.items():
+        # The most specific matching range decides the quality
+        major = media_type.split("/")[0]
+        for candidate in (*aliases, f"{major}/*", "*/*"):
+            if candidate in qualities:
+                quality = qualities[candidate]
+                break
+        else:
+            quality = 0.0
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+def _micros(value: datetime) -> int:
+    """Microseconds since the Unix epoch; naive datetimes are UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def to_arrow(collection: StormCollection, series: Sequence[str]) -> bytes:
+    """
+    Encode storms as an Arrow IPC stream
+
+    One record per storm: metadata as scalar columns and every time series
+    as a list column. Float series are ``list<float64>`` whose child arrays
+    carry validity bitmaps for missing observations.
+
+    Args:
+        collection: Storms to encode
+        series: Time series fields to include, in schema order
+
+    Returns:
+        Arrow IPC stream bytes
+    """
+    storms = collection.storms
+    arrays = {
+        "ID": pa.array([s.ID for s in storms], pa.string()),
+        "ATCF_ID": pa.array([s.ATCF_ID for s in storms], pa.string()),
+        "name": pa.array([s.name for s in storms], pa.string()),
+        "basin": pa.array([s.basin for s in storms], pa.string()),
+        "subbasin": pa.array([s.subbasin for s in storms], pa.string()),
+        "season": pa.array([s.season for s in storms], pa.int32()),
+        "genesis": pa.array([s.genesis for s in storms], pa.timestamp("us")),
+    }
+    for field in series:
+        if field == "time":
+            value_type = pa.timestamp("us")
+        elif field in STRING_SERIES:
+            value_type = pa.string()
+        else:
+            value_type = pa.float64()
+        arrays[field] = pa.array([getattr(s, field) for s in storms], pa.list_(value_type))
+
+    table = pa.table(arrays)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _float_column(values: list[float | None]) -> dict[str, Any]:
+    array = np.array([np.nan if value is None else value for value in values], dtype="<f8")
+    valid = np.array([value is not None for value in values], dtype=bool)
+    return {
+        "dtype": "float64",
+        "data": array.tobytes(),
+        # Arrow-style bitmap: bit i (least significant first) set if value i is present
+        "validity": None if valid.all() else np.packbits(valid, bitorder="little").tobytes(),
+    }
+
+
+def to_msgpack(collection: StormCollection, series: Sequence[str]) -> bytes:
+    """
+    Encode storms as a columnar MessagePack document
+
+    Time series of all storms are concatenated into flat columns; storm ``i``
+    owns the slice ``offsets[i]:offsets[i + 1]``. The document is::
+
+        {
+            "length": <number of storms>,
+            "offsets": <int64 little-endian bytes, length + 1 values>,
+            "metadata": {"ID": [...], ..., "genesis": <int64 µs since epoch bytes>},
+            "series": {
+                "time": {"dtype": "datetime64[us]", "data": <int64 bytes>},
+                "lat": {"dtype": "float64", "data": <float64 bytes>, "validity": <bitmap or nil>},
+                "classification": {"dtype": "string", "data": [...]},
+                ...
+            },
+        }
+
+    Args:
+        collection: Storms to encode
+        series: Time series fields to include, in schema order
+
+    Returns:
+        MessagePack bytes
+    """
+    storms = collection.storms
+    lengths = [len(getattr(storm, series[0])) if series else 0 for storm in storms]
+    offsets = np.zeros(len(storms) + 1, dtype="<i8")
+    np.cumsum(lengths, out=offsets[1:])
+
+    metadata: dict[str, Any] = {
+        field: [getattr(storm, field) for storm in storms]
+        for field in METADATA_FIELDS
+        if field != "genesis"
+    }
+    metadata["genesis"] = np.array([_micros(s.genesis) for s in storms], dtype="<i8").tobytes()
+
+    columns: dict[str, Any] = {}
+    for field in series:
+        flat = [value for storm in storms for value in getattr(storm, field)]
+        if field == "time":
+            columns[field] = {
+                "dtype": "datetime64[us]",
+                "data": np.array([_micros(value) for value in flat], dtype="<i8").tobytes(),
+            }
+        elif field in STRING_SERIES:
+            columns[field] = {"dtype": "string", "data": flat}
+        else:
+            columns[field] = _float_column(flat)
+
+    document = {
+        "length": len(storms),
+        "offsets": offsets.tobytes(),
+        "metadata": metadata,
+        "series": columns,
+    }
+    return msgpack.packb(document, use_bin_type=True)
@@ -0,0 +1,40 @@
+"""
+Stabbing queries over storm lifetimes
+"""
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    Finds the intervals ``[start, end]`` containing an instant
+
+    Intervals are sorted by start. Any interval containing ``t`` starts in
+    ``[t - longest, t]``, where ``longest`` is the longest interval, so a
+    query is two binary searches plus a vectorized check of the ends in that
+    window. Storm lifetimes are short (weeks) compared to the archive
+    (decades), so the window holds only a handful of storms.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        """
+        Args:
+            starts: Interval starts (any sortable dtype, e.g. datetime64)
+            ends: Interval ends, same dtype, ``ends >= starts``
+        """
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.longest = (self.ends - self.starts).max() if len(starts) else None
+
+    @property
+    def nbytes(self) -> int:
+        return self.order.nbytes + self.starts.nbytes + self.ends.nbytes
+
+    def containing(self, instant: np.ndarray) -> np.ndarray:
+        """Return the sorted positions (in the original order) of the intervals containing ``instant``."""
+        if self.longest is None:
+            return np.array([], dtype=np.int64)
+        lo = np.searchsorted(self.starts, instant - self.longest, side="left")
+        hi = np.searchsorted(self.starts, instant, side="right")
+        window = np.arange(lo, hi)
+        return np.sort(self.order[window[self.ends[lo:hi] >= instant]])
@@ -0,0 +1,136 @@
+"""
+Minimal Mapbox Vector Tile (v2.1) encoder for line features
+
+Only the parts of the protobuf wire format used by ``vector_tile.proto`` are
+implemented: varints, length-delimited fields and packed repeated uint32.
+"""
+import struct
+from dataclasses import dataclass, field
+from typing import Sequence
+
+import numpy as np
+
+# Geometry types and commands from the specification
+LINESTRING = 2
+MOVE_TO = 1
+LINE_TO = 2
+
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _key(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _length_delimited(number: int, payload: bytes) -> bytes:
+    return _key(number, _LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+def _packed(number: int, values: Sequence[int]) -> bytes:
+    return _length_delimited(number, b"".join(_varint(value) for value in values))
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    return (values << 1) ^ (values >> 63)
+
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def encode_lines(parts: Sequence[np.ndarray]) -> list[int]:
+    """
+    Encode line parts as MVT geometry commands
+
+    Args:
+        parts: Integer ``(n, 2)`` tile coordinate arrays, each with at least two points
+
+    Returns:
+        Command integers for the feature's ``geometry`` field
+    """
+    commands: list[int] = []
+    cursor = np.zeros(2, dtype=np.int64)
+    for part in parts:
+        part = part.astype(np.int64)
+        deltas = np.diff(np.vstack((cursor, part)), axis=0)
+        encoded = _zigzag(deltas).ravel().tolist()
+        commands.append(_command(MOVE_TO, 1))
+        commands.extend(encoded[:2])
+        commands.append(_command(LINE_TO, len(part) - 1))
+        commands.extend(encoded[2:])
+        cursor = part[-1]
+    return commands
+
+
+def _value(value: str | float | int | bool) -> bytes:
+    # Tile.Value fields: 1 string, 3 double, 6 sint64, 7 bool
+    if isinstance(value, bool):
+        return _key(7, _VARINT) + _varint(int(value))
+    if isinstance(value, int):
+        return _key(6, _VARINT) + _varint((value << 1) ^ (value >> 63))
+    if isinstance(value, float):
+        return _key(3, _FIXED64) + struct.pack("<d", value)
+    return _length_delimited(1, value.encode("utf-8"))
+
+
+@dataclass
+class Layer:
+    """One named layer of line features, with shared key and value tables."""
+
+    name: str
+    extent: int = 4096
+    _features: list[bytes] = field(default_factory=list)
+    _keys: dict[str, int] = field(default_factory=dict)
+    _values: dict[tuple[type, str | float | int | bool], int] = field(default_factory=dict)
+
+    def _tags(self, properties: dict[str, str | float | int | bool | None]) -> list[int]:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            key_index = self._keys.setdefault(key, len(self._keys))
+            # Keyed on type as well, so 1 and 1.0 stay distinct values
+            value_index = self._values.setdefault((type(value), value), len(self._values))
+            tags += [key_index, value_index]
+        return tags
+
+    def add_line(
+        self,
+        parts: Sequence[np.ndarray],
+        properties: dict[str, str | float | int | bool | None],
+    ) -> None:
+        """Add a (multi-)linestring feature; None-valued properties are omitted."""
+        if not parts:
+            return
+        feature = _packed(2, self._tags(properties))
+        feature += _key(3, _VARINT) + _varint(LINESTRING)
+        feature += _packed(4, encode_lines(parts))
+        self._features.append(feature)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def encode(self) -> bytes:
+        body = _key(15, _VARINT) + _varint(2)
+        body += _length_delimited(1, self.name.encode("utf-8"))
+        body += b"".join(_length_delimited(2, feature) for feature in self._features)
+        body += b"".join(_length_delimited(3, key.encode("utf-8")) for key in self._keys)
+        body += b"".join(_length_delimited(4, _value(value)) for _, value in self._values)
+        body += _key(5, _VARINT) + _varint(self.extent)
+        return body
+
+
+def encode_tile(layers: Sequence[Layer]) -> bytes:
+    """Serialize a tile; empty layers are left out, so a tile without features is empty."""
+    return b"".join(_length_delimited(3, layer.encode()) for layer in layers if len(layer))
@@ -0,0 +1,122 @@
+"""
+Closest approach of storm tracks to a location
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.spatial import SegmentGrid
+
+# Mean Earth radius (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km between points given in degrees."""
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+def _angle(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Angle between unit vectors, accurate for small and large angles alike."""
+    return np.arctan2(np.linalg.norm(np.cross(u, v), axis=-1), np.sum(u * v, axis=-1))
+
+
+def search_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """Unwrapped lon/lat box containing the spherical cap of ``radius_km`` around a point."""
+    radius = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(radius)
+    south, north = lat - dlat, lat + dlat
+    if south <= -90.0 or north >= 90.0:
+        # The cap contains a pole
+        return -180.0, max(south, -90.0), 180.0, min(north, 90.0)
+    ratio = math.sin(radius) / math.cos(math.radians(lat))
+    if ratio >= 1.0:
+        return -180.0, south, 180.0, north
+    dlon = math.degrees(math.asin(ratio))
+    return lon - dlon, south, lon + dlon, north
+
+
+@dataclass
+class Approaches:
+    """Closest approach of each matching storm, ordered by distance."""
+
+    storms: np.ndarray
+    distance_km: np.ndarray
+    # Position of the closest approach on the track
+    start: np.ndarray
+    stop: np.ndarray
+    fraction: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+
+
+def closest_approaches(grid: SegmentGrid, lat: float, lon: float, radius_km: float) -> Approaches:
+    """
+    Find the storms whose tracks pass within ``radius_km`` of a location
+
+    Candidate segments come from the grid cells covering the search circle.
+    The closest point of each segment is then found on the sphere: the
+    location is projected onto the segment's great circle, falling back to
+    the nearer endpoint when the projection lies outside the segment.
+
+    Args:
+        grid: Segment index of the dataset
+        lat: Latitude of the location
+        lon: Longitude of the location
+        radius_km: Search radius in km
+
+    Returns:
+        The matching storms with the segment, fraction along it and position
+        of their closest approach
+    """
+    segments = grid.candidates(search_box(lat, lon, radius_km))
+    a = _unit_vectors(grid.y1[segments], grid.x1[segments])
+    b = _unit_vectors(grid.y2[segments], grid.x2[segments])
+    p = _unit_vectors(np.float64(lat), np.float64(lon))
+
+    normal = np.cross(a, b)
+    norm = np.linalg.norm(normal, axis=-1)
+    degenerate = norm < 1e-12
+    normal = normal / np.where(degenerate, 1.0, norm)[:, None]
+
+    # Projection of the location onto each segment's great circle
+    projected = p - np.sum(p * normal, axis=-1)[:, None] * normal
+    projected /= np.maximum(np.linalg.norm(projected, axis=-1), 1e-12)[:, None]
+    between = (
+        ~degenerate
+        & (np.sum(np.cross(a, projected) * normal, axis=-1) >= 0)
+        & (np.sum(np.cross(projected, b) * normal, axis=-1) >= 0)
+    )
+
+    to_a, to_b = _angle(p, a), _angle(p, b)
+    nearer_b = to_b < to_a
+    closest = np.where(between[:, None], projected, np.where(nearer_b[:, None], b, a))
+    angle = np.where(between, _angle(p, projected), np.minimum(to_a, to_b))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        along = np.where(between, _angle(a, projected) / _angle(a, b), nearer_b.astype(np.float64))
+    distance = angle * EARTH_RADIUS_KM
+
+    # Keep the nearest segment of each storm within the radius
+    order = np.argsort(distance, kind="stable")
+    order = order[distance[order] <= radius_km]
+    _, first = np.unique(grid.storm[segments[order]], return_index=True)
+    best = order[np.sort(first)]
+
+    chosen = segments[best]
+    return Approaches(
+        storms=grid.storm[chosen],
+        distance_km=distance[best],
+        start=grid.start[chosen],
+        stop=grid.stop[chosen],
+        fraction=np.nan_to_num(along[best]),
+        lat=np.degrees(np.arcsin(np.clip(closest[best, 2], -1.0, 1.0))),
+        lon=np.degrees(np.arctan2(closest[best, 1], closest[best, 0])),
+    )
@@ -0,0 +1,46 @@
+"""
+Case-insensitive prefix search over storm identifiers and names
+"""
+from typing import Iterable
+
+import numpy as np
+
+# Sorts after any character a search key can contain
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    """Search key for ``text``: case-folded and stripped."""
+    return text.strip().casefold()
+
+
+class PrefixIndex:
+    """
+    Sorted array of ``(key, value)`` pairs
+
+    All keys starting with a prefix are contiguous in sorted order, so a
+    lookup is two binary searches.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, int]]):
+        """
+        Args:
+            entries: ``(text, value)`` pairs; texts are normalized, None texts skipped
+        """
+        pairs = [(normalize(text), value) for text, value in entries if text]
+        keys = np.array([key for key, _ in pairs], dtype=str)
+        values = np.array([value for _, value in pairs], dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.values = values[order]
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.values.nbytes
+
+    def lookup(self, prefix: str) -> np.ndarray:
+        """Return the unique values of every key starting with ``prefix``."""
+        prefix = normalize(prefix)
+        lo = np.searchsorted(self.keys, prefix, side="left")
+        hi = np.searchsorted(self.keys, prefix + _MAX_CHAR, side="left")
+        return np.unique(self.values[lo:hi])
@@ -0,0 +1,56 @@
+import numpy as np
+
+# Web map tiles are 256 px wide and span 360 degrees of longitude at zoom 0
+TILE_SIZE = 256
+
+
+def tolerance_for_zoom(zoom: int) -> float:
+    """Simplification tolerance (degrees) equal to one screen pixel at ``zoom``."""
+    return 360.0 / (TILE_SIZE * 2**zoom)
+
+
+def douglas_peucker(x: np.ndarray, y: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify a polyline with the Douglas-Peucker algorithm
+
+    Distances from each run of interior points to its chord are computed in
+    one vectorized step per split, so the Python loop runs once per kept
+    point rather than once per input point.
+
+    Args:
+        x: Point x coordinates (e.g. longitude)
+        y: Point y coordinates (e.g. latitude), same length as ``x``
+        tolerance: Maximum distance a dropped point may lie from the simplified line
+
+    Returns:
+        Sorted indices of the points to keep; always includes both endpoints
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= 2 or tolerance <= 0:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        xs = x[start + 1:end] - x[start]
+        ys = y[start + 1:end] - y[start]
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        chord = np.hypot(dx, dy)
+        if chord == 0:
+            distances = np.hypot(xs, ys)
+        else:
+            distances = np.abs(dy * xs - dx * ys) / chord
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep)
@@ -0,0 +1,209 @@
+"""
+Grid index over storm track segments
+"""
+import numpy as np
+
+# Grid cell size in degrees
+CELL_SIZE = 2.0
+
+
+def wrap_longitude(lon: np.ndarray | float) -> np.ndarray | float:
+    """Wrap longitudes into ``[-180, 180)``."""
+    return (np.asarray(lon) + 180.0) % 360.0 - 180.0
+
+
+def clip_segments(
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    box: tuple[float, float, float, float],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized Liang-Barsky clipping of segments to an axis-aligned box.
+
+    Segment ``i`` runs from ``(x1, y1)`` at ``t = 0`` to ``(x2, y2)`` at ``t = 1``.
+
+    Returns:
+        Mask of the segments touching ``box = (minx, miny, maxx, maxy)``
+        (boundary included), and the ``t`` range of each inside the box
+    """
+    minx, miny, maxx, maxy = box
+    dx, dy = x2 - x1, y2 - y1
+    t0 = np.zeros(len(x1))
+    t1 = np.ones(len(x1))
+    inside = np.ones(len(x1), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x1 - minx), (dx, maxx - x1), (-dy, y1 - miny), (dy, maxy - y1)):
+            # Parallel to this edge and outside it
+            inside &= ~((p == 0) & (q < 0))
+            ratio = q / p
+            t0 = np.where(p < 0, np.maximum(t0, ratio), t0)
+            t1 = np.where(p > 0, np.minimum(t1, ratio), t1)
+    return inside & (t0 <= t1), t0, t1
+
+
+def segments_intersect_box(
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    box: tuple[float, float, float, float],
+) -> np.ndarray:
+    """Mask of the segments with at least one point inside ``box``."""
+    return clip_segments(x1, y1, x2, y2, box)[0]
+
+
+def clip_polyline(x: np.ndarray, y: np.ndarray, box: tuple[float, float, float, float]) -> list[np.ndarray]:
+    """
+    Clip a polyline to a box
+
+    Args:
+        x: Vertex x coordinates
+        y: Vertex y coordinates
+        box: ``(minx, miny, maxx, maxy)``
+
+    Returns:
+        The pieces of the line inside the box as ``(n, 2)`` arrays; a line
+        leaving and re-entering the box yields several pieces
+    """
+    if len(x) < 2:
+        return []
+    inside, t0, t1 = clip_segments(x[:-1], y[:-1], x[1:], y[1:], box)
+    dx, dy = np.diff(x), np.diff(y)
+    starts = np.column_stack((x[:-1] + t0 * dx, y[:-1] + t0 * dy))
+    stops = np.column_stack((x[:-1] + t1 * dx, y[:-1] + t1 * dy))
+
+    parts, current = [], []
+    current_index = -1
+    for index in np.flatnonzero(inside).tolist():
+        # A piece continues while each segment leaves the box only at its end
+        # and the next one starts at the shared vertex
+        if not current or t0[index] > 0 or index != current_index + 1:
+            if len(current) > 1:
+                parts.append(np.array(current))
+            current = [starts[index]]
+        current.append(stops[index])
+        current_index = index
+        if t1[index] < 1:
+            parts.append(np.array(current))
+            current = []
+    if len(current) > 1:
+        parts.append(np.array(current))
+    return parts
+
+
+class SegmentGrid:
+    """
+    Uniform lon/lat grid over the segments of every storm track
+
+    Each segment joins two consecutive track points of a storm (a storm with a
+    single point contributes one degenerate segment). Segments crossing the
+    antimeridian are unwrapped, so 179°E -> 179°W is a 2° hop rather than a
+    358° one, and registered in the cells on both sides. Cells store segment
+    numbers in CSR layout: the segments of cell ``c`` are
+    ``cell_segments[cell_starts[c]:cell_starts[c + 1]]``.
+    """
+
+    def __init__(self, lon: np.ndarray, lat: np.ndarray, offsets: np.ndarray, cell_size: float = CELL_SIZE):
+        """
+        Args:
+            lon: Longitude of every track point, storms stored contiguously
+            lat: Latitude of every track point
+            offsets: Storm ``i`` owns points ``offsets[i]:offsets[i + 1]``
+            cell_size: Cell size in degrees; should divide 180
+        """
+        self.cell_size = cell_size
+        self.columns = int(round(360.0 / cell_size))
+        self.rows = int(round(180.0 / cell_size))
+
+        count = len(lon)
+        lengths = np.diff(offsets)
+        continues = np.ones(max(count - 1, 0), dtype=bool)
+        # The last point of each storm does not start a segment
+        continues[offsets[1:-1] - 1] = False
+        starts = np.flatnonzero(continues)
+        stops = starts + 1
+        single = offsets[:-1][lengths == 1]
+        starts = np.concatenate((starts, single))
+        stops = np.concatenate((stops, single))
+        order = np.argsort(starts, kind="stable")
+        starts, stops = starts[order], stops[order]
+
+        # Track points at either end of each segment, and the storm it belongs to
+        self.start = starts
+        self.stop = stops
+        self.storm = np.searchsorted(offsets, starts, side="right") - 1
+        self.x1 = wrap_longitude(lon[starts]).astype(np.float64)
+        self.x2 = self.x1 + wrap_longitude(lon[stops] - lon[starts])
+        self.y1 = lat[starts].astype(np.float64)
+        self.y2 = lat[stops].astype(np.float64)
+        self._index_cells()
+
+    def _column(self, x: np.ndarray) -> np.ndarray:
+        return np.floor(x / self.cell_size).astype(np.int64)
+
+    def _row(self, y: np.ndarray) -> np.ndarray:
+        return np.clip(np.floor((y + 90.0) / self.cell_size).astype(np.int64), 0, self.rows - 1)
+
+    def _index_cells(self) -> None:
+        c0 = self._column(np.minimum(self.x1, self.x2))
+        c1 = self._column(np.maximum(self.x1, self.x2))
+        r0 = self._row(np.minimum(self.y1, self.y2))
+        r1 = self._row(np.maximum(self.y1, self.y2))
+        width = c1 - c0 + 1
+        counts = width * (r1 - r0 + 1)
+
+        # One (segment, cell) pair per cell overlapped by each segment's bounding box
+        segment = np.repeat(np.arange(len(counts)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        column = (c0[segment] + local % width[segment]) % self.columns
+        row = r0[segment] + local // width[segment]
+        cell = row * self.columns + column
+
+        order = np.argsort(cell, kind="stable")
+        self.cell_segments = segment[order]
+        self.cell_starts = np.searchsorted(cell[order], np.arange(self.rows * self.columns + 1))
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.start, self.stop, self.storm, self.x1, self.x2, self.y1, self.y2, self.cell_segments, self.cell_starts)
+        return sum(array.nbytes for array in arrays)
+
+    def candidates(self, box: tuple[float, float, float, float]) -> np.ndarray:
+        """Segments registered in the cells overlapping ``box`` (unwrapped, ``minx <= maxx``)."""
+        minx, miny, maxx, maxy = box
+        columns = np.arange(self._column(minx), self._column(maxx) + 1) % self.columns
+        rows = np.arange(self._row(miny), self._row(maxy) + 1)
+        cells = np.unique((rows[:, None] * self.columns + columns[None, :]).ravel())
+        slices = [self.cell_segments[self.cell_starts[c]:self.cell_starts[c + 1]] for c in cells.tolist()]
+        if not slices:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate(slices))
+
+    def query_bbox(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> np.ndarray:
+        """
+        Find the storms whose tracks intersect a lon/lat box
+
+        Args:
+            min_lon: West edge in ``[-180, 180]``; greater than ``max_lon`` for a
+                box spanning the antimeridian
+            min_lat: South edge
+            max_lon: East edge in ``[-180, 180]``
+            max_lat: North edge
+
+        Returns:
+            Sorted storm indices
+        """
+        minx, maxx = min_lon, max_lon
+        if maxx < minx:
+            maxx += 360.0
+        box = (minx, min_lat, maxx, max_lat)
+
+        segments = self.candidates(box)
+        x1, x2 = self.x1[segments], self.x2[segments]
+        y1, y2 = self.y1[segments], self.y2[segments]
+        hits = np.zeros(len(segments), dtype=bool)
+        # Unwrapped segments and boxes may sit a full turn apart
+        for shift in (-360.0, 0.0, 360.0):
+            hits |= segments_intersect_box(x1, y1, x2, y2, (minx + shift, min_lat, maxx + shift, max_lat))
+        return np.unique(self.storm[segments[hits]])
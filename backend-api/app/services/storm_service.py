@@ -1,9 +1,35 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+import numpy as np
 from psycopg2.extensions import connection as PGConnection
 
-from app.schemas.storm import Storm, StormCollection
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.dataset import DatasetVersion, dataset_versions
+from app.core.singleflight import month_flights
+from app.core.timing import add_rows, stage
+from app.schemas.storm import (
+    NearbyStorm,
+    NearbyStormCollection,
+    Snapshot,
+    Storm,
+    StormCollection,
+    StormPosition,
+    StormSearchResults,
+    StormSummary,
+)
+from app.services.columnar import ColumnarDataset, columnar_engine, float_list
+from app.services.formats import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    STRING_SERIES,
+    to_arrow,
+    to_msgpack,
+)
+from app.services.proximity import closest_approaches
+from app.services.simplify import douglas_peucker
 
 
 def _to_datetime(value: Any) -> datetime:
@@ -18,82 +44,708 @@ def _to_float(value: Any) -> float | None:
     return float(value)
 
 
+def month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    """Return the half-open ``[start, end)`` genesis range covering a calendar month."""
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
+
+
+# Storm-level fields, taken from the storm's first track point
+STORM_METADATA_COLUMNS: dict[str, str] = {
+    "ATCF_ID": '"ATCF_ID"',
+    "name": "name",
+    "basin": "basin",
+    "subbasin": "subbasin",
+    "season": "season",
+    "genesis": "genesis",
+}
+
+# Storm time-series fields and the per-track-point expression they collect
+STORM_SERIES_COLUMNS: dict[str, str] = {
+    "time": "time",
+    "lat": "lat",
+    "lon": "lon",
+    "wind": "wind",
+    "mslp": "mslp",
+    "speed": "speed",
+    "dist2land": "dist2land",
+    "classification": "classification",
+    "rmw": "rmw",
+    "basins": "COALESCE(NULLIF(basin_time, ''), basin)",
+    "subbasins": "COALESCE(NULLIF(subbasin_time, ''), subbasin)",
+    "agencies": "agency",
+    "R34_NE": '"R34_NE"',
+    "R34_SE": '"R34_SE"',
+    "R34_SW": '"R34_SW"',
+    "R34_NW": '"R34_NW"',
+    "R50_NE": '"R50_NE"',
+    "R50_SE": '"R50_SE"',
+    "R50_SW": '"R50_SW"',
+    "R50_NW": '"R50_NW"',
+    "R64_NE": '"R64_NE"',
+    "R64_SE": '"R64_SE"',
+    "R64_SW": '"R64_SW"',
+    "R64_NW": '"R64_NW"',
+}
+
+# Half-open range on genesis so idx_storms_genesis can serve the lookup
+GENESIS_RANGE_FILTER = "genesis >= %s AND genesis < %s"
+
+
+def series_columns(fields: Iterable[str] | None = None) -> dict[str, str]:
+    """Return the time-series columns to select, limited to ``fields`` if given."""
+    if fields is None:
+        return STORM_SERIES_COLUMNS
+    return {field: expr for field, expr in STORM_SERIES_COLUMNS.items() if field in fields}
+
+
+def json_float(expr: str) -> str:
+    """SQL rendering a float8 ``expr`` as a JSON number the way Pydantic does.
+
+    Postgres prints integral values without a fraction (``25``) where
+    Pydantic writes ``25.0``; other values use the same shortest round-trip
+    digits. (The two still differ below 1e-4 and from 1e15 in magnitude,
+    far outside IBTrACS values.)
+    """
+    return (
+        f"(CASE WHEN {expr} IS NULL THEN 'null' "
+        f"WHEN {expr} = trunc({expr}) AND abs({expr}) < 1e15 THEN {expr}::text || '.0' "
+        f"ELSE {expr}::text END)::json"
+    )
+
+
+def aggregate_query(where: str, fields: Iterable[str] | None = None, json_floats: bool = False) -> str:
+    """Build a query returning one row per storm with ``array_agg`` time series.
+
+    Storm metadata is always selected; time series are limited to ``fields``
+    when given, so unneeded columns are never read or transferred. With
+    ``json_floats``, numeric series are collected as ``json_float`` values,
+    for ``json_query``.
+    """
+    select_list = ['"ID"']
+    select_list += [
+        f'(array_agg({expr} ORDER BY time))[1] AS "{field}"'
+        for field, expr in STORM_METADATA_COLUMNS.items()
+    ]
+    for field, expr in series_columns(fields).items():
+        if json_floats and field != "time" and field not in STRING_SERIES:
+            expr = json_float(expr)
+        select_list.append(f'array_agg({expr} ORDER BY time) AS "{field}"')
+    columns = ",\n    ".join(select_list)
+    return f"""
+SELECT
+    {columns}
+FROM storms
+WHERE {where}
+GROUP BY "ID"
+ORDER BY "ID"
+"""
+
+
+def rows_query(where: str) -> str:
+    """Build a query returning one row per track point, grouped by storm in time order."""
+    return f"""
+SELECT *
+FROM storms
+WHERE {where}
+ORDER BY "ID", time
+"""
+
+
+MONTH_QUERY = rows_query(GENESIS_RANGE_FILTER)
+
+# Served by the ("ID", time) primary key; takes a list of IDs
+ID_FILTER = '"ID" = ANY(%s)'
+
+# Ordered by genesis first so idx_storms_genesis streams rows without a sort;
+# each storm's track points are still contiguous and in time order
+RANGE_QUERY = f"""
+SELECT *
+FROM storms
+WHERE {GENESIS_RANGE_FILTER}
+ORDER BY genesis, "ID", time
+"""
+
+
+def json_query(where: str, fields: Iterable[str] | None = None) -> str:
+    """Build a query returning a serialized StormCollection as a single text value.
+
+    Each ``aggregate_query`` row becomes a JSON object keyed by its column
+    aliases, which are exactly the ``Storm`` field names. The text is
+    byte-for-byte what ``encode_collection`` produces: compact separators
+    (``json_agg`` and ``json_build_object`` add spaces) and floats as
+    ``json_float``.
+    """
+    return f"""
+SELECT '{{"storms":[' || COALESCE(string_agg(row_to_json(storm)::text, ',' ORDER BY storm."ID"), '') || ']}}'
+    AS body
+FROM ({aggregate_query(where, fields, json_floats=True)}) AS storm
+"""
+
+
+MONTH_JSON_QUERY = json_query(GENESIS_RANGE_FILTER)
+
+
+def storm_from_rows(storm_rows: list[dict[str, Any]]) -> Storm:
+    """Build a Storm from its track point rows, ordered by time."""
+    first_row = storm_rows[0]
+
+    return Storm(
+        ID=first_row["ID"],
+        ATCF_ID=first_row["ATCF_ID"],
+        name=first_row["name"],
+        basin=first_row["basin"],
+        subbasin=first_row["subbasin"],
+        season=int(first_row["season"]),
+        genesis=_to_datetime(first_row["genesis"]),
+        # Time series data - collect from all rows
+        time=[_to_datetime(row["time"]) for row in storm_rows],
+        lat=[_to_float(row["lat"]) for row in storm_rows],
+        lon=[_to_float(row["lon"]) for row in storm_rows],
+        wind=[_to_float(row["wind"]) for row in storm_rows],
+        mslp=[_to_float(row["mslp"]) for row in storm_rows],
+        speed=[_to_float(row["speed"]) for row in storm_rows],
+        dist2land=[_to_float(row["dist2land"]) for row in storm_rows],
+        classification=[row["classification"] for row in storm_rows],
+        rmw=[_to_float(row["rmw"]) for row in storm_rows],
+        basins=[row["basin_time"] if row.get("basin_time") else row["basin"] for row in storm_rows],
+        subbasins=[row["subbasin_time"] if row.get("subbasin_time") else row["subbasin"] for row in storm_rows],
+        agencies=[row["agency"] for row in storm_rows],
+        # Wind radii
+        R34_NE=[_to_float(row["R34_NE"]) for row in storm_rows],
+        R34_SE=[_to_float(row["R34_SE"]) for row in storm_rows],
+        R34_SW=[_to_float(row["R34_SW"]) for row in storm_rows],
+        R34_NW=[_to_float(row["R34_NW"]) for row in storm_rows],
+        R50_NE=[_to_float(row["R50_NE"]) for row in storm_rows],
+        R50_SE=[_to_float(row["R50_SE"]) for row in storm_rows],
+        R50_SW=[_to_float(row["R50_SW"]) for row in storm_rows],
+        R50_NW=[_to_float(row["R50_NW"]) for row in storm_rows],
+        R64_NE=[_to_float(row["R64_NE"]) for row in storm_rows],
+        R64_SE=[_to_float(row["R64_SE"]) for row in storm_rows],
+        R64_SW=[_to_float(row["R64_SW"]) for row in storm_rows],
+        R64_NW=[_to_float(row["R64_NW"]) for row in storm_rows],
+    )
+
+
+def simplify_storm(storm: Storm, tolerance: float) -> Storm:
+    """Simplify a storm's lat/lon track and decimate every time series to match."""
+    kept = douglas_peucker(storm.lon, storm.lat, tolerance)
+    if len(kept) == len(storm.lat):
+        return storm
+    indices = kept.tolist()
+    updates = {}
+    for field in STORM_SERIES_COLUMNS:
+        # Partial storms (see ``partial_storm``) only carry some series
+        if field in storm.model_fields_set:
+            values = getattr(storm, field)
+            updates[field] = [values[i] for i in indices]
+    return storm.model_copy(update=updates)
+
+
+def storm_from_aggregate(row: dict[str, Any]) -> Storm:
+    """Build a Storm from a one-row-per-storm ``aggregate_query`` result.
+
+    The driver already returns native lists of floats and datetimes, so the
+    arrays are handed to the schema as-is.
+    """
+    return Storm(**row)
+
+
+def partial_storm(row: dict[str, Any]) -> Storm:
+    """Build a Storm carrying only the series selected by a projected ``aggregate_query``.
+
+    Serialize with ``exclude_unset=True`` so the missing series are omitted.
+    """
+    return Storm.model_construct(**row)
+
+
+def storms_query(where: str, fields: tuple[str, ...] | None, mode: str) -> str:
+    """Build the query selecting the storms matching ``where`` in the given query mode.
+
+    Projected queries always use the aggregate mode.
+    """
+    if fields is not None or mode == "aggregate":
+        return aggregate_query(where, fields)
+    return rows_query(where)
+
+
+def collection_from_rows(
+    rows: Iterable[Any], fields: tuple[str, ...] | None, mode: str
+) -> StormCollection:
+    """Assemble the result of a ``storms_query`` into a StormCollection.
+
+    Rows may be any mapping keyed by column name (psycopg2 or asyncpg records).
+    """
+    if fields is not None:
+        with stage("validate"):
+            return StormCollection.model_construct(storms=[partial_storm(row) for row in rows])
+    if mode == "aggregate":
+        with stage("validate"):
+            return StormCollection(storms=[storm_from_aggregate(row) for row in rows])
+
+    # Group rows by storm ID (each storm has multiple time points)
+    with stage("group"):
+        storms_by_id: dict[str, list[Any]] = {}
+        for row in rows:
+            storm_id = row["ID"]
+            storms_by_id.setdefault(storm_id, []).append(row)
+
+    # Build Storm objects from grouped rows
+    with stage("validate"):
+        storms = [storm_from_rows(storm_rows) for storm_rows in storms_by_id.values()]
+        return StormCollection(storms=storms)
+
+
+def month_query_fields(
+    tolerance: float | None, fields: tuple[str, ...] | None
+) -> tuple[str, ...] | None:
+    """Series to query for a month payload; simplification needs the track even if not requested."""
+    if tolerance is not None and fields is not None:
+        return tuple(series_columns({*fields, "lat", "lon"}))
+    return fields
+
+
+def simplify_collection(collection: StormCollection, tolerance: float | None) -> StormCollection:
+    """Apply ``simplify_storm`` to every storm, if a tolerance is given."""
+    if tolerance is None:
+        return collection
+    with stage("simplify"):
+        return StormCollection.model_construct(
+            storms=[simplify_storm(storm, tolerance) for storm in collection.storms]
+        )
+
+
+def use_json_fast_path(tolerance: float | None, media_type: str) -> bool:
+    """Whether a month payload from Postgres is serialized by ``json_query``."""
+    return media_type == JSON_MEDIA_TYPE and tolerance is None and settings.STORM_JSON_FAST_PATH
+
+
+def month_representation(
+    tolerance: float | None,
+    fields: tuple[str, ...] | None,
+    media_type: str,
+    json_fast_path: bool,
+) -> str:
+    """Identifier of the byte-level encoding of a month payload."""
+    if media_type != JSON_MEDIA_TYPE:
+        representation = media_type
+    elif json_fast_path:
+        representation = "json-pg"
+    else:
+        representation = "json"
+    if tolerance is not None:
+        representation += f":dp={tolerance!r}"
+    if fields is not None:
+        representation += ":fields=" + ",".join(fields)
+    return representation
+
+
+def month_cache_key(version: int, year: int, month: int, representation: str) -> tuple:
+    """Response cache (and single-flight) key of a month payload."""
+    return ("storms_month", version, year, month, representation)
+
+
 class StormService:
     """Service for querying storm data from the database."""
-    
-    def __init__(self, db: PGConnection):
+
+    def __init__(self, db: PGConnection, mode: str | None = None, backend: str | None = None):
         self.db = db
-    
-    def get_storms_by_month(self, year: int, month: int) -> StormCollection:
+        # "aggregate": one row per storm built by Postgres; "rows": one row per track point
+        self.mode = mode or settings.STORM_QUERY_MODE
+        # "postgres" or "memory" (see ``app.services.columnar``)
+        self.backend = backend or settings.STORM_BACKEND
+        self._snapshot: ColumnarDataset | None = None
+
+    def columnar_dataset(self) -> ColumnarDataset:
+        """Return the in-memory snapshot this service reads from.
+
+        Taken from ``columnar_engine`` on first use and kept for the life of
+        the service, so one request never mixes two snapshots even if a
+        reload completes meanwhile.
+        """
+        if self._snapshot is None:
+            self._snapshot = columnar_engine.get(self.db)
+        return self._snapshot
+
+    def get_storms_by_month(
+        self, year: int, month: int, fields: tuple[str, ...] | None = None
+    ) -> StormCollection:
         """
         Retrieve all storms for a given calendar month
-        
+
         Args:
             year: Calendar year
             month: Calendar month (1-12)
-            
+            fields: Optional time series to return; all of them if None.
+                Projected queries always use the aggregate mode and return
+                partial storms (serialize with ``exclude_unset=True``).
+
         Returns:
             StormCollection containing all storms from that month
         """
-        query = """
-        SELECT *
-        FROM storms
-        WHERE EXTRACT(YEAR FROM genesis) = %s
-          AND EXTRACT(MONTH FROM genesis) = %s
-        ORDER BY "ID", time
+        if self.backend == "memory":
+            with stage("columnar"):
+                dataset = self.columnar_dataset()
+                storms = dataset.storms_by_genesis(*month_bounds(year, month), fields, order_by_id=True)
+                return StormCollection.model_construct(storms=list(storms))
+
+        return self._query_storms(GENESIS_RANGE_FILTER, month_bounds(year, month), fields)
+
+    def get_storms_by_ids(
+        self, storm_ids: Iterable[str], fields: tuple[str, ...] | None = None
+    ) -> StormCollection:
         """
-        
-        with self.db.cursor() as cursor:
-            cursor.execute(query, (year, month))
+        Retrieve storms by IBTrACS ID in a single query
+
+        Args:
+            storm_ids: IDs to look up; unknown IDs are skipped and duplicates
+                returned once
+            fields: Optional time series to return; all of them if None
+
+        Returns:
+            StormCollection of the storms found, in the order first requested
+        """
+        requested = list(dict.fromkeys(storm_ids))
+        if self.backend == "memory":
+            dataset = self.columnar_dataset()
+            indices = [dataset.id_index[storm_id] for storm_id in requested if storm_id in dataset.id_index]
+            return StormCollection.model_construct(storms=[dataset.storm(i, fields) for i in indices])
+
+        collection = self._query_storms(ID_FILTER, (requested,), fields)
+        position = {storm_id: index for index, storm_id in enumerate(requested)}
+        storms = sorted(collection.storms, key=lambda storm: position[storm.ID])
+        return StormCollection.model_construct(storms=storms)
+
+    def _query_storms(
+        self, where: str, params: tuple, fields: tuple[str, ...] | None = None
+    ) -> StormCollection:
+        """Run the configured query mode for the storms matching ``where``, ordered by ID."""
+        with stage("sql"), self.db.cursor() as cursor:
+            cursor.execute(storms_query(where, fields, self.mode), params)
             rows = cursor.fetchall()
-        
-        # Group rows by storm ID (each storm has multiple time points)
-        storms_by_id: dict[str, list[dict[str, Any]]] = {}
-        for row in rows:
-            storm_id = row["ID"]
-            storms_by_id.setdefault(storm_id, []).append(row)
-        
-        # Build Storm objects from grouped rows
+        add_rows(len(rows))
+        return collection_from_rows(rows, fields, self.mode)
+
+    def iter_storms_by_genesis(
+        self, start: datetime, end: datetime, itersize: int | None = None
+    ) -> Iterator[Storm]:
+        """
+        Stream storms with genesis in ``[start, end)`` from a server-side cursor
+
+        Rows are fetched ``itersize`` at a time and each storm is yielded as
+        soon as its last track point has been read, so memory use does not
+        grow with the size of the range.
+
+        Args:
+            start: Earliest genesis (inclusive)
+            end: Latest genesis (exclusive)
+            itersize: Rows per network round trip; defaults to settings.STREAM_ITERSIZE
+
+        Yields:
+            Storms ordered by genesis, then ID
+        """
+        if self.backend == "memory":
+            yield from self.columnar_dataset().storms_by_genesis(start, end)
+            return
+
+        with self.db.cursor(name="storms_by_genesis") as cursor:
+            cursor.itersize = itersize or settings.STREAM_ITERSIZE
+            cursor.execute(RANGE_QUERY, (start, end))
+            storm_rows: list[dict[str, Any]] = []
+            for row in cursor:
+                if storm_rows and row["ID"] != storm_rows[0]["ID"]:
+                    yield storm_from_rows(storm_rows)
+                    storm_rows = []
+                storm_rows.append(row)
+            if storm_rows:
+                yield storm_from_rows(storm_rows)
+
+    def get_storms_in_bbox(
+        self,
+        bbox: tuple[float, float, float, float],
+        start: datetime | None = None,
+        end: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> StormCollection:
+        """
+        Retrieve the storms whose tracks intersect a lon/lat box
+
+        Answered from the in-memory dataset's segment grid (loaded on first
+        use with the postgres backend).
+
+        Args:
+            bbox: ``(min_lon, min_lat, max_lon, max_lat)``; ``min_lon > max_lon``
+                selects a box spanning the antimeridian
+            start: Optional earliest genesis (inclusive)
+            end: Optional latest genesis (exclusive)
+            fields: Optional time series to return; all of them if None
+
+        Returns:
+            StormCollection of the matching storms, ordered by genesis then ID
+        """
+        dataset = self.columnar_dataset()
+        indices = dataset.filter_genesis(dataset.segment_grid.query_bbox(*bbox), start, end)
+        return StormCollection.model_construct(
+            storms=[dataset.storm(index, fields) for index in indices.tolist()]
+        )
+
+    def get_storms_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> NearbyStormCollection:
+        """
+        Retrieve the storms whose tracks pass within ``radius_km`` of a location
+
+        Answered from the in-memory dataset's segment grid, with distances
+        measured to the track segments between observations.
+
+        Args:
+            lat: Latitude of the location
+            lon: Longitude of the location
+            radius_km: Search radius in km
+            start: Optional earliest genesis (inclusive)
+            end: Optional latest genesis (exclusive)
+            fields: Optional time series to return; all of them if None
+
+        Returns:
+            NearbyStormCollection ordered by closest approach distance
+        """
+        dataset = self.columnar_dataset()
+        approaches = closest_approaches(dataset.segment_grid, lat, lon, radius_km)
+        matching = dataset.genesis_mask(approaches.storms, start, end)
+
         storms = []
-        for storm_id, storm_rows in storms_by_id.items():
-            first_row = storm_rows[0]
-            
-            storm = Storm(
-                ID=first_row["ID"],
-                ATCF_ID=first_row["ATCF_ID"],
-                name=first_row["name"],
-                basin=first_row["basin"],
-                subbasin=first_row["subbasin"],
-                season=int(first_row["season"]),
-                genesis=_to_datetime(first_row["genesis"]),
-                # Time series data - collect from all rows
-                time=[_to_datetime(row["time"]) for row in storm_rows],
-                lat=[_to_float(row["lat"]) for row in storm_rows],
-                lon=[_to_float(row["lon"]) for row in storm_rows],
-                wind=[_to_float(row["wind"]) for row in storm_rows],
-                mslp=[_to_float(row["mslp"]) for row in storm_rows],
-                speed=[_to_float(row["speed"]) for row in storm_rows],
-                dist2land=[_to_float(row["dist2land"]) for row in storm_rows],
-                classification=[row["classification"] for row in storm_rows],
-                rmw=[_to_float(row["rmw"]) for row in storm_rows],
-                basins=[row["basin_time"] if row.get("basin_time") else row["basin"] for row in storm_rows],
-                subbasins=[row["subbasin_time"] if row.get("subbasin_time") else row["subbasin"] for row in storm_rows],
-                agencies=[row["agency"] for row in storm_rows],
-                # Wind radii
-                R34_NE=[_to_float(row["R34_NE"]) for row in storm_rows],
-                R34_SE=[_to_float(row["R34_SE"]) for row in storm_rows],
-                R34_SW=[_to_float(row["R34_SW"]) for row in storm_rows],
-                R34_NW=[_to_float(row["R34_NW"]) for row in storm_rows],
-                R50_NE=[_to_float(row["R50_NE"]) for row in storm_rows],
-                R50_SE=[_to_float(row["R50_SE"]) for row in storm_rows],
-                R50_SW=[_to_float(row["R50_SW"]) for row in storm_rows],
-                R50_NW=[_to_float(row["R50_NW"]) for row in storm_rows],
-                R64_NE=[_to_float(row["R64_NE"]) for row in storm_rows],
-                R64_SE=[_to_float(row["R64_SE"]) for row in storm_rows],
-                R64_SW=[_to_float(row["R64_SW"]) for row in storm_rows],
-                R64_NW=[_to_float(row["R64_NW"]) for row in storm_rows],
+        for position in np.flatnonzero(matching).tolist():
+            time_a = dataset.time[approaches.start[position]]
+            time_b = dataset.time[approaches.stop[position]]
+            seconds = round(int((time_b - time_a).astype(np.int64)) * float(approaches.fraction[position]))
+            storms.append(NearbyStorm.model_construct(
+                storm=dataset.storm(int(approaches.storms[position]), fields),
+                closest_time=(time_a + np.timedelta64(seconds, "s")).item(),
+                closest_lat=float(approaches.lat[position]),
+                closest_lon=float(approaches.lon[position]),
+                distance_km=float(approaches.distance_km[position]),
+            ))
+        return NearbyStormCollection.model_construct(storms=storms)
+
+    def get_snapshot(self, instant: datetime) -> Snapshot:
+        """
+        Retrieve the position of every storm active at an instant
+
+        A storm is active from its first to its last observation, whatever
+        month it formed in. Answered from the in-memory dataset.
+
+        Args:
+            instant: Time of the snapshot; naive values are UTC
+
+        Returns:
+            Snapshot with positions interpolated between observations
+        """
+        dataset = self.columnar_dataset()
+        storms, values = dataset.positions_at(instant)
+        columns = {field: float_list(values[field]) for field in ("lat", "lon", "wind", "mslp")}
+        positions = [
+            StormPosition.model_construct(
+                ID=dataset.ids[index],
+                ATCF_ID=dataset.metadata["ATCF_ID"][index],
+                name=dataset.metadata["name"][index],
+                basin=dataset.metadata["basin"][index],
+                season=int(dataset.season[index]),
+                **{field: column[position] for field, column in columns.items()},
             )
-            storms.append(storm)
-        
-        return StormCollection(storms=storms)
+            for position, index in enumerate(storms.tolist())
+        ]
+        return Snapshot.model_construct(time=instant, storms=positions)
+
+    def search_storms(self, query: str, limit: int = 20, after: str | None = None) -> StormSearchResults:
+        """
+        Find storms whose name, ID or ATCF ID starts with ``query``, ignoring case
+
+        Answered from a sorted prefix index of the in-memory dataset, rebuilt
+        with each dataset version.
+
+        Args:
+            query: Prefix to match
+            limit: Maximum number of storms to return
+            after: ID of the last storm of the previous page (keyset pagination)
+
+        Returns:
+            One page of storm summaries ordered by ID
+        """
+        dataset = self.columnar_dataset()
+        matches = dataset.search_index.lookup(query)
+        ids = dataset.ids[matches]
+        if after is not None:
+            keep = ids > after
+            matches, ids = matches[keep], ids[keep]
+        page = matches[np.argsort(ids, kind="stable")[:limit + 1]]
+
+        summaries = [
+            StormSummary.model_construct(
+                ID=dataset.ids[index],
+                ATCF_ID=dataset.metadata["ATCF_ID"][index],
+                name=dataset.metadata["name"][index],
+                basin=dataset.metadata["basin"][index],
+                season=int(dataset.season[index]),
+                genesis=dataset.genesis[index].item(),
+                max_wind=None if np.isnan(dataset.max_wind[index]) else float(dataset.max_wind[index]),
+            )
+            for index in page[:limit].tolist()
+        ]
+        next_after = summaries[-1].ID if len(page) > limit else None
+        return StormSearchResults.model_construct(storms=summaries, next_after=next_after)
+
+    def get_storms_by_month_json(
+        self, year: int, month: int, fields: tuple[str, ...] | None = None
+    ) -> bytes:
+        """
+        Retrieve all storms for a given calendar month as serialized JSON
+
+        The StormCollection document is built by Postgres, skipping
+        Pydantic validation and serialization entirely.
+
+        Args:
+            year: Calendar year
+            month: Calendar month (1-12)
+            fields: Optional time series to return; all of them if None
+
+        Returns:
+            UTF-8 encoded JSON matching the StormCollection schema
+        """
+        query = MONTH_JSON_QUERY if fields is None else json_query(GENESIS_RANGE_FILTER, fields)
+        with stage("sql"), self.db.cursor() as cursor:
+            cursor.execute(query, month_bounds(year, month))
+            body = cursor.fetchone()["body"]
+        return body.encode("utf-8")
+
+    def month_representation(
+        self,
+        tolerance: float | None = None,
+        fields: tuple[str, ...] | None = None,
+        media_type: str = JSON_MEDIA_TYPE,
+    ) -> str:
+        """Identifier of the byte-level encoding produced by ``get_month_payload``."""
+        return month_representation(
+            tolerance, fields, media_type, self._use_json_fast_path(tolerance, media_type)
+        )
+
+    def _use_json_fast_path(self, tolerance: float | None, media_type: str) -> bool:
+        return self.backend == "postgres" and use_json_fast_path(tolerance, media_type)
+
+    def dataset_version(self) -> DatasetVersion:
+        """Return the dataset version this service's responses are built from.
+
+        The current version (refreshed periodically) for the Postgres backend;
+        the in-memory backend may still be serving the previous snapshot while
+        another request reloads, so it reports that snapshot's version.
+        """
+        if self.backend == "memory":
+            return self.columnar_dataset().dataset_version
+        return dataset_versions.get(self.db)
+
+    def month_cache_key(
+        self,
+        year: int,
+        month: int,
+        tolerance: float | None = None,
+        fields: tuple[str, ...] | None = None,
+        media_type: str = JSON_MEDIA_TYPE,
+        dataset: DatasetVersion | None = None,
+    ) -> tuple:
+        """Response cache key of ``get_month_payload`` for ``dataset`` (default: the current version)."""
+        if dataset is None:
+            dataset = self.dataset_version()
+        return month_cache_key(
+            dataset.version,
+            year,
+            month,
+            self.month_representation(tolerance, fields, media_type),
+        )
+
+    def get_month_payload(
+        self,
+        year: int,
+        month: int,
+        tolerance: float | None = None,
+        fields: tuple[str, ...] | None = None,
+        media_type: str = JSON_MEDIA_TYPE,
+        cache_key: tuple | None = None,
+    ) -> bytes:
+        """
+        Retrieve the serialized StormCollection for a calendar month
+
+        Payloads are cached in-process, keyed on the dataset version, so
+        repeat requests between updater runs do not hit the storms table.
+        Concurrent misses for the same payload wait for a single build
+        rather than each querying the storms table.
+
+        Args:
+            year: Calendar year
+            month: Calendar month (1-12)
+            tolerance: Optional track simplification tolerance in degrees
+            fields: Optional time series to return, in schema order; all if None
+            media_type: JSON, Arrow IPC stream or MessagePack (see ``app.services.formats``)
+            cache_key: ``month_cache_key`` for the dataset version the caller
+                already read (so the payload matches its validators); read
+                from the current version if None
+
+        Returns:
+            The StormCollection encoded as ``media_type``
+        """
+        if not (settings.RESPONSE_CACHE_ENABLED or settings.SINGLE_FLIGHT_ENABLED):
+            return self._build_month_payload(year, month, tolerance, fields, media_type)
+
+        key = cache_key or self.month_cache_key(year, month, tolerance, fields, media_type)
+        if settings.RESPONSE_CACHE_ENABLED:
+            body = response_cache.get(key)
+            if body is not None:
+                return body
+
+        def build() -> bytes:
+            body = self._build_month_payload(year, month, tolerance, fields, media_type)
+            if settings.RESPONSE_CACHE_ENABLED:
+                # Stored before the flight ends, so no later miss rebuilds it
+                response_cache.put(key, body, len(body))
+            return body
+
+        if settings.SINGLE_FLIGHT_ENABLED:
+            return month_flights.do(key, build)
+        return build()
+
+    def _build_month_payload(
+        self,
+        year: int,
+        month: int,
+        tolerance: float | None,
+        fields: tuple[str, ...] | None,
+        media_type: str,
+    ) -> bytes:
+        if self._use_json_fast_path(tolerance, media_type):
+            return self.get_storms_by_month_json(year, month, fields)
+
+        collection = self.get_storms_by_month(year, month, month_query_fields(tolerance, fields))
+        collection = simplify_collection(collection, tolerance)
+        with stage("encode"):
+            return encode_collection(collection, media_type, fields)
+
 
+def encode_collection(
+    collection: StormCollection, media_type: str, fields: tuple[str, ...] | None = None
+) -> bytes:
+    """Serialize (possibly partial) storms as ``media_type``, keeping only ``fields`` series."""
+    series = list(series_columns(fields))
+    if media_type == ARROW_MEDIA_TYPE:
+        return to_arrow(collection, series)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return to_msgpack(collection, series)
+    unrequested = set(STORM_SERIES_COLUMNS) - set(series)
+    return collection.model_dump_json(exclude={"storms": {"__all__": unrequested}}).encode("utf-8")
@@ -0,0 +1,226 @@
+"""
+Storm tracks as Mapbox Vector Tiles
+"""
+import math
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from psycopg2.extensions import connection as PGConnection
+
+from app.core.cache import tile_cache
+from app.core.config import settings
+from app.core.dataset import DatasetVersion
+from app.services.columnar import ColumnarDataset, columnar_engine
+from app.services.mvt import Layer, encode_tile
+from app.services.simplify import TILE_SIZE, douglas_peucker
+from app.services.spatial import clip_polyline, wrap_longitude
+
+TILE_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+LAYER_NAME = "storms"
+
+# Web Mercator is cut off where the world becomes square
+MAX_LATITUDE = 85.0511287798
+
+
+def tile_latitude(y: float, z: int) -> float:
+    """Latitude of the horizontal tile edge ``y`` (may be fractional) at zoom ``z``."""
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2**z))))
+
+
+def tile_bounds(z: int, x: int, y: int, buffer: float = 0.0) -> tuple[float, float, float, float]:
+    """Return ``(west, south, east, north)`` of a tile grown by ``buffer`` tile widths.
+
+    Longitudes are not wrapped, so buffered edge tiles reach past ±180.
+    """
+    n = 2**z
+    west = (x - buffer) / n * 360.0 - 180.0
+    east = (x + 1 + buffer) / n * 360.0 - 180.0
+    north = tile_latitude(max(y - buffer, 0), z)
+    south = tile_latitude(min(y + 1 + buffer, n), z)
+    return west, south, east, north
+
+
+def project(lon: np.ndarray, lat: np.ndarray, z: int, x: int, y: int, extent: int) -> tuple[np.ndarray, np.ndarray]:
+    """Project lon/lat to Web Mercator tile coordinates (``0..extent`` inside the tile)."""
+    n = 2**z
+    px = ((lon + 180.0) / 360.0 * n - x) * extent
+    radians = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    py = ((1.0 - np.arcsinh(np.tan(radians)) / math.pi) / 2.0 * n - y) * extent
+    return px, py
+
+
+def _unwrap(lon: np.ndarray) -> np.ndarray:
+    """Make a track's longitudes continuous across the antimeridian."""
+    if len(lon) < 2:
+        return wrap_longitude(lon)
+    steps = wrap_longitude(np.diff(lon))
+    return wrap_longitude(lon[0]) + np.concatenate(([0.0], np.cumsum(steps)))
+
+
+def _query_box(west: float, south: float, east: float, north: float) -> tuple[float, float, float, float]:
+    """Turn unwrapped tile bounds into a ``SegmentGrid.query_bbox`` box."""
+    if east - west >= 360.0:
+        return -180.0, south, 180.0, north
+    if west < -180.0:
+        west += 360.0
+    if east > 180.0:
+        east -= 360.0
+    return west, south, east, north
+
+
+def render_tile(
+    dataset: ColumnarDataset,
+    z: int,
+    x: int,
+    y: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    extent: int | None = None,
+    buffer: int | None = None,
+) -> bytes:
+    """
+    Render the storm tracks crossing a tile
+
+    Tracks are simplified to one screen pixel with Douglas-Peucker, clipped
+    to the buffered tile and encoded as one line feature per storm in the
+    ``storms`` layer, with ``ID``, ``name``, ``season``, ``basin`` and
+    ``max_wind`` attributes.
+
+    Args:
+        dataset: In-memory storms snapshot
+        z: Zoom level
+        x: Tile column
+        y: Tile row (from the north)
+        start: Optional earliest genesis (inclusive)
+        end: Optional latest genesis (exclusive)
+        extent: Tile coordinate extent; defaults to settings.TILE_EXTENT
+        buffer: Buffer around the tile in extent units; defaults to settings.TILE_BUFFER
+
+    Returns:
+        Encoded tile; empty if no track crosses it
+    """
+    extent = extent or settings.TILE_EXTENT
+    buffer = settings.TILE_BUFFER if buffer is None else buffer
+    west, south, east, north = tile_bounds(z, x, y, buffer / extent)
+    indices = dataset.segment_grid.query_bbox(*_query_box(west, south, east, north))
+    indices = dataset.filter_genesis(indices, start, end)
+
+    layer = Layer(LAYER_NAME, extent)
+    clip_box = (-buffer, -buffer, extent + buffer, extent + buffer)
+    tolerance = extent / TILE_SIZE
+    lons, lats = dataset.floats["lon"], dataset.floats["lat"]
+    for index in indices.tolist():
+        first, last = dataset.offsets[index], dataset.offsets[index + 1]
+        lon, lat = _unwrap(lons[first:last]), lats[first:last]
+        parts = []
+        # Draw the copy (or copies) of the track that overlap this tile's longitudes
+        for shift in (-360.0, 0.0, 360.0):
+            if lon.max() + shift < west or lon.min() + shift > east:
+                continue
+            px, py = project(lon + shift, lat, z, x, y, extent)
+            kept = douglas_peucker(px, py, tolerance)
+            for part in clip_polyline(px[kept], py[kept], clip_box):
+                part = np.rint(part).astype(np.int64)
+                moved = np.any(np.diff(part, axis=0) != 0, axis=1)
+                part = part[np.concatenate(([True], moved))]
+                if len(part) > 1:
+                    parts.append(part)
+
+        max_wind = dataset.max_wind[index]
+        layer.add_line(parts, {
+            "ID": dataset.ids[index],
+            "name": dataset.metadata["name"][index],
+            "season": int(dataset.season[index]),
+            "basin": dataset.metadata["basin"][index],
+            "max_wind": None if np.isnan(max_wind) else float(max_wind),
+        })
+    return encode_tile([layer])
+
+
+class TileMetrics:
+    """Running totals of tile render time and size."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "tiles_rendered": 0,
+            "empty_tiles": 0,
+            "render_seconds_total": 0.0,
+            "render_seconds_max": 0.0,
+            "bytes_total": 0,
+            "bytes_max": 0,
+        }
+
+    def record(self, seconds: float, size: int) -> None:
+        with self._lock:
+            counters = self._counters
+            counters["tiles_rendered"] += 1
+            counters["empty_tiles"] += size == 0
+            counters["render_seconds_total"] += seconds
+            counters["render_seconds_max"] = max(counters["render_seconds_max"], seconds)
+            counters["bytes_total"] += size
+            counters["bytes_max"] = max(counters["bytes_max"], size)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._counters)
+
+
+tile_metrics = TileMetrics()
+
+
+class TileService:
+    """Serves cached vector tiles of the in-memory dataset."""
+
+    def __init__(self, db: PGConnection):
+        self.db = db
+        self._snapshot: ColumnarDataset | None = None
+
+    def columnar_dataset(self) -> ColumnarDataset:
+        """Return the in-memory snapshot tiles are rendered from, fixed on first use."""
+        if self._snapshot is None:
+            self._snapshot = columnar_engine.get(self.db)
+        return self._snapshot
+
+    def dataset_version(self) -> DatasetVersion:
+        """Return the version of the snapshot tiles are rendered from, for validators.
+
+        While another request reloads the dataset this is still the previous
+        version, matching the tiles actually served.
+        """
+        return self.columnar_dataset().dataset_version
+
+    def get_tile(
+        self, z: int, x: int, y: int, start: datetime | None = None, end: datetime | None = None
+    ) -> bytes:
+        """
+        Return a rendered tile, from the tile cache when possible
+
+        Tiles are cached under the version of the snapshot they were rendered
+        from, so a dataset update invalidates them all.
+
+        Args:
+            z: Zoom level
+            x: Tile column
+            y: Tile row
+            start: Optional earliest genesis (inclusive)
+            end: Optional latest genesis (exclusive)
+
+        Returns:
+            The encoded tile
+        """
+        dataset = self.columnar_dataset()
+        key = ("tile", dataset.version, z, x, y, start, end)
+        if settings.TILE_CACHE_ENABLED:
+            body = tile_cache.get(key)
+            if body is not None:
+                return body
+
+        started = time.perf_counter()
+        body = render_tile(dataset, z, x, y, start, end)
+        tile_metrics.record(time.perf_counter() - started, len(body))
+        if settings.TILE_CACHE_ENABLED:
+            tile_cache.put(key, body, len(body))
+        return body
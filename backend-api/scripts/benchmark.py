@@ -0,0 +1,293 @@
+"""
+Benchmark every storms endpoint and compare against a stored baseline
+
+Runs a closed-loop load test (see ``scripts.load_test``) of each scenario
+below at each ``--concurrency`` level, prints throughput and p50/p95/p99
+latency, and writes the results as JSON. With ``--baseline``, each
+scenario and level is compared with a previous results file and the exit
+status is 1 if any p95 latency or throughput regressed by more than
+``--threshold``.
+
+Point the server at a full-size archive (``scripts.generate_synthetic_db``)
+and disable the response and tile caches, so every request reaches the database:
+
+    export DATABASE_URL=postgresql://.../ibtracs_bench
+    python -m scripts.generate_synthetic_db --replace
+    RESPONSE_CACHE_ENABLED=false TILE_CACHE_ENABLED=false uvicorn app.main:app --port 8000
+
+Usage (from backend-api/):
+    python -m scripts.benchmark --output baseline.json
+    python -m scripts.benchmark --output current.json --baseline baseline.json
+    python -m scripts.benchmark --scenario month --scenario batch --concurrency 1 64
+
+Results depend on the machine; compare runs made on the same hardware.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Callable
+
+import httpx
+
+from scripts.load_test import Call, month_paths, run_level
+
+SEASONS = range(1995, 2025)
+
+# Storm IDs for the batch and single-storm scenarios are read through /storms/search
+ID_PREFIXES = [str(season) for season in SEASONS]
+
+
+def month_calls(ids: list[str]) -> list[Call]:
+    return [Call("GET", path) for path in month_paths(SEASONS[0], SEASONS[-1])]
+
+
+def month_arrow_calls(ids: list[str]) -> list[Call]:
+    headers = {"Accept": "application/vnd.apache.arrow.stream"}
+    return [Call("GET", path, headers=headers) for path in month_paths(SEASONS[0], SEASONS[-1])]
+
+
+def month_simplified_calls(ids: list[str]) -> list[Call]:
+    return [Call("GET", f"{path}?zoom=3") for path in month_paths(SEASONS[0], SEASONS[-1])]
+
+
+def bbox_calls(ids: list[str]) -> list[Call]:
+    boxes = ["-100,10,-60,35", "120,5,160,35", "60,5,100,25", "40,-30,110,-5", "170,-30,-170,-10"]
+    return [
+        Call("GET", f"/storms?bbox={box}&start={season}-01-01T00:00&end={season + 5}-01-01T00:00")
+        for season in range(SEASONS[0], SEASONS[-1], 5)
+        for box in boxes
+    ]
+
+
+def near_calls(ids: list[str]) -> list[Call]:
+    places = [(25.8, -80.2), (22.3, 114.2), (14.6, 121.0), (22.6, 88.4), (-20.2, 57.5), (-18.1, 178.4)]
+    return [
+        Call(
+            "GET",
+            f"/storms/near?lat={lat}&lon={lon}&radius_km=300"
+            f"&start={season}-01-01T00:00&end={season + 10}-01-01T00:00",
+        )
+        for season in range(SEASONS[0], SEASONS[-1], 10)
+        for lat, lon in places
+    ]
+
+
+def search_calls(ids: list[str]) -> list[Call]:
+    prefixes = ["A", "BO", "DA", "GON", "KARL", "MAL", "NOT", "AL01", "WP2", "2005", "19"]
+    return [Call("GET", f"/storms/search?q={prefix}") for prefix in prefixes]
+
+
+def snapshot_calls(ids: list[str]) -> list[Call]:
+    return [
+        Call("GET", f"/snapshot?time={season}-{month:02d}-15T12:00:00")
+        for season in SEASONS
+        for month in (2, 8, 9)
+    ]
+
+
+def range_calls(ids: list[str]) -> list[Call]:
+    return [
+        Call("GET", f"/storms/range?start={season}-01-01T00:00&end={season + 1}-01-01T00:00")
+        for season in SEASONS
+    ]
+
+
+def export_calls(ids: list[str]) -> list[Call]:
+    return [
+        Call(
+            "GET",
+            f"/storms/export?basin={basin}&season_from={season}&season_to={season + 4}&compression=none",
+        )
+        for season in range(SEASONS[0], SEASONS[-1], 5)
+        for basin in ("NA", "WP", "SI")
+    ]
+
+
+def batch_calls(ids: list[str]) -> list[Call]:
+    size = 50
+    return [
+        Call("POST", "/storms/batch", json={"ids": ids[start:start + size]})
+        for start in range(0, len(ids), size)
+    ]
+
+
+def storm_calls(ids: list[str]) -> list[Call]:
+    return [Call("GET", f"/storms/{storm_id}") for storm_id in ids]
+
+
+def tile_calls(ids: list[str]) -> list[Call]:
+    return [
+        # Zoom 4 rows between about 55N and 55S
+        Call("GET", f"/tiles/4/{x}/{y}.mvt")
+        for x in range(16)
+        for y in range(5, 11)
+    ]
+
+
+SCENARIOS: dict[str, Callable[[list[str]], list[Call]]] = {
+    "month": month_calls,
+    "month_arrow": month_arrow_calls,
+    "month_simplified": month_simplified_calls,
+    "bbox": bbox_calls,
+    "near": near_calls,
+    "search": search_calls,
+    "snapshot": snapshot_calls,
+    "range": range_calls,
+    "export": export_calls,
+    "batch": batch_calls,
+    "storm": storm_calls,
+    "tiles": tile_calls,
+}
+
+
+async def storm_ids(client: httpx.AsyncClient) -> list[str]:
+    """Read up to 100 storm IDs per season through the search endpoint."""
+    ids: list[str] = []
+    for prefix in ID_PREFIXES:
+        response = await client.get("/storms/search", params={"q": prefix, "limit": 100})
+        response.raise_for_status()
+        ids.extend(storm["ID"] for storm in response.json()["storms"])
+    if not ids:
+        sys.exit("No storms found; load an archive with scripts.generate_synthetic_db")
+    return ids
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline_levels(baseline: dict | None, scenario: str) -> dict[int, dict]:
+    """Return a scenario's baseline results by concurrency."""
+    levels = (baseline or {}).get("scenarios", {}).get(scenario, [])
+    return {level["concurrency"]: level for level in levels}
+
+
+def without_nan(result: dict[str, float]) -> dict[str, float | None]:
+    """Replace the latencies of a level without successful requests (NaN) by null, for JSON."""
+    return {
+        key: None if isinstance(value, float) and math.isnan(value) else value
+        for key, value in result.items()
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every scenario and level whose p95 or throughput regressed by more than ``threshold``."""
+    regressions = []
+    for scenario, levels in results["scenarios"].items():
+        previous = baseline_levels(baseline, scenario)
+        for level in levels:
+            before = previous.get(level["concurrency"])
+            if before is None:
+                continue
+            label = f"{scenario} @ {level['concurrency']}"
+            if level["errors"] > before["errors"]:
+                regressions.append(f"{label}: errors {before['errors']} -> {level['errors']}")
+            if level["p95_ms"] is None or before["p95_ms"] is None:
+                continue
+            if level["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                regressions.append(f"{label}: p95 {before['p95_ms']:.1f} -> {level['p95_ms']:.1f} ms")
+            if level["rps"] < before["rps"] * (1 - threshold):
+                regressions.append(f"{label}: throughput {before['rps']:.1f} -> {level['rps']:.1f} req/s")
+    return regressions
+
+
+def print_level(scenario: str, result: dict[str, float], before: dict | None) -> None:
+    change = ""
+    if before is not None and before["p95_ms"]:
+        change = f" {(result['p95_ms'] / before['p95_ms'] - 1) * 100:>+8.1f}%"
+    print(
+        f"{scenario:<17} {result['concurrency']:>6} {result['requests']:>9} {result['errors']:>7} "
+        f"{result['rps']:>9.1f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+        f"{result['p99_ms']:>9.1f}{change}",
+        flush=True,
+    )
+
+
+async def run(args: argparse.Namespace, baseline: dict | None) -> dict:
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        ids = await storm_ids(client)
+        results = {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "base_url": args.base_url,
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "scenarios": {},
+        }
+        print(
+            f"{'scenario':<17} {'conc':>6} {'requests':>9} {'errors':>7} {'req/s':>9} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}" + (f" {'p95 vs':>9}" if baseline else "")
+        )
+        for scenario in args.scenario or SCENARIOS:
+            calls = SCENARIOS[scenario](ids)
+            previous = baseline_levels(baseline, scenario)
+            # Warm connections, pools and the server's own caches outside the measurement
+            await run_level(client, calls, min(args.concurrency), args.warmup)
+            levels = []
+            for concurrency in args.concurrency:
+                result = await run_level(client, calls, concurrency, args.duration)
+                print_level(scenario, result, previous.get(concurrency))
+                levels.append(without_nan(result))
+            results["scenarios"][scenario] = levels
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the IBTrACS storms API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Concurrent clients per level"
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario and level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument(
+        "--scenario", action="append", choices=list(SCENARIOS), help="Run only this scenario (repeatable)"
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with this results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Relative p95 increase or throughput drop counted as a regression (default: 0.15)",
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = asyncio.run(run(args, baseline))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
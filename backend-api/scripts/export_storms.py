@@ -0,0 +1,79 @@
+"""
+Export the storms table to CSV, gzip-compressed CSV or Parquet
+
+Uses PostgreSQL COPY ... TO STDOUT, so rows go from the database to disk
+without being turned into Python objects.
+
+Usage (from backend-api/):
+    python -m scripts.export_storms --output storms.parquet
+    python -m scripts.export_storms --output na_2005.csv.gz --basin NA --season-from 2005 --season-to 2005
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+
+import psycopg2
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from app.core.config import settings
+from app.services.export import CSV_CONVERT_OPTIONS, copy_query, copy_to
+
+
+def csv_to_parquet(csv_path: str, parquet_path: str) -> None:
+    """Convert a COPY CSV export to Parquet one record batch at a time."""
+    reader = pa_csv.open_csv(csv_path, convert_options=CSV_CONVERT_OPTIONS)
+    with pq.ParquetWriter(parquet_path, reader.schema, compression="zstd") as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the IBTrACS storms table")
+    parser.add_argument("--output", required=True, help="Output path (.csv, .csv.gz or .parquet)")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "csv.gz", "parquet"],
+        help="Output format (default: inferred from the output extension)",
+    )
+    parser.add_argument("--basin", help="Only storms formed in this basin")
+    parser.add_argument("--season-from", type=int, help="Earliest season (inclusive)")
+    parser.add_argument("--season-to", type=int, help="Latest season (inclusive)")
+    args = parser.parse_args()
+
+    output_format = args.format
+    if output_format is None:
+        if args.output.endswith(".parquet"):
+            output_format = "parquet"
+        elif args.output.endswith(".gz"):
+            output_format = "csv.gz"
+        else:
+            output_format = "csv"
+
+    conn = psycopg2.connect(settings.database_url)
+    try:
+        copy_sql = copy_query(conn, args.basin, args.season_from, args.season_to)
+        if output_format == "csv":
+            with open(args.output, "wb") as f:
+                copy_to(conn, copy_sql, f)
+        elif output_format == "csv.gz":
+            with gzip.open(args.output, "wb") as f:
+                copy_to(conn, copy_sql, f)
+        else:
+            with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+                csv_path = tmp.name
+                copy_to(conn, copy_sql, tmp)
+            try:
+                csv_to_parquet(csv_path, args.output)
+            finally:
+                os.unlink(csv_path)
+    finally:
+        conn.close()
+
+    print(f"Exported storms to {args.output} ({output_format})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+Fill the storms table with a synthetic, full-size IBTrACS archive
+
+Generates about 13.5k storms and 740k 3-hourly track points with the
+archive's shape: per-basin storm counts and first seasons, hemisphere-
+dependent monthly genesis distributions (August-October peaks in the north,
+January-March in the south, Southern Hemisphere seasons running July-June),
+westward tracks that recurve poleward, wind and pressure profiles, and wind
+radii from 2004 in the ATCF basins. Track positions and intensities are
+plausible, not climatological; the data is meant for benchmarking.
+
+The same ``--seed`` always produces the same archive. Rows are loaded with
+COPY, the table is analyzed and the dataset version is bumped so response
+caches of a running backend are invalidated.
+
+Usage (from backend-api/; DATABASE_URL selects the database):
+    python -m scripts.generate_synthetic_db --replace
+    python -m scripts.generate_synthetic_db --replace --scale 0.1 --seed 7
+"""
+
+import argparse
+import calendar
+import csv
+import io
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple
+
+import numpy as np
+import psycopg2
+
+from app.core.config import settings
+
+CREATE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS storms (
+    "ID" VARCHAR(50) NOT NULL,
+    "ATCF_ID" VARCHAR(50),
+    name VARCHAR(100) NOT NULL,
+    basin VARCHAR(10) NOT NULL,
+    subbasin VARCHAR(10) NOT NULL,
+    season INTEGER NOT NULL,
+    genesis TIMESTAMP NOT NULL,
+    time TIMESTAMP NOT NULL,
+    lat DOUBLE PRECISION NOT NULL,
+    lon DOUBLE PRECISION NOT NULL,
+    wind DOUBLE PRECISION,
+    mslp DOUBLE PRECISION,
+    speed DOUBLE PRECISION,
+    dist2land DOUBLE PRECISION,
+    classification VARCHAR(10),
+    rmw DOUBLE PRECISION,
+    basin_time VARCHAR(10),
+    subbasin_time VARCHAR(10),
+    agency VARCHAR(50),
+    "R34_NE" DOUBLE PRECISION,
+    "R34_SE" DOUBLE PRECISION,
+    "R34_SW" DOUBLE PRECISION,
+    "R34_NW" DOUBLE PRECISION,
+    "R50_NE" DOUBLE PRECISION,
+    "R50_SE" DOUBLE PRECISION,
+    "R50_SW" DOUBLE PRECISION,
+    "R50_NW" DOUBLE PRECISION,
+    "R64_NE" DOUBLE PRECISION,
+    "R64_SE" DOUBLE PRECISION,
+    "R64_SW" DOUBLE PRECISION,
+    "R64_NW" DOUBLE PRECISION,
+    PRIMARY KEY ("ID", time)
+);
+CREATE INDEX IF NOT EXISTS idx_storms_time ON storms(time);
+CREATE INDEX IF NOT EXISTS idx_storms_id ON storms("ID");
+CREATE INDEX IF NOT EXISTS idx_storms_genesis ON storms(genesis, "ID", time);
+CREATE TABLE IF NOT EXISTS dataset_metadata (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+);
+"""
+
+BUMP_VERSION_SQL = """
+INSERT INTO dataset_metadata (id, version, updated_at)
+VALUES (TRUE, 1, NOW() AT TIME ZONE 'UTC')
+ON CONFLICT (id) DO UPDATE SET
+    version = dataset_metadata.version + 1,
+    updated_at = EXCLUDED.updated_at
+RETURNING version
+"""
+
+COLUMNS = (
+    "ID", "ATCF_ID", "name", "basin", "subbasin", "season",
+    "genesis", "time", "lat", "lon", "wind", "mslp", "speed",
+    "dist2land", "classification", "rmw", "basin_time", "subbasin_time",
+    "agency", "R34_NE", "R34_SE", "R34_SW", "R34_NW", "R50_NE",
+    "R50_SE", "R50_SW", "R50_NW", "R64_NE", "R64_SE", "R64_SW",
+    "R64_NW",
+)
+
+COPY_SQL = "COPY storms ({}) FROM STDIN WITH (FORMAT csv)".format(
+    ", ".join(f'"{column}"' for column in COLUMNS)
+)
+
+NAMES = (
+    "ALEX", "BONNIE", "COLIN", "DANIELLE", "EARL", "FIONA", "GASTON", "HERMINE", "IAN",
+    "JULIA", "KARL", "LISA", "MARTIN", "NICOLE", "OWEN", "PAULA", "RICHARD", "SHARY",
+    "TOBIAS", "VIRGINIE", "WALTER", "AMARA", "BAKUNA", "CHANTHU", "DIANMU", "FARRAH",
+    "GONI", "HAIMA", "IMANI", "JEBI", "KOMPASU", "LEKIMA", "MALOU", "NEPARTAK", "OMAIS",
+    "PODUL", "RAI", "SONCA", "TALIM", "USAGI", "VAMCO", "WUTIP", "YAGI", "ZELIA",
+)
+
+# Share of a basin's storms in each calendar month, January first
+NORTHERN_PEAK = (0, 0, 0, 0, 1, 4, 9, 22, 30, 20, 8, 2)
+
+
+class Basin(NamedTuple):
+    storms: int
+    first_season: int
+    lat_range: tuple[float, float]
+    lon_range: tuple[float, float]
+    months: tuple[float, ...]
+    subbasins: tuple[str, ...]
+    agency: str
+    atcf_prefix: str | None
+    westward: float  # degrees of longitude per 3 hours before recurvature
+
+
+BASINS = {
+    "NA": Basin(2350, 1851, (10, 30), (-85, -20), NORTHERN_PEAK, ("NA", "CS", "GM"), "hurdat_atl", "AL", 0.45),
+    "EP": Basin(1250, 1949, (9, 18), (-120, -92), (0, 0, 0, 0, 8, 18, 22, 24, 18, 8, 2, 0), ("MM", "CP"),
+                "hurdat_epa", "EP", 0.5),
+    "WP": Basin(4300, 1884, (6, 22), (120, 170), (3, 2, 2, 3, 5, 8, 15, 19, 17, 13, 8, 5), ("MM",),
+                "tokyo", "WP", 0.5),
+    "NI": Basin(1500, 1877, (8, 20), (60, 95), (2, 1, 1, 4, 10, 14, 10, 11, 12, 15, 14, 6), ("BB", "AS"),
+                "newdelhi", "IO", 0.25),
+    "SI": Basin(2900, 1848, (-20, -6), (40, 110), (24, 24, 19, 9, 3, 1, 0, 0, 1, 2, 6, 11), ("MM", "WA", "EA"),
+                "reunion", "SH", 0.4),
+    "SP": Basin(1150, 1897, (-20, -8), (150, 200), (27, 25, 21, 8, 2, 1, 1, 0, 0, 1, 4, 10), ("MM", "EA"),
+                "nadi", "SH", 0.35),
+    "SA": Basin(30, 2004, (-35, -22), (-50, -30), (3, 3, 3, 2, 2, 1, 1, 1, 1, 2, 2, 3), ("MM",), "atcf", None, 0.1),
+}
+
+# Basins with wind radii and radius of maximum winds (from 2004)
+RADII_BASINS = {"NA", "EP", "WP"}
+RADII_FIRST_SEASON = 2004
+
+
+class StormHeader(NamedTuple):
+    basin: str
+    season: int
+    genesis: datetime
+    lat: float
+    lon: float
+
+
+def season_weights(first: int, last: int) -> np.ndarray:
+    """Relative storm counts per season: early records are sparse."""
+    seasons = np.arange(first, last + 1)
+    weights = np.where(seasons < 1950, 0.35, np.where(seasons < 1980, 0.7, 1.0))
+    return weights / weights.sum()
+
+
+def genesis_time(rng: np.random.Generator, season: int, month: int, southern: bool) -> datetime:
+    """Draw a 3-hourly genesis time in ``month`` of ``season``."""
+    # Southern Hemisphere seasons run July-June and are named after the later year
+    year = season - 1 if southern and month >= 7 else season
+    day = int(rng.integers(1, calendar.monthrange(year, month)[1] + 1))
+    return datetime(year, month, day, 3 * int(rng.integers(0, 8)))
+
+
+def draw_headers(rng: np.random.Generator, scale: float, last_season: int) -> list[StormHeader]:
+    """Draw every storm's basin, season, genesis time and position, ordered by genesis."""
+    headers = []
+    for code, basin in BASINS.items():
+        count = max(1, round(basin.storms * scale))
+        southern = basin.lat_range[1] < 0
+        seasons = rng.choice(
+            np.arange(basin.first_season, last_season + 1),
+            size=count,
+            p=season_weights(basin.first_season, last_season),
+        )
+        months = rng.choice(np.arange(1, 13), size=count, p=np.array(basin.months) / sum(basin.months))
+        for season, month in zip(seasons.tolist(), months.tolist()):
+            headers.append(StormHeader(
+                code,
+                season,
+                genesis_time(rng, season, month, southern),
+                round(float(rng.uniform(*basin.lat_range)), 1),
+                round(float(wrap_lon(rng.uniform(*basin.lon_range))), 1),
+            ))
+    headers.sort(key=lambda header: (header.genesis, header.basin))
+    return headers
+
+
+def wrap_lon(lon: np.ndarray) -> np.ndarray:
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def storm_id(header: StormHeader, taken: set[str]) -> str:
+    """IBTrACS-style SID (year, day of year, hemisphere, genesis lat and lon), made unique."""
+    hemisphere = "N" if header.lat >= 0 else "S"
+    lat = min(round(abs(header.lat)), 99)
+    lon = round(header.lon % 360)
+    while True:
+        sid = f"{header.genesis.year}{header.genesis.timetuple().tm_yday:03d}{hemisphere}{lat:02d}{lon % 360:03d}"
+        if sid not in taken:
+            taken.add(sid)
+            return sid
+        lon += 1
+
+
+def track_speeds(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Translation speed (kt) between consecutive 3-hourly positions."""
+    lat1, lat2 = np.radians(lat[:-1]), np.radians(lat[1:])
+    dlon = np.radians(np.diff(lon))
+    cos_angle = np.sin(lat1) * np.sin(lat2) + np.cos(lat1) * np.cos(lat2) * np.cos(dlon)
+    nautical_miles = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0))) * 60.0
+    speeds = np.round(nautical_miles / 3.0)
+    return np.concatenate([speeds[:1], speeds]) if len(speeds) else np.zeros(1)
+
+
+def round_to(values: np.ndarray, step: float) -> np.ndarray:
+    return np.round(values / step) * step
+
+
+def storm_rows(
+    rng: np.random.Generator, header: StormHeader, sid: str, atcf_id: str | None, name: str
+) -> Iterator[list]:
+    """Generate one storm's track point rows, in ``COLUMNS`` order."""
+    basin = BASINS[header.basin]
+    points = int(np.clip(round(rng.gamma(2.5, 22.0)), 4, 320))
+    poleward = 1.0 if header.lat >= 0 else -1.0
+    steps = np.arange(points)
+
+    # Westward drift, then (for most storms) recurvature poleward and east
+    recurve = int(rng.integers(points // 3, points + points // 2))
+    recurved = steps >= recurve
+    dlat = np.where(recurved, 0.3, rng.uniform(0.03, 0.15)) * poleward + rng.normal(0, 0.04, points)
+    dlon = np.where(recurved, rng.uniform(0.2, 0.6), -basin.westward) + rng.normal(0, 0.05, points)
+    dlat[0] = dlon[0] = 0.0
+    lat = np.clip(header.lat + np.cumsum(dlat), -70.0, 70.0)
+    lon = wrap_lon(header.lon + np.cumsum(dlon))
+
+    # Intensify to a peak a third of the way in, then decay
+    peak = float(np.clip(rng.gamma(3.0, 22.0), 30.0, 165.0))
+    phase = np.clip(steps / max(points - 1, 1), 0.0, 1.0)
+    rise = np.sin(np.pi / 2.0 * np.clip(phase * 3.0, 0.0, 1.0))
+    profile = rise * (1.0 - 0.8 * np.clip((phase - 1 / 3) * 1.5, 0.0, 1.0))
+    wind = round_to(20.0 + (peak - 20.0) * profile, 5.0)
+    mslp = np.round(1010.0 - (np.maximum(wind - 15.0, 0.0) / 6.7) ** (1 / 0.644))
+    speed = track_speeds(lat, np.unwrap(np.radians(lon)) * 180.0 / np.pi)
+    dist2land = np.round(np.abs(rng.normal(500, 300) + np.cumsum(rng.normal(0, 40, points))))
+
+    modern = header.season >= 1950
+    radii = header.basin in RADII_BASINS and header.season >= RADII_FIRST_SEASON
+    r34_base = float(rng.uniform(50, 150))
+    extratropical = recurved & (phase > 0.85) & (rng.random() < 0.5)
+    subbasin = basin.subbasins[int(rng.integers(len(basin.subbasins)))]
+
+    for i in range(points):
+        point_wind = float(wind[i])
+        if i == 0 and point_wind < 25:
+            classification = "DS"
+        elif extratropical[i]:
+            classification = "ET"
+        else:
+            classification = "TS"
+        quadrants: list[float | None] = [None] * 12
+        rmw = None
+        if radii:
+            rmw = float(np.clip(round(60 - 0.35 * point_wind), 8, 80))
+            for offset, threshold, fraction in ((0, 34, 1.0), (4, 50, 0.55), (8, 64, 0.35)):
+                if point_wind >= threshold:
+                    size = r34_base * fraction * math.sqrt(point_wind / 34.0)
+                    quadrants[offset:offset + 4] = [
+                        float(round_to(size * factor, 5.0)) for factor in rng.uniform(0.75, 1.25, 4)
+                    ]
+        yield [
+            sid, atcf_id, name, header.basin, subbasin, header.season,
+            header.genesis.isoformat(sep=" "),
+            (header.genesis + timedelta(hours=3 * i)).isoformat(sep=" "),
+            round(float(lat[i]), 2), round(float(lon[i]), 2),
+            point_wind, float(mslp[i]) if modern else None, float(speed[i]), float(dist2land[i]),
+            classification, rmw, header.basin, subbasin, basin.agency,
+            *quadrants,
+        ]
+
+
+def generate(rng: np.random.Generator, scale: float, last_season: int) -> Iterator[list]:
+    """Generate the archive's rows, ordered by genesis then time."""
+    taken: set[str] = set()
+    numbers: dict[tuple[str, int], int] = {}
+    for header in draw_headers(rng, scale, last_season):
+        basin = BASINS[header.basin]
+        atcf_id = name = None
+        if basin.atcf_prefix and header.season >= 1950:
+            number = numbers[header.basin, header.season] = numbers.get((header.basin, header.season), 0) + 1
+            if number < 100:
+                atcf_id = f"{basin.atcf_prefix}{number:02d}{header.season}"
+            if header.basin in RADII_BASINS:
+                name = NAMES[(number - 1 + header.season) % len(NAMES)]
+        yield from storm_rows(rng, header, storm_id(header, taken), atcf_id, name or "NOT_NAMED")
+
+
+def copy_rows(conn, rows: Iterator[list], batch_size: int = 50_000) -> int:
+    """COPY ``rows`` into the storms table in batches; return the number of rows."""
+    total = 0
+    with conn.cursor() as cur:
+        while True:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            count = 0
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+                if count == batch_size:
+                    break
+            if count == 0:
+                return total
+            buffer.seek(0)
+            cur.copy_expert(COPY_SQL, buffer)
+            total += count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic IBTrACS archive for benchmarks")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Fraction of the full archive's storm count (default: 1.0)"
+    )
+    parser.add_argument("--last-season", type=int, default=2024)
+    parser.add_argument(
+        "--replace", action="store_true", help="Empty the storms table first (required if it has rows)"
+    )
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(settings.database_url)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(CREATE_SCHEMA_SQL)
+            cur.execute("SELECT EXISTS (SELECT 1 FROM storms)")
+            if cur.fetchone()[0]:
+                if not args.replace:
+                    parser.error("the storms table is not empty; pass --replace to overwrite it")
+                cur.execute("TRUNCATE storms")
+
+        started = time.perf_counter()
+        rows = copy_rows(conn, generate(np.random.default_rng(args.seed), args.scale, args.last_season))
+        with conn.cursor() as cur:
+            cur.execute(BUMP_VERSION_SQL)
+            version = cur.fetchone()[0]
+            cur.execute('SELECT COUNT(DISTINCT "ID") FROM storms')
+            storms = cur.fetchone()[0]
+        conn.commit()
+
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE storms")
+    finally:
+        conn.close()
+
+    print(
+        f"Loaded {storms} storms ({rows} track points) in {time.perf_counter() - started:.1f}s; "
+        f"dataset version {version}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Closed-loop HTTP load test of the storms API
+
+Each of ``--concurrency`` workers sends requests back to back for
+``--duration`` seconds, cycling through the month endpoints of a range of
+years, and the throughput and latency percentiles are printed per
+concurrency level. Compare the threadpool and async storm routes by running
+the server once with each setting, with the response cache disabled so
+every request reaches the database:
+
+    RESPONSE_CACHE_ENABLED=false DB_ASYNC=false uvicorn app.main:app --port 8000
+    RESPONSE_CACHE_ENABLED=false DB_ASYNC=true uvicorn app.main:app --port 8000
+
+Usage (from backend-api/):
+    python -m scripts.load_test --base-url http://localhost:8000 --concurrency 1 16 64 256
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Any, NamedTuple
+
+import httpx
+import numpy as np
+
+
+class Call(NamedTuple):
+    """One request of a load test."""
+
+    method: str
+    url: str
+    json: Any = None
+    headers: dict[str, str] | None = None
+
+
+def month_paths(first_year: int, last_year: int) -> list[str]:
+    return [
+        f"/storms/{year}/{month}"
+        for year in range(first_year, last_year + 1)
+        for month in range(1, 13)
+    ]
+
+
+async def run_level(
+    client: httpx.AsyncClient, calls: list[Call], concurrency: int, duration: float
+) -> dict[str, float]:
+    """Run ``concurrency`` workers for ``duration`` seconds and summarize their requests."""
+    call_cycle = itertools.cycle(calls)
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                call = next(call_cycle)
+                response = await client.request(call.method, call.url, json=call.json, headers=call.headers)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    millis = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(millis, 50)),
+        "p95_ms": float(np.percentile(millis, 95)),
+        "p99_ms": float(np.percentile(millis, 99)),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    calls = [Call("GET", path) for path in args.path or month_paths(args.first_year, args.last_year)]
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        print(f"{'conc':>6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for concurrency in args.concurrency:
+            result = await run_level(client, calls, concurrency, args.duration)
+            print(
+                f"{result['concurrency']:>6} {result['requests']:>9} {result['errors']:>7} "
+                f"{result['rps']:>9.1f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+                f"{result['p99_ms']:>9.1f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the IBTrACS storms API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 16, 64, 256], help="Concurrent clients per level"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--first-year", type=int, default=1980)
+    parser.add_argument("--last-year", type=int, default=2020)
+    parser.add_argument(
+        "--path", action="append", help="Request this path instead of the month endpoints (repeatable)"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Tests for admission control, load shedding and the statement timeout
+"""
+import asyncio
+
+import pytest
+from psycopg2.errors import QueryCanceled
+from psycopg2.extras import RealDictCursor
+
+from app.core import admission as admission_module
+from app.core.admission import AdmissionController, Overloaded
+from app.core.config import settings
+from app.core.database import ConnectionPool, lift_statement_timeout
+from app.services.storm_service import StormService
+
+
+def test_requests_within_capacity_are_admitted_at_once():
+    controller = AdmissionController(capacity=4, max_queue=0, queue_timeout=1.0)
+
+    async def main():
+        assert await controller.acquire(3) == 3
+        assert await controller.acquire(1) == 1
+        with pytest.raises(Overloaded):
+            await controller.acquire(1)
+
+    asyncio.run(main())
+    stats = controller.stats()
+    assert stats["in_use"] == 4
+    assert stats["admitted"] == 2
+    assert stats["shed_queue_full"] == 1
+
+
+def test_waiters_are_admitted_in_order_as_capacity_frees():
+    controller = AdmissionController(capacity=2, max_queue=10, queue_timeout=5.0)
+    order = []
+
+    async def request(name: str, weight: int, hold: float):
+        held = await controller.acquire(weight)
+        order.append(name)
+        await asyncio.sleep(hold)
+        controller.release(held)
+
+    async def main():
+        first = asyncio.create_task(request("first", 2, 0.05))
+        await asyncio.sleep(0)
+        # "heavy" queues first, so "light" waits behind it even though it would fit sooner
+        await asyncio.gather(first, request("heavy", 2, 0.01), request("light", 1, 0))
+
+    asyncio.run(main())
+    assert order == ["first", "heavy", "light"]
+    stats = controller.stats()
+    assert stats["in_use"] == 0 and stats["queue_depth"] == 0
+    assert stats["queued"] == 2
+    assert stats["wait_seconds_max"] > 0
+
+
+def test_waiters_are_shed_after_the_queue_timeout():
+    controller = AdmissionController(capacity=1, max_queue=10, queue_timeout=0.01)
+
+    async def main():
+        await controller.acquire(1)
+        with pytest.raises(Overloaded):
+            await controller.acquire(1)
+
+    asyncio.run(main())
+    stats = controller.stats()
+    assert stats["shed_timeout"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_weight_is_capped_at_capacity():
+    controller = AdmissionController(capacity=2, max_queue=0, queue_timeout=1.0)
+    assert asyncio.run(controller.acquire(8)) == 2
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    """Replace the process-wide controller with a full one that queues nothing."""
+    controller = AdmissionController(capacity=1, max_queue=0, queue_timeout=1.0)
+    monkeypatch.setattr(admission_module, "admission", controller)
+    asyncio.run(controller.acquire(1))
+    return controller
+
+
+def test_overloaded_requests_get_503_with_retry_after(client, saturated):
+    response = client.get("/storms/2021/9")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(settings.ADMISSION_RETRY_AFTER)
+    assert saturated.stats()["shed_queue_full"] == 1
+
+    saturated.release(1)
+    assert client.get("/storms/2021/9").status_code == 200
+    assert saturated.stats()["in_use"] == 0
+
+
+def test_admission_can_be_disabled(client, saturated, monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", False)
+    assert client.get("/storms/2021/9").status_code == 200
+
+
+def test_streamed_responses_hold_capacity_until_sent(client, monkeypatch):
+    controller = AdmissionController(capacity=8, max_queue=0, queue_timeout=1.0)
+    monkeypatch.setattr(admission_module, "admission", controller)
+    response = client.get("/storms/export", params={"compression": "none"})
+    assert response.status_code == 200
+    assert controller.stats()["admitted"] == 1
+    assert controller.stats()["in_use"] == 0
+
+
+def test_statement_timeout_cancels_slow_queries():
+    pool = ConnectionPool(
+        settings.database_url,
+        min_size=0,
+        max_size=1,
+        cursor_factory=RealDictCursor,
+        options="-c statement_timeout=50",
+    )
+    try:
+        with pool.connection() as conn:
+            with pytest.raises(QueryCanceled), conn.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(1)")
+        with pool.connection() as conn:
+            lift_statement_timeout(conn)
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(0.1)")
+        with pool.connection() as conn, conn.cursor() as cursor:
+            # Lifted only for the transaction that was rolled back
+            cursor.execute("SHOW statement_timeout")
+            assert cursor.fetchone()["statement_timeout"] == "50ms"
+    finally:
+        pool.close()
+
+
+def test_cancelled_queries_get_503(client, monkeypatch):
+    def cancelled(*args, **kwargs):
+        raise QueryCanceled("canceling statement due to statement timeout")
+
+    monkeypatch.setattr(StormService, "get_storms_by_ids", cancelled)
+    response = client.post("/storms/batch", json={"ids": ["2021244N20140"]})
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
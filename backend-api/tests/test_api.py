@@ -1,6 +1,12 @@
 """
 Test script using FastAPI TestClient (no server needed)
 """
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from app.core.config import settings
+from app.schemas.storm import Storm
+from app.services.storm_service import MONTH_QUERY, StormService, month_bounds
 
 
 def test_root(client):
@@ -40,4 +46,55 @@ def test_get_storms_empty_month(client):
     
     data = response.json()
     assert "storms" in data
-    assert len(data["storms"]) == 0
\ No newline at end of file
+    assert len(data["storms"]) == 0
+
+
+def test_month_query_avoids_sequential_scan(client):
+    """Test that the month lookup is sargable on the genesis index."""
+    conn = psycopg2.connect(settings.database_url)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET enable_seqscan = off")
+            cur.execute("EXPLAIN " + MONTH_QUERY, month_bounds(2020, 8))
+            plan = "\n".join(row[0] for row in cur.fetchall())
+    finally:
+        conn.close()
+
+    assert "Seq Scan" not in plan
+    assert "idx_storms_genesis" in plan
+
+
+def test_get_storms_invalid_month(client):
+    """Test that out-of-range months are rejected."""
+    response = client.get("/storms/2020/13")
+    assert response.status_code == 422
+
+
+def test_aggregate_and_row_modes_match(client):
+    """Test that Postgres-side aggregation builds the same storms as row grouping."""
+    conn = psycopg2.connect(settings.database_url, cursor_factory=RealDictCursor)
+    try:
+        aggregated = StormService(conn, mode="aggregate").get_storms_by_month(2020, 8)
+        grouped = StormService(conn, mode="rows").get_storms_by_month(2020, 8)
+    finally:
+        conn.close()
+
+    assert len(aggregated.storms) == 1
+    assert aggregated == grouped
+
+
+def test_json_fast_path_matches_schema_path(client, monkeypatch):
+    """Test that the Postgres-built JSON matches the Pydantic response exactly."""
+    paths = ("/storms/2020/8", "/storms/2021/9", "/storms/2020/1")
+    monkeypatch.setattr(settings, "STORM_JSON_FAST_PATH", False)
+    validated = [client.get(path) for path in paths]
+    monkeypatch.setattr(settings, "STORM_JSON_FAST_PATH", True)
+    fast = [client.get(path) for path in paths]
+
+    for fast_response, validated_response in zip(fast, validated):
+        assert fast_response.status_code == 200
+        assert fast_response.headers["content-type"] == "application/json"
+        # Byte for byte: cached payloads and ETags must not depend on the path taken
+        assert fast_response.content == validated_response.content
+    assert list(fast[0].json()["storms"][0]) == list(Storm.model_fields)
+    assert fast[2].content == b'{"storms":[]}'
@@ -0,0 +1,139 @@
+"""
+Tests for the asyncpg storm service and async routes
+"""
+import asyncio
+from datetime import datetime
+
+import asyncpg
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.storms import router as storms_router
+from app.api.storms_async import router as storms_async_router
+from app.core.config import settings
+from app.core.database import get_async_db, get_db
+from app.core.singleflight import AsyncSingleFlight
+from app.services.async_storm_service import numbered_placeholders
+from tests.conftest import get_test_db
+
+
+async def get_test_async_db():
+    # TestClient may run each request on a new event loop, so no shared pool
+    conn = await asyncpg.connect(settings.database_url)
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+@pytest.fixture
+def clients(monkeypatch, set_dataset_version):
+    """Threadpool and async clients over the same database, with no response cache."""
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    # Versioned, so responses carry validators
+    set_dataset_version(3, datetime(2021, 10, 1))
+    sync_app, async_app = FastAPI(), FastAPI()
+    sync_app.include_router(storms_router)
+    async_app.include_router(storms_async_router)
+    async_app.include_router(storms_router)
+    for app in (sync_app, async_app):
+        app.dependency_overrides[get_db] = get_test_db
+        app.dependency_overrides[get_async_db] = get_test_async_db
+    return TestClient(sync_app), TestClient(async_app)
+
+
+def test_numbered_placeholders():
+    assert numbered_placeholders("a >= %s AND a < %s") == "a >= $1 AND a < $2"
+    assert numbered_placeholders('"ID" = ANY(%s)') == '"ID" = ANY($1)'
+    assert numbered_placeholders("SELECT 1") == "SELECT 1"
+
+
+@pytest.mark.parametrize("mode", ["aggregate", "rows"])
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"fields": "time,wind"}, {"zoom": "3"}, {"tolerance": "0.5", "fields": "wind"}],
+)
+def test_async_month_matches_threadpool(clients, monkeypatch, mode, params):
+    monkeypatch.setattr(settings, "STORM_QUERY_MODE", mode)
+    sync_client, async_client = clients
+    for path in ("/storms/2020/8", "/storms/2021/9", "/storms/2021/10"):
+        expected = sync_client.get(path, params=params)
+        actual = async_client.get(path, params=params)
+        assert actual.status_code == 200
+        assert actual.content == expected.content
+        assert actual.headers["etag"] == expected.headers["etag"]
+
+
+@pytest.mark.parametrize("accept", ["application/msgpack", "application/vnd.apache.arrow.stream"])
+def test_async_month_binary_formats(clients, accept):
+    sync_client, async_client = clients
+    expected = sync_client.get("/storms/2021/9", headers={"Accept": accept})
+    actual = async_client.get("/storms/2021/9", headers={"Accept": accept})
+    assert actual.headers["content-type"] == accept
+    assert actual.content == expected.content
+
+
+def test_async_month_json_fast_path(clients, monkeypatch):
+    monkeypatch.setattr(settings, "STORM_JSON_FAST_PATH", True)
+    sync_client, async_client = clients
+    assert async_client.get("/storms/2021/9").content == sync_client.get("/storms/2021/9").content
+
+
+def test_async_month_not_modified(clients):
+    _, async_client = clients
+    etag = async_client.get("/storms/2021/9").headers["etag"]
+    response = async_client.get("/storms/2021/9", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_async_batch_matches_threadpool(clients):
+    sync_client, async_client = clients
+    body = {"ids": ["2021244N20140", "unknown", "2020080N00001"]}
+    expected = sync_client.post("/storms/batch", json=body)
+    actual = async_client.post("/storms/batch", json=body)
+    assert actual.status_code == 200
+    assert actual.content == expected.content
+
+
+def test_async_app_keeps_other_routes(clients):
+    _, async_client = clients
+    assert async_client.get("/storms/search", params={"q": "alpha"}).status_code == 200
+    assert async_client.get("/storms/2021244N20140").status_code == 200
+
+
+def test_async_single_flight_shares_one_call():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", compute) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+def test_async_single_flight_survives_cancelled_leader():
+    flights = AsyncSingleFlight()
+
+    async def main():
+        entered = asyncio.Event()
+
+        async def slow():
+            entered.set()
+            await asyncio.sleep(10)
+
+        leader = asyncio.create_task(flights.do("key", slow))
+        await entered.wait()
+        follower = asyncio.create_task(flights.do("key", lambda: asyncio.sleep(0, "fresh")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == "fresh"
@@ -0,0 +1,60 @@
+"""
+Tests for storm lookup by ID and the batch endpoint
+"""
+import pytest
+
+from app.core.config import settings
+
+ALPHA = "2020080N00001"
+BETA = "2021244N20140"
+
+
+@pytest.fixture(params=["postgres", "memory"])
+def backend(request, monkeypatch):
+    monkeypatch.setattr(settings, "STORM_BACKEND", request.param)
+    return request.param
+
+
+def test_get_storm_by_id(client, backend):
+    response = client.get(f"/storms/{BETA}")
+    assert response.status_code == 200
+    assert response.json() == client.get("/storms/2021/9").json()["storms"][0]
+
+
+def test_get_storm_projects_fields(client, backend):
+    storm = client.get(f"/storms/{ALPHA}", params={"fields": "time,wind"}).json()
+    assert storm["name"] == "ALPHA"
+    assert "time" in storm and "wind" in storm
+    assert "lat" not in storm and "mslp" not in storm
+
+
+def test_get_unknown_storm_is_404(client, backend):
+    assert client.get("/storms/1900001N00000").status_code == 404
+
+
+def test_batch_keeps_requested_order(client, backend):
+    response = client.post("/storms/batch", json={"ids": [BETA, "1900001N00000", ALPHA, BETA]})
+    assert response.status_code == 200
+    storms = response.json()["storms"]
+    assert [storm["ID"] for storm in storms] == [BETA, ALPHA]
+    assert storms[0] == client.get(f"/storms/{BETA}").json()
+
+
+def test_batch_projects_fields(client, backend):
+    response = client.post("/storms/batch", params={"fields": "lat,lon"}, json={"ids": [ALPHA]})
+    (storm,) = response.json()["storms"]
+    assert set(storm) == {"ID", "ATCF_ID", "name", "basin", "subbasin", "season", "genesis", "lat", "lon"}
+
+
+def test_batch_rejects_too_many_ids(client, monkeypatch):
+    monkeypatch.setattr(settings, "STORM_BATCH_MAX_IDS", 2)
+    assert client.post("/storms/batch", json={"ids": [ALPHA, BETA, "x"]}).status_code == 422
+    assert client.post("/storms/batch", json={"ids": []}).status_code == 422
+
+
+def test_batch_serves_binary_formats(client):
+    response = client.post(
+        "/storms/batch", json={"ids": [ALPHA]}, headers={"Accept": "application/msgpack"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
@@ -0,0 +1,66 @@
+"""
+Tests for the in-process response cache
+"""
+import time
+from datetime import datetime
+
+import pytest
+
+from app.core.cache import ResponseCache, response_cache
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    """Entries are evicted in LRU order once the byte bound is exceeded."""
+    cache = ResponseCache(max_bytes=10, ttl=60)
+    cache.put("a", b"aaaa", 4)
+    cache.put("b", b"bbbb", 4)
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc", 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 8
+
+
+def test_cache_fifo_policy_ignores_recent_use():
+    """The fifo policy evicts the oldest entry even if it was just read."""
+    cache = ResponseCache(max_bytes=8, ttl=60, policy="fifo")
+    cache.put("a", b"aaaa", 4)
+    cache.put("b", b"bbbb", 4)
+    cache.get("a")
+    cache.put("c", b"cccc", 4)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"bbbb"
+
+
+def test_cache_expires_entries_after_ttl():
+    """Entries older than the TTL are treated as misses."""
+    cache = ResponseCache(max_bytes=100, ttl=0.01)
+    cache.put("a", b"aaaa", 4)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        ResponseCache(max_bytes=100, ttl=60, policy="random")
+
+
+def test_month_responses_are_cached_per_dataset_version(client, set_dataset_version):
+    """Repeat month requests hit the cache until the dataset version changes."""
+    before = response_cache.stats()
+    first = client.get("/storms/2020/8")
+    second = client.get("/storms/2020/8")
+    assert second.content == first.content
+    after = response_cache.stats()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+
+    set_dataset_version(42, datetime(2020, 9, 1))
+    client.get("/storms/2020/8")
+    assert response_cache.stats()["misses"] - after["misses"] == 1
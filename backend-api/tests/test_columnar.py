@@ -0,0 +1,169 @@
+"""
+Tests for the in-memory columnar storm backend
+"""
+import json
+from datetime import datetime
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app import main
+from app.main import app
+from app.services import columnar
+from app.services.columnar import columnar_engine
+from app.services.storm_service import StormService
+
+
+@pytest.fixture
+def db():
+    conn = psycopg2.connect(settings.database_url, cursor_factory=RealDictCursor)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def memory_backend(monkeypatch):
+    monkeypatch.setattr(settings, "STORM_BACKEND", "memory")
+
+
+@pytest.mark.parametrize("year, month", [(2020, 8), (2021, 9), (2021, 10)])
+def test_memory_backend_matches_postgres(db, year, month):
+    expected = StormService(db, backend="postgres").get_storms_by_month(year, month)
+    actual = StormService(db, backend="memory").get_storms_by_month(year, month)
+    assert actual.model_dump() == expected.model_dump()
+
+
+def test_memory_backend_keeps_missing_values(db):
+    storm = StormService(db, backend="memory").get_storms_by_month(2021, 9).storms[0]
+    assert storm.ATCF_ID is None
+    assert storm.wind[7] is None
+    assert storm.R34_NE == [None] * 9
+    assert storm.basins == ["WP"] * 9
+
+
+def test_memory_backend_projects_fields(db):
+    storm = StormService(db, backend="memory").get_storms_by_month(2021, 9, ("time", "wind")).storms[0]
+    assert storm.model_fields_set == {
+        "ID", "ATCF_ID", "name", "basin", "subbasin", "season", "genesis", "time", "wind",
+    }
+
+
+def test_memory_backend_serves_api(client, memory_backend, monkeypatch):
+    response = client.get("/storms/2021/9")
+    assert response.status_code == 200
+    assert columnar_engine.stats()["loaded"]
+
+    response_cache.clear()
+    monkeypatch.setattr(settings, "STORM_BACKEND", "postgres")
+    assert response.content == client.get("/storms/2021/9").content
+
+
+def test_memory_backend_streams_range(client, memory_backend):
+    response = client.get(
+        "/storms/range", params={"start": "2020-01-01T00:00:00", "end": "2022-01-01T00:00:00"}
+    )
+    storms = [json.loads(line) for line in response.content.decode().splitlines()]
+    assert [storm["ID"] for storm in storms] == ["2020080N00001", "2021244N20140"]
+
+
+def test_engine_reloads_when_dataset_version_changes(db, set_dataset_version):
+    set_dataset_version(1, datetime(2024, 1, 1))
+    first = columnar_engine.get(db)
+    assert first.version == 1
+    assert columnar_engine.get(db) is first
+
+    set_dataset_version(2, datetime(2024, 1, 2))
+    second = columnar_engine.get(db)
+    assert second is not first
+    assert second.version == 2
+
+
+
+def test_memory_backend_validates_the_snapshot_it_serves(client, memory_backend, set_dataset_version):
+    set_dataset_version(1, datetime(2024, 1, 1))
+    old = client.get("/storms/2020/8")
+
+    set_dataset_version(2, datetime(2024, 1, 2))
+    # While another request reloads, this one is answered from the version 1 snapshot
+    with columnar_engine._load_lock:
+        during = client.get("/storms/2020/8")
+    assert during.headers["etag"] == old.headers["etag"]
+    assert all(key[1] == 1 for key in response_cache._entries if key[0] == "storms_month")
+
+    after = client.get("/storms/2020/8", headers={"If-None-Match": during.headers["etag"]})
+    assert after.status_code == 200
+    assert after.headers["etag"] != old.headers["etag"]
+
+def test_engine_reports_memory_footprint(db):
+    columnar_engine.get(db)
+    stats = columnar_engine.stats()
+    assert stats["storms"] == 2
+    assert stats["points"] == 11
+    assert stats["memory_bytes"] > 0
+
+
+def test_unversioned_snapshot_is_reloaded_when_old(db, monkeypatch):
+    first = columnar_engine.get(db)
+    assert first.version == 0
+    assert columnar_engine.get(db) is first
+
+    monkeypatch.setattr(settings, "COLUMNAR_UNVERSIONED_MAX_AGE", 0.0)
+    assert columnar_engine.get(db) is not first
+
+
+def test_load_is_not_bound_by_statement_timeout(monkeypatch):
+    # As pool connections are configured by DB_STATEMENT_TIMEOUT
+    conn = psycopg2.connect(
+        settings.database_url, cursor_factory=RealDictCursor, options="-c statement_timeout=5000"
+    )
+    timeouts = []
+    copy_to = columnar.copy_to
+
+    def recording_copy_to(db, query, f):
+        with db.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            timeouts.append(cursor.fetchone()["statement_timeout"])
+        copy_to(db, query, f)
+
+    monkeypatch.setattr(columnar, "copy_to", recording_copy_to)
+    try:
+        columnar_engine.get(conn)
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            restored = cursor.fetchone()["statement_timeout"]
+    finally:
+        conn.close()
+    assert timeouts == ["0"]
+    assert restored == "5s"
+
+
+@pytest.mark.parametrize("preload", [True, False])
+def test_dataset_is_loaded_at_startup(preload, monkeypatch):
+    monkeypatch.setattr(settings, "COLUMNAR_PRELOAD", preload)
+    with TestClient(app):
+        assert columnar_engine.stats()["loaded"] is preload
+
+
+def test_memory_backend_always_preloads(memory_backend, monkeypatch):
+    monkeypatch.setattr(settings, "COLUMNAR_PRELOAD", False)
+    with TestClient(app):
+        assert columnar_engine.stats()["loaded"]
+
+
+def test_failed_preload_falls_back_to_lazy_loading(monkeypatch):
+    monkeypatch.setattr(settings, "COLUMNAR_PRELOAD", True)
+
+    def unreachable():
+        raise psycopg2.OperationalError("could not connect to server")
+
+    monkeypatch.setattr(main, "get_pool", unreachable)
+    with TestClient(app) as client:
+        assert not columnar_engine.stats()["loaded"]
+        assert client.get("/tiles/0/0/0.mvt").status_code == 200
+        assert columnar_engine.stats()["loaded"]
@@ -0,0 +1,73 @@
+"""
+Tests for negotiated response compression
+"""
+import gzip
+import json
+
+import brotli
+import pytest
+import zstandard
+
+from app.core.cache import response_cache
+from app.core.compression import negotiate_encoding
+from app.core.config import settings
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("zstd, gzip;q=0.9", "zstd"),
+        ("*", "br"),
+        ("*, br;q=0", "zstd"),
+        ("gzip;q=0", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.fixture
+def compress_everything(monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 0)
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [
+        ("gzip", gzip.decompress),
+        ("br", brotli.decompress),
+        ("zstd", lambda body: zstandard.ZstdDecompressor().decompress(body)),
+    ],
+)
+def test_storms_response_is_compressed(client, compress_everything, encoding, decompress):
+    plain = client.get("/storms/2020/8", headers={"Accept-Encoding": "identity"})
+    # Keep the test client from transparently decoding the body
+    with client.stream("GET", "/storms/2020/8", headers={"Accept-Encoding": encoding}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert json.loads(decompress(raw)) == plain.json()
+
+
+def test_compressed_body_is_cached(client, compress_everything):
+    client.get("/storms/2020/8", headers={"Accept-Encoding": "gzip"})
+    before = response_cache.stats()
+    client.get("/storms/2020/8", headers={"Accept-Encoding": "gzip"})
+    after = response_cache.stats()
+
+    # Both the JSON body and its gzip variant are served from the cache
+    assert after["hits"] - before["hits"] == 2
+    assert after["misses"] == before["misses"]
+
+
+def test_small_bodies_are_not_compressed(client, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 10**9)
+    response = client.get("/storms/2020/8", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
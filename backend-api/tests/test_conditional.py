@@ -0,0 +1,77 @@
+"""
+Tests for ETag / Last-Modified conditional GET support
+"""
+import itertools
+from datetime import datetime
+
+import pytest
+
+from app.core.cache import response_cache
+from app.core.conditional import make_etag
+from app.core.config import settings
+from app.core.dataset import DatasetVersion, dataset_versions
+from app.services.storm_service import StormService
+
+
+@pytest.fixture
+def versioned_dataset(set_dataset_version):
+    """Dataset version 7, last updated 2020-09-01 12:00 UTC."""
+    set_dataset_version(7, datetime(2020, 9, 1, 12, 0))
+
+
+def test_storms_response_has_validators(client, versioned_dataset):
+    response = client.get("/storms/2020/8")
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"] == "Tue, 01 Sep 2020 12:00:00 GMT"
+
+    other_month = client.get("/storms/2020/9")
+    assert other_month.headers["etag"] != response.headers["etag"]
+
+
+def test_if_none_match_returns_304_without_querying(client, versioned_dataset, monkeypatch):
+    etag = client.get("/storms/2020/8").headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("storm query should not run for a 304")
+
+    monkeypatch.setattr(StormService, "get_month_payload", fail)
+    response = client.get("/storms/2020/8", headers={"If-None-Match": f'W/"stale", {etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_request_uses_one_dataset_version(client, versioned_dataset, monkeypatch):
+    # The updater bumps the version between every read
+    versions = itertools.count(8)
+    monkeypatch.setattr(
+        dataset_versions, "get", lambda db: DatasetVersion(next(versions), datetime(2020, 9, 1, 12, 0))
+    )
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 0)
+    response = client.get("/storms/2020/8", headers={"Accept-Encoding": "gzip"})
+
+    # The payload, its gzip variant and the ETag all belong to the first version read
+    (payload_key,) = [key for key in response_cache._entries if key[0] == "storms_month"]
+    _, version, year, month, representation = payload_key
+    assert version == 8
+    assert set(response_cache._entries) == {payload_key, (payload_key, "gzip")}
+    assert response.headers["etag"] == make_etag(8, "storms_month", year, month, representation, "gzip")
+
+
+def test_if_modified_since(client, versioned_dataset):
+    not_modified = client.get(
+        "/storms/2020/8", headers={"If-Modified-Since": "Tue, 01 Sep 2020 12:00:00 GMT"}
+    )
+    assert not_modified.status_code == 304
+
+    modified = client.get(
+        "/storms/2020/8", headers={"If-Modified-Since": "Mon, 31 Aug 2020 00:00:00 GMT"}
+    )
+    assert modified.status_code == 200
+
+
+def test_unversioned_dataset_has_no_etag(client):
+    response = client.get("/storms/2020/8")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
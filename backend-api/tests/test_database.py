@@ -0,0 +1,86 @@
+"""
+Tests for the backend connection pool
+"""
+import psycopg2
+import pytest
+
+from app.core.config import settings
+from app.core.database import ConnectionPool, PoolTimeout
+
+
+@pytest.fixture
+def pool():
+    pool = ConnectionPool(settings.database_url, min_size=1, max_size=2, timeout=0.2)
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+
+def test_pool_reuses_connections(pool):
+    """A returned connection is handed out again instead of reconnecting."""
+    with pool.connection() as conn:
+        first_pid = conn.get_backend_pid()
+    with pool.connection() as conn:
+        assert conn.get_backend_pid() == first_pid
+
+    stats = pool.stats()
+    assert stats["connections_created"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["in_use"] == 0
+
+
+def test_pool_times_out_when_exhausted(pool):
+    """Checkout fails with PoolTimeout once max_size connections are in use."""
+    first = pool.getconn()
+    second = pool.getconn()
+    try:
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+        assert pool.stats()["checkout_timeouts"] == 1
+    finally:
+        pool.putconn(first)
+        pool.putconn(second)
+
+
+def test_pool_replaces_broken_connection(pool):
+    """A connection that fails its health check is discarded on checkout."""
+    conn = pool.getconn()
+    broken_pid = conn.get_backend_pid()
+    pool.putconn(conn)
+    admin = psycopg2.connect(settings.database_url)
+    try:
+        with admin.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(%s)", (broken_pid,))
+    finally:
+        admin.close()
+
+    with pool.connection() as conn:
+        assert conn.get_backend_pid() != broken_pid
+    assert pool.stats()["health_check_failures"] >= 1
+
+
+def test_pool_closes_idle_connections_above_minimum():
+    """Idle connections beyond min_size are closed after max_idle seconds."""
+    pool = ConnectionPool(settings.database_url, min_size=0, max_size=2, max_idle=0)
+    try:
+        conn = pool.getconn()
+        pool.putconn(conn)
+        assert pool.stats()["idle"] == 1
+
+        with pool.connection():
+            pass
+        stats = pool.stats()
+        assert stats["connections_closed"] >= 1
+        assert stats["size"] == 1
+    finally:
+        pool.close()
+
+
+def test_pool_rolls_back_open_transaction(pool):
+    """Connections come back from the pool outside of any transaction."""
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+    with pool.connection() as conn:
+        assert conn.info.transaction_status == 0
@@ -0,0 +1,84 @@
+"""
+Tests for the COPY-based bulk export
+"""
+import csv
+import gzip
+import io
+
+import psycopg2
+import pyarrow.parquet as pq
+
+from app.core.config import settings
+from app.services.export import copy_query, stream_copy
+from scripts.export_storms import main as export_main
+
+
+def _rows(content: bytes) -> list[dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(content.decode("utf-8"))))
+
+
+def test_export_streams_gzip_csv(client):
+    response = client.get("/storms/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert "storms.csv.gz" in response.headers["content-disposition"]
+
+    rows = _rows(gzip.decompress(response.content))
+    assert len(rows) == 11
+    assert rows[0]["ID"] == "2020080N00001"
+    assert rows[0]["lat"] == "25"
+
+
+def test_export_filters_by_basin_and_season(client):
+    west_pacific = _rows(client.get("/storms/export", params={"basin": "WP", "compression": "none"}).content)
+    assert {row["name"] for row in west_pacific} == {"BETA"}
+    assert len(west_pacific) == 9
+
+    season_2020 = _rows(
+        client.get(
+            "/storms/export",
+            params={"season_from": 2020, "season_to": 2020, "compression": "none"},
+        ).content
+    )
+    assert {row["name"] for row in season_2020} == {"ALPHA"}
+
+
+def test_export_filters_are_quoted(client):
+    response = client.get("/storms/export", params={"basin": "x' OR ''='", "compression": "none"})
+    assert response.status_code == 200
+    assert _rows(response.content) == []
+
+
+def test_export_cli_writes_parquet(tmp_path, monkeypatch):
+    output = tmp_path / "storms.parquet"
+    monkeypatch.setattr("sys.argv", ["export_storms", "--output", str(output), "--basin", "WP"])
+    export_main()
+
+    table = pq.read_table(output)
+    assert table.num_rows == 9
+    assert table.column("wind").to_pylist()[7] is None
+    assert table.column("ATCF_ID").null_count == 9
+
+
+def test_export_cli_keeps_na_basin(tmp_path, monkeypatch):
+    output = tmp_path / "storms.parquet"
+    monkeypatch.setattr("sys.argv", ["export_storms", "--output", str(output), "--basin", "NA"])
+    export_main()
+
+    assert pq.read_table(output).column("basin").to_pylist() == ["NA", "NA"]
+
+
+def test_export_stream_can_be_abandoned():
+    """Closing the stream early cancels the COPY and leaves the connection usable."""
+    conn = psycopg2.connect(settings.database_url)
+    try:
+        chunks = stream_copy(conn, copy_query(conn), compress=False)
+        assert next(chunks).startswith(b"ID,")
+        chunks.close()
+
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+            assert cur.fetchone() == (1,)
+    finally:
+        conn.close()
@@ -0,0 +1,44 @@
+"""
+Tests for time series field projection
+"""
+from app.core.config import settings
+
+METADATA = {"ID", "ATCF_ID", "name", "basin", "subbasin", "season", "genesis"}
+
+
+def test_fields_limits_time_series(client):
+    full = client.get("/storms/2020/8").json()["storms"][0]
+    response = client.get("/storms/2020/8", params={"fields": "time,lat,lon,wind,classification"})
+    assert response.status_code == 200
+
+    storm = response.json()["storms"][0]
+    assert set(storm) == METADATA | {"time", "lat", "lon", "wind", "classification"}
+    for field in storm:
+        assert storm[field] == full[field]
+
+
+def test_fields_json_fast_path_matches(client, monkeypatch):
+    params = {"fields": "wind,time"}
+    validated = client.get("/storms/2020/8", params=params)
+    monkeypatch.setattr(settings, "STORM_JSON_FAST_PATH", True)
+    fast = client.get("/storms/2020/8", params=params)
+
+    assert fast.content == validated.content
+    assert set(fast.json()["storms"][0]) == METADATA | {"time", "wind"}
+
+
+def test_fields_with_simplification_drops_unrequested_track(client):
+    storm = client.get("/storms/2021/9", params={"fields": "time,wind", "zoom": 0}).json()["storms"][0]
+    assert set(storm) == METADATA | {"time", "wind"}
+    assert storm["wind"] == [25.0, 50.0, 35.0]
+
+
+def test_unknown_fields_are_rejected(client):
+    response = client.get("/storms/2020/8", params={"fields": "lat,pressure"})
+    assert response.status_code == 422
+    assert "pressure" in response.json()["detail"]
+
+
+def test_default_response_has_every_field(client):
+    storm = client.get("/storms/2020/8").json()["storms"][0]
+    assert "R64_NW" in storm and "agencies" in storm
@@ -0,0 +1,120 @@
+"""
+Tests for the Arrow IPC and MessagePack storm representations
+"""
+from datetime import datetime
+
+import msgpack
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from app.services.formats import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    negotiate_media_type,
+)
+
+FLOAT_SERIES = (
+    "lat", "lon", "wind", "mslp", "speed", "dist2land", "rmw",
+    "R34_NE", "R34_SE", "R34_SW", "R34_NW", "R50_NE", "R50_SE", "R50_SW", "R50_NW",
+    "R64_NE", "R64_SE", "R64_SW", "R64_NW",
+)
+
+
+def _isoformat(value: datetime) -> str:
+    return value.isoformat()
+
+
+def _from_micros(micros: int) -> str:
+    return (np.datetime64(micros, "us").astype(datetime)).isoformat()
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("text/html", JSON_MEDIA_TYPE),
+        (ARROW_MEDIA_TYPE, ARROW_MEDIA_TYPE),
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        (f"{ARROW_MEDIA_TYPE};q=0.5, application/json", JSON_MEDIA_TYPE),
+        (f"application/json;q=0.1, {MSGPACK_MEDIA_TYPE}", MSGPACK_MEDIA_TYPE),
+    ],
+)
+def test_negotiate_media_type(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+@pytest.mark.parametrize("month", ["2020/8", "2021/9", "2020/1"])
+def test_arrow_round_trip_matches_json(client, month):
+    expected = client.get(f"/storms/{month}").json()["storms"]
+    response = client.get(f"/storms/{month}", headers={"Accept": ARROW_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.schema.field("wind").type == pa.list_(pa.float64())
+    storms = table.to_pylist()
+    for storm in storms:
+        storm["genesis"] = _isoformat(storm["genesis"])
+        storm["time"] = [_isoformat(value) for value in storm["time"]]
+    assert storms == expected
+
+
+@pytest.mark.parametrize("month", ["2020/8", "2021/9", "2020/1"])
+def test_msgpack_round_trip_matches_json(client, month):
+    expected = client.get(f"/storms/{month}").json()["storms"]
+    response = client.get(f"/storms/{month}", headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+
+    document = msgpack.unpackb(response.content, raw=False)
+    offsets = np.frombuffer(document["offsets"], dtype="<i8")
+    metadata = document["metadata"]
+    genesis = np.frombuffer(metadata["genesis"], dtype="<i8")
+
+    series = {}
+    for field, column in document["series"].items():
+        if column["dtype"] == "float64":
+            values = np.frombuffer(column["data"], dtype="<f8").tolist()
+            if column["validity"] is not None:
+                valid = np.unpackbits(
+                    np.frombuffer(column["validity"], dtype=np.uint8), bitorder="little"
+                )[: len(values)]
+                values = [value if ok else None for value, ok in zip(values, valid)]
+            series[field] = values
+        elif column["dtype"] == "datetime64[us]":
+            series[field] = [_from_micros(int(v)) for v in np.frombuffer(column["data"], "<i8")]
+        else:
+            series[field] = column["data"]
+
+    storms = []
+    for i in range(document["length"]):
+        storm = {field: metadata[field][i] for field in ("ID", "ATCF_ID", "name", "basin", "subbasin", "season")}
+        storm["genesis"] = _from_micros(int(genesis[i]))
+        for field, values in series.items():
+            storm[field] = values[offsets[i]:offsets[i + 1]]
+        storms.append(storm)
+
+    assert [set(storm) for storm in storms] == [set(storm) for storm in expected]
+    assert storms == expected
+    assert set(FLOAT_SERIES) <= set(document["series"])
+
+
+def test_binary_formats_respect_fields(client):
+    response = client.get(
+        "/storms/2021/9", params={"fields": "time,wind"}, headers={"Accept": ARROW_MEDIA_TYPE}
+    )
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == [
+        "ID", "ATCF_ID", "name", "basin", "subbasin", "season", "genesis", "time", "wind"
+    ]
+    assert table.column("wind").to_pylist()[0][7] is None
+
+
+def test_representations_have_distinct_etags(client, set_dataset_version):
+    set_dataset_version(3, datetime(2021, 10, 1))
+    json_etag = client.get("/storms/2021/9").headers["etag"]
+    arrow_etag = client.get("/storms/2021/9", headers={"Accept": ARROW_MEDIA_TYPE}).headers["etag"]
+    assert json_etag != arrow_etag
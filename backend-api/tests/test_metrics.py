@@ -0,0 +1,97 @@
+"""
+Tests for stage timing, the Server-Timing header and /metrics
+"""
+import contextvars
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import HISTOGRAMS, Histogram
+from app.core.timing import add_rows, stage, start_request
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    # Build every payload, so the query stages run
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+def _stages(header: str) -> dict[str, float]:
+    entries = (entry.split(";dur=") for entry in header.split(", "))
+    return {name: float(duration) for name, duration in entries}
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", (0.1, 1.0), ("route",))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/a")
+    assert histogram.render() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1.0"} 3',
+        'test_seconds_bucket{route="/a",le="+Inf"} 4',
+        'test_seconds_sum{route="/a"} 6.05',
+        'test_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_stages_are_ignored_outside_a_timed_request():
+    with stage("sql"):
+        add_rows(3)
+
+    def request():
+        timings = start_request()
+        with stage("sql"):
+            add_rows(3)
+        with stage("sql"):
+            pass
+        return timings
+
+    # In a copy of the context, so the timings do not leak into other tests
+    timings = contextvars.copy_context().run(request)
+    assert list(timings.stages) == ["sql"]
+    assert timings.rows == 3
+    assert timings.server_timing().startswith("sql;dur=")
+
+
+def test_disabled_metrics_leave_responses_untouched(client):
+    response = client.get("/storms/2021/9")
+    assert "server-timing" not in response.headers
+    assert client.get("/metrics").status_code == 404
+
+
+@pytest.mark.parametrize("mode, stages", [
+    ("aggregate", {"sql", "validate", "encode", "compress", "total"}),
+    ("rows", {"sql", "group", "validate", "encode", "compress", "total"}),
+])
+def test_month_response_reports_stages(client, metrics, monkeypatch, mode, stages):
+    monkeypatch.setattr(settings, "STORM_QUERY_MODE", mode)
+    response = client.get("/storms/2021/9")
+    timings = _stages(response.headers["server-timing"])
+    # "admission" and "pool" depend on the deployment (the test client has its own connections)
+    assert stages <= set(timings) <= stages | {"admission", "pool"}
+    assert timings["total"] >= timings["sql"]
+
+
+def test_server_timing_can_be_turned_off(client, metrics, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", False)
+    assert "server-timing" not in client.get("/storms/2021/9").headers
+
+
+def test_metrics_endpoint_exports_histograms_and_stats(client, metrics):
+    client.get("/storms/2021/9")
+    client.get("/storms/1900/1")
+    body = client.get("/metrics").text
+
+    route = 'route="/storms/{year}/{month}"'
+    assert f'ibtracs_request_duration_seconds_count{{method="GET",{route},status="200"}} 2' in body
+    assert f'ibtracs_request_stage_seconds_count{{{route},stage="sql"}} 2' in body
+    # Only the month with storms read any rows
+    assert f"ibtracs_response_rows_count{{{route}}} 1" in body
+    assert f"ibtracs_response_size_bytes_count{{{route}}} 2" in body
+    for gauge in ("response_cache_hits", "tile_cache_bytes", "single_flight_coalesced", "admission_queue_depth"):
+        assert f"\nibtracs_{gauge} " in body
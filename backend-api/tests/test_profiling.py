@@ -0,0 +1,98 @@
+"""
+Tests for opt-in per-request profiling
+"""
+import pstats
+
+import asyncpg
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.storms_async import router as storms_async_router
+from app.core import profiling
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.profiling import ProfileRateLimiter
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", TOKEN)
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_MIN_INTERVAL", 0.0)
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(profiling, "profile_limiter", ProfileRateLimiter())
+    return tmp_path
+
+
+def _functions(path) -> set[str]:
+    return {function for _, _, function in pstats.Stats(str(path)).stats}
+
+
+def test_rate_limiter_spaces_profiles():
+    limiter = ProfileRateLimiter()
+    assert limiter.allow(60.0)
+    assert not limiter.allow(60.0)
+    assert limiter.allow(0.0)
+    assert limiter.stats() == {"profiles": 2, "rate_limited": 1}
+
+
+def test_profiled_request_saves_pstats(client, profiles):
+    expected = client.get("/storms/2021/9")
+    response = client.get("/storms/2021/9", headers={"X-Profile-Token": TOKEN})
+
+    assert response.status_code == 200
+    assert response.content == expected.content
+    assert "x-profile" not in expected.headers
+    name = response.headers["x-profile"]
+    assert "-storms_2021_9-" in name and name.endswith(".pstats")
+    assert [path.name for path in profiles.iterdir()] == [name]
+    # The handler ran in a threadpool thread; its work is in the profile
+    assert "get_month_payload" in _functions(profiles / name)
+
+
+@pytest.mark.parametrize("enabled, token, header", [
+    (False, TOKEN, TOKEN),
+    (True, None, ""),
+    (True, TOKEN, "wrong"),
+    (True, TOKEN, None),
+])
+def test_profiling_requires_flag_and_token(client, profiles, monkeypatch, enabled, token, header):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", enabled)
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", token)
+    headers = {} if header is None else {"X-Profile-Token": header}
+    response = client.get("/storms/2021/9", headers=headers)
+    assert response.status_code == 200
+    assert "x-profile" not in response.headers
+    assert list(profiles.iterdir()) == []
+
+
+def test_profiling_is_rate_limited(client, profiles, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_MIN_INTERVAL", 60.0)
+    headers = {"X-Profile-Token": TOKEN}
+    first = client.get("/storms/2021/9", headers=headers)
+    second = client.get("/storms/2021/10", headers=headers)
+    assert first.headers["x-profile"].endswith(".pstats")
+    assert second.status_code == 200
+    assert second.headers["x-profile"] == "rate-limited"
+    assert len(list(profiles.iterdir())) == 1
+
+
+def test_profiling_async_route(profiles):
+    async def get_test_async_db():
+        conn = await asyncpg.connect(settings.database_url)
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    app = FastAPI()
+    app.include_router(storms_async_router)
+    app.dependency_overrides[get_async_db] = get_test_async_db
+    response = TestClient(app).get("/storms/2021/9", headers={"X-Profile-Token": TOKEN})
+
+    assert response.status_code == 200
+    assert "get_month_payload" in _functions(profiles / response.headers["x-profile"])
@@ -0,0 +1,75 @@
+"""
+Tests for closest-approach search and the /storms/near endpoint
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.proximity import closest_approaches, haversine_km, search_box
+from app.services.spatial import SegmentGrid
+
+
+def test_haversine_matches_known_distances():
+    assert haversine_km(0.0, 0.0, 0.0, 1.0) == pytest.approx(111.195, abs=1e-3)
+    assert haversine_km(0.0, 179.5, 0.0, -179.5) == pytest.approx(111.195, abs=1e-3)
+    assert haversine_km(90.0, 0.0, -90.0, 0.0) == pytest.approx(20015.1, abs=0.1)
+
+
+def test_search_box_covers_poles_and_antimeridian():
+    assert search_box(89.5, 10.0, 200.0)[0::2] == (-180.0, 180.0)
+    west, _, east, _ = search_box(0.0, 179.9, 100.0)
+    assert west < 179.9 < 180.0 < east
+
+
+def test_closest_approach_between_observations_across_antimeridian():
+    lon = np.array([179.0, -179.0])
+    lat = np.array([10.0, 10.0])
+    grid = SegmentGrid(lon, lat, np.array([0, 2]))
+
+    approaches = closest_approaches(grid, 10.0, 180.0, 5.0)
+    assert approaches.storms.tolist() == [0]
+    # The great circle bulges slightly poleward of the parallel
+    assert approaches.distance_km[0] < 1.0
+    assert approaches.fraction[0] == pytest.approx(0.5)
+    assert abs(approaches.lon[0]) == pytest.approx(180.0)
+
+
+def test_near_endpoint_interpolates_closest_approach(client):
+    # Just north of the middle of BETA's segment from (20.02, 143) to (20.0, 144)
+    response = client.get("/storms/near", params={"lat": 20.3, "lon": 143.5, "radius_km": 40})
+    assert response.status_code == 200
+    (nearby,) = response.json()["storms"]
+    assert nearby["storm"]["name"] == "BETA"
+    assert nearby["distance_km"] == pytest.approx(32.16, abs=0.01)
+    assert nearby["closest_lat"] == pytest.approx(20.011, abs=0.001)
+    assert nearby["closest_lon"] == pytest.approx(143.49, abs=0.01)
+    # Between the 18:00 and 00:00 observations, about half way
+    closest_time = datetime.fromisoformat(nearby["closest_time"])
+    assert abs(closest_time - datetime(2021, 9, 1, 21)) < timedelta(minutes=5)
+    assert nearby["storm"] == client.get("/storms/2021/9").json()["storms"][0]
+
+    response = client.get("/storms/near", params={"lat": 20.3, "lon": 143.5, "radius_km": 30})
+    assert response.json()["storms"] == []
+
+
+def test_near_orders_by_distance_and_filters_on_genesis(client):
+    params = {"lat": 25.0, "lon": -75.0, "radius_km": 20_000, "fields": "wind"}
+    storms = client.get("/storms/near", params=params).json()["storms"]
+    assert [s["storm"]["name"] for s in storms] == ["ALPHA", "BETA"]
+    assert storms[0]["distance_km"] == pytest.approx(0.0, abs=1e-6)
+    assert storms[0]["closest_time"] == "2020-08-01T00:00:00"
+    assert "lat" not in storms[0]["storm"] and storms[0]["storm"]["wind"] == [40.0, 45.0]
+
+    params["start"] = "2021-01-01T00:00:00"
+    storms = client.get("/storms/near", params=params).json()["storms"]
+    assert [s["storm"]["name"] for s in storms] == ["BETA"]
+
+
+def test_near_validates_parameters(client):
+    for params in (
+        {"lat": 95, "lon": 0, "radius_km": 10},
+        {"lat": 0, "lon": 0, "radius_km": 0},
+        {"lat": 0, "lon": 0},
+    ):
+        assert client.get("/storms/near", params=params).status_code == 422
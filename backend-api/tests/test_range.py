@@ -0,0 +1,36 @@
+"""
+Tests for the streaming NDJSON range endpoint
+"""
+import json
+
+
+def test_range_streams_storms_as_ndjson(client):
+    response = client.get(
+        "/storms/range",
+        params={"start": "2020-01-01T00:00:00", "end": "2022-01-01T00:00:00", "itersize": 1},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = response.content.decode().splitlines()
+    storms = [json.loads(line) for line in lines]
+    assert [storm["ID"] for storm in storms] == ["2020080N00001", "2021244N20140"]
+    assert storms[0] == client.get("/storms/2020/8").json()["storms"][0]
+    assert storms[1] == client.get("/storms/2021/9").json()["storms"][0]
+
+
+def test_range_is_half_open(client):
+    response = client.get(
+        "/storms/range",
+        params={"start": "2020-08-01T00:00:00", "end": "2021-09-01T00:00:00"},
+    )
+    storms = [json.loads(line) for line in response.content.decode().splitlines()]
+    assert [storm["name"] for storm in storms] == ["ALPHA"]
+
+
+def test_range_rejects_inverted_bounds(client):
+    response = client.get(
+        "/storms/range",
+        params={"start": "2021-01-01T00:00:00", "end": "2020-01-01T00:00:00"},
+    )
+    assert response.status_code == 422
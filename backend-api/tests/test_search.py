@@ -0,0 +1,58 @@
+"""
+Tests for the prefix index and the /storms/search endpoint
+"""
+import numpy as np
+
+from app.services.search import PrefixIndex
+
+
+def test_prefix_index_matches_case_insensitively():
+    index = PrefixIndex([("KATRINA", 0), ("KATE", 1), ("Karl", 2), (None, 3), ("AL122005", 0)])
+    assert index.lookup("kat").tolist() == [0, 1]
+    assert index.lookup("KA").tolist() == [0, 1, 2]
+    assert index.lookup("al12").tolist() == [0]
+    assert index.lookup("katrinas").tolist() == []
+    assert isinstance(index.lookup("z"), np.ndarray)
+
+
+def test_search_matches_name_id_and_atcf_id(client):
+    def names(q: str) -> list[str]:
+        response = client.get("/storms/search", params={"q": q})
+        assert response.status_code == 200
+        return [storm["name"] for storm in response.json()["storms"]]
+
+    assert names("alp") == ["ALPHA"]
+    assert names("Beta") == ["BETA"]
+    assert names("al0120") == ["ALPHA"]
+    assert names("2021244") == ["BETA"]
+    assert names("gamma") == []
+
+
+def test_search_returns_summaries(client):
+    (storm,) = client.get("/storms/search", params={"q": "beta"}).json()["storms"]
+    assert storm == {
+        "ID": "2021244N20140",
+        "ATCF_ID": None,
+        "name": "BETA",
+        "basin": "WP",
+        "season": 2021,
+        "genesis": "2021-09-01T00:00:00",
+        "max_wind": 60.0,
+    }
+
+
+def test_search_is_keyset_paginated(client):
+    first = client.get("/storms/search", params={"q": "20", "limit": 1}).json()
+    assert [storm["ID"] for storm in first["storms"]] == ["2020080N00001"]
+    assert first["next_after"] == "2020080N00001"
+
+    second = client.get(
+        "/storms/search", params={"q": "20", "limit": 1, "after": first["next_after"]}
+    ).json()
+    assert [storm["ID"] for storm in second["storms"]] == ["2021244N20140"]
+    assert second["next_after"] is None
+
+
+def test_search_rejects_blank_queries(client):
+    assert client.get("/storms/search", params={"q": "  "}).status_code == 422
+    assert client.get("/storms/search", params={"q": "a", "limit": 0}).status_code == 422
@@ -0,0 +1,52 @@
+"""
+Tests for zoom-aware track simplification
+"""
+import numpy as np
+
+from app.services.simplify import douglas_peucker, tolerance_for_zoom
+
+
+def test_douglas_peucker_keeps_corners_and_endpoints():
+    lon = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 4.0, 4.0])
+    lat = np.array([0.0, 0.01, 0.0, 0.02, 0.0, 1.0, 2.0])
+
+    assert douglas_peucker(lon, lat, 0.1).tolist() == [0, 4, 6]
+    assert douglas_peucker(lon, lat, 0.005).tolist() == [0, 1, 2, 3, 4, 6]
+
+
+def test_douglas_peucker_short_or_zero_tolerance_is_identity():
+    assert douglas_peucker(np.array([0.0, 1.0]), np.array([0.0, 1.0]), 1.0).tolist() == [0, 1]
+    assert douglas_peucker(np.zeros(4), np.arange(4.0), 0).tolist() == [0, 1, 2, 3]
+
+
+def test_tolerance_for_zoom_halves_per_level():
+    assert tolerance_for_zoom(0) == 360 / 256
+    assert tolerance_for_zoom(3) == tolerance_for_zoom(2) / 2
+
+
+def test_storms_tolerance_decimates_every_series(client):
+    full = client.get("/storms/2021/9").json()["storms"][0]
+    response = client.get("/storms/2021/9", params={"tolerance": 0.1})
+    assert response.status_code == 200
+    simplified = response.json()["storms"][0]
+
+    assert len(full["lat"]) == 9
+    assert simplified["lat"] == [20.0, 20.0, 24.0]
+    assert simplified["lon"] == [140.0, 144.0, 144.0]
+    assert simplified["wind"] == [25.0, 50.0, 35.0]
+    assert simplified["time"] == [full["time"][i] for i in (0, 4, 8)]
+    for field in ("mslp", "classification", "basins", "agencies", "R64_NW"):
+        assert len(simplified[field]) == 3
+
+
+def test_storms_zoom_selects_tolerance(client):
+    world = client.get("/storms/2021/9", params={"zoom": 0}).json()["storms"][0]
+    street = client.get("/storms/2021/9", params={"zoom": 18}).json()["storms"][0]
+    assert len(world["lat"]) == 3
+    # Only the exactly collinear points on the northward leg are dropped
+    assert len(street["lat"]) == 6
+
+
+def test_storms_tolerance_and_zoom_are_exclusive(client):
+    response = client.get("/storms/2021/9", params={"zoom": 2, "tolerance": 0.5})
+    assert response.status_code == 422
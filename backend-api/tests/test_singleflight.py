@@ -0,0 +1,92 @@
+"""
+Tests for coalescing of concurrent identical requests
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.config import settings
+from app.core.singleflight import SingleFlight, month_flights
+from app.services.storm_service import StormService
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait()
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flights.do, "key", compute) for _ in range(8)]
+        _wait_for(lambda: flights.stats()["coalesced"] == 7)
+        release.set()
+        assert [future.result() for future in futures] == ["result"] * 8
+
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "executions": 1, "coalesced": 7}
+
+
+def test_waiters_receive_the_leaders_exception():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait()
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flights.do, "key", fail) for _ in range(3)]
+        _wait_for(lambda: flights.stats()["coalesced"] == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+
+    # A failed call is not remembered
+    assert flights.do("key", lambda: "retry") == "retry"
+
+
+def test_different_keys_run_separately():
+    flights = SingleFlight()
+    assert flights.do("a", lambda: 1) == 1
+    assert flights.do("b", lambda: 2) == 2
+    assert flights.stats()["executions"] == 2
+
+
+@pytest.mark.parametrize("cache_enabled", [True, False])
+def test_concurrent_month_requests_query_once(client, monkeypatch, cache_enabled):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", cache_enabled)
+    release = threading.Event()
+    builds = []
+    build = StormService._build_month_payload
+
+    def slow_build(self, *args):
+        builds.append(args)
+        release.wait()
+        return build(self, *args)
+
+    monkeypatch.setattr(StormService, "_build_month_payload", slow_build)
+    before = month_flights.stats()["coalesced"]
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(client.get, "/storms/2021/9") for _ in range(6)]
+        _wait_for(lambda: month_flights.stats()["coalesced"] - before == 5)
+        release.set()
+        responses = [future.result() for future in futures]
+
+    assert len(builds) == 1
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.content for response in responses}) == 1
@@ -0,0 +1,69 @@
+"""
+Tests for the interval index and the /snapshot endpoint
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.services.intervals import IntervalIndex
+from tests.conftest import _track_rows, make_dataset
+
+
+def test_interval_index_finds_containing_intervals():
+    starts = np.array([0, 5, 1, 30, 31])
+    ends = np.array([10, 6, 40, 32, 31])
+    index = IntervalIndex(starts, ends)
+
+    assert index.containing(5).tolist() == [0, 1, 2]
+    assert index.containing(31).tolist() == [2, 3, 4]
+    # Long-lived interval 2 started well before the others
+    assert index.containing(35).tolist() == [2]
+    assert index.containing(41).tolist() == []
+    assert IntervalIndex(np.array([]), np.array([])).containing(0).tolist() == []
+
+
+def test_snapshot_interpolates_between_observations(client):
+    response = client.get("/snapshot", params={"time": "2021-09-01T03:00:00"})
+    assert response.status_code == 200
+    snapshot = response.json()
+    assert snapshot["time"] == "2021-09-01T03:00:00"
+    (storm,) = snapshot["storms"]
+    assert storm["name"] == "BETA"
+    assert storm["lat"] == pytest.approx(20.005)
+    assert storm["lon"] == pytest.approx(140.5)
+    assert storm["wind"] == pytest.approx(27.5)
+    assert storm["mslp"] is None
+
+
+def test_snapshot_at_observation_keeps_missing_values(client):
+    (storm,) = client.get("/snapshot", params={"time": "2021-09-02T18:00:00"}).json()["storms"]
+    assert (storm["lat"], storm["lon"], storm["wind"]) == (23.0, 144.0, None)
+
+
+def test_snapshot_covers_storm_lifetime_only(client):
+    assert client.get("/snapshot", params={"time": "2021-09-03T00:00:00"}).json()["storms"] != []
+    assert client.get("/snapshot", params={"time": "2021-09-03T00:00:01"}).json()["storms"] == []
+    assert client.get("/snapshot", params={"time": "2021-08-31T23:59:59"}).json()["storms"] == []
+
+
+def test_snapshot_accepts_utc_offsets(client):
+    (storm,) = client.get("/snapshot", params={"time": "2021-09-01T05:00:00+02:00"}).json()["storms"]
+    assert storm["lon"] == pytest.approx(140.5)
+
+
+def test_positions_of_storm_formed_in_previous_month_across_antimeridian():
+    dataset = make_dataset(_track_rows(
+        "2022365N10179", None, "DELTA", datetime(2022, 12, 31, 12),
+        [(10.0, 179.0), (11.0, -179.0), (12.0, -177.0)],
+        [30.0, 40.0, 50.0],
+    ))
+    storms, values = dataset.positions_at(datetime(2022, 12, 31, 15))
+    assert storms.tolist() == [0]
+    assert values["lat"][0] == pytest.approx(10.5)
+    assert abs(values["lon"][0]) == pytest.approx(180.0)
+
+    storms, values = dataset.positions_at(datetime(2023, 1, 1, 0))
+    assert storms.tolist() == [0]
+    assert values["lon"][0] == pytest.approx(-177.0)
+    assert values["wind"][0] == pytest.approx(50.0)
@@ -0,0 +1,69 @@
+"""
+Tests for the track segment grid and the bounding-box endpoint
+"""
+import numpy as np
+
+from app.services.spatial import SegmentGrid
+
+
+def _grid(*tracks: list[tuple[float, float]]) -> SegmentGrid:
+    """Build a grid from (lon, lat) tracks."""
+    points = [point for track in tracks for point in track]
+    offsets = np.concatenate(([0], np.cumsum([len(track) for track in tracks])))
+    lon = np.array([lon for lon, _ in points])
+    lat = np.array([lat for _, lat in points])
+    return SegmentGrid(lon, lat, offsets)
+
+
+def test_grid_matches_segment_between_observations():
+    grid = _grid([(0.0, 0.0), (10.0, 0.0)], [(50.0, 50.0), (51.0, 51.0)])
+    assert grid.query_bbox(4.0, -1.0, 5.0, 1.0).tolist() == [0]
+    assert grid.query_bbox(4.0, 1.0, 5.0, 2.0).tolist() == []
+    assert grid.query_bbox(-180.0, -90.0, 180.0, 90.0).tolist() == [0, 1]
+
+
+def test_grid_handles_single_point_storms():
+    grid = _grid([(30.0, 10.0)], [(-60.0, 20.0), (-61.0, 21.0)])
+    assert grid.query_bbox(29.5, 9.5, 30.5, 10.5).tolist() == [0]
+
+
+def test_grid_does_not_join_consecutive_storms():
+    grid = _grid([(0.0, 0.0), (1.0, 0.0)], [(20.0, 0.0), (21.0, 0.0)])
+    assert grid.query_bbox(5.0, -1.0, 15.0, 1.0).tolist() == []
+
+
+def test_grid_unwraps_antimeridian_crossing():
+    # 178E -> 178W is a 4 degree hop across the antimeridian, not 356 degrees west
+    grid = _grid([(178.0, 10.0), (-178.0, 12.0)])
+    assert grid.query_bbox(179.0, 5.0, -179.0, 15.0).tolist() == [0]
+    assert grid.query_bbox(179.5, 5.0, 180.0, 15.0).tolist() == [0]
+    assert grid.query_bbox(-180.0, 5.0, -179.5, 15.0).tolist() == [0]
+    assert grid.query_bbox(0.0, 5.0, 10.0, 15.0).tolist() == []
+
+
+def test_bbox_endpoint_returns_intersecting_storms(client):
+    # Between BETA's (20, 143) and (20, 144) observations
+    response = client.get("/storms", params={"bbox": "143.4,19,143.6,21"})
+    assert response.status_code == 200
+    storms = response.json()["storms"]
+    assert [storm["name"] for storm in storms] == ["BETA"]
+    assert storms[0] == client.get("/storms/2021/9").json()["storms"][0]
+
+    response = client.get("/storms", params={"bbox": "-180,-90,180,90", "fields": "time"})
+    assert [storm["name"] for storm in response.json()["storms"]] == ["ALPHA", "BETA"]
+    assert set(response.json()["storms"][0]) == {
+        "ID", "ATCF_ID", "name", "basin", "subbasin", "season", "genesis", "time",
+    }
+
+
+def test_bbox_endpoint_filters_on_genesis(client):
+    params = {"bbox": "-180,-90,180,90", "start": "2021-01-01T00:00:00"}
+    assert [s["name"] for s in client.get("/storms", params=params).json()["storms"]] == ["BETA"]
+
+    params = {"bbox": "-180,-90,180,90", "end": "2021-01-01T00:00:00"}
+    assert [s["name"] for s in client.get("/storms", params=params).json()["storms"]] == ["ALPHA"]
+
+
+def test_bbox_endpoint_rejects_malformed_boxes(client):
+    for bbox in ("1,2,3", "a,b,c,d", "0,10,10,5", "0,0,190,10", "0,-95,10,0"):
+        assert client.get("/storms", params={"bbox": bbox}).status_code == 422
@@ -0,0 +1,108 @@
+"""
+Tests for the vector tile endpoint and encoder
+"""
+from datetime import datetime
+
+import mapbox_vector_tile
+import pytest
+
+from app.core.cache import tile_cache
+from app.services.columnar import columnar_engine
+from app.services.tiles import TILE_MEDIA_TYPE, render_tile, tile_metrics
+from tests.conftest import _track_rows, make_dataset
+
+
+@pytest.fixture(autouse=True)
+def clear_tile_cache():
+    tile_cache.clear()
+
+
+def _decode(body: bytes) -> dict:
+    return mapbox_vector_tile.decode(body, default_options={"y_coord_down": True})
+
+
+def test_world_tile_contains_every_track(client):
+    response = client.get("/tiles/0/0/0.mvt")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == TILE_MEDIA_TYPE
+
+    features = _decode(response.content)["storms"]["features"]
+    properties = {feature["properties"]["name"]: feature["properties"] for feature in features}
+    assert properties["BETA"] == {
+        "ID": "2021244N20140", "name": "BETA", "season": 2021, "basin": "WP", "max_wind": 60.0,
+    }
+    assert properties["ALPHA"]["max_wind"] == 45.0
+    # BETA's nine points collapse to its two legs at zoom 0
+    beta = next(f for f in features if f["properties"]["name"] == "BETA")
+    assert len(beta["geometry"]["coordinates"]) == 3
+
+
+def test_tile_without_tracks_is_empty(client):
+    response = client.get("/tiles/3/0/0.mvt")
+    assert response.status_code == 200
+    assert response.content == b""
+
+
+def test_tile_filters_on_genesis(client):
+    body = client.get("/tiles/0/0/0.mvt", params={"start": "2021-01-01T00:00:00"}).content
+    assert [f["properties"]["name"] for f in _decode(body)["storms"]["features"]] == ["BETA"]
+
+
+def test_tile_clips_track_to_buffer(client):
+    # Zoom 7 tile holding BETA's eastward leg; its end lies just past the east edge
+    features = _decode(client.get("/tiles/7/113/56.mvt").content)["storms"]["features"]
+    assert len(features) == 1
+    for x, y in features[0]["geometry"]["coordinates"]:
+        assert -64 <= x <= 4096 + 64 and -64 <= y <= 4096 + 64
+
+
+def test_tile_rejects_out_of_range_coordinates(client):
+    assert client.get("/tiles/2/4/0.mvt").status_code == 404
+    assert client.get("/tiles/23/0/0.mvt").status_code == 422
+
+
+def test_tiles_are_cached_and_instrumented(client):
+    before = tile_metrics.stats()
+    first = client.get("/tiles/1/1/0.mvt").content
+    assert client.get("/tiles/1/1/0.mvt").content == first
+
+    after = tile_metrics.stats()
+    assert after["tiles_rendered"] == before["tiles_rendered"] + 1
+    assert after["bytes_total"] == before["bytes_total"] + len(first)
+    assert after["render_seconds_total"] > before["render_seconds_total"]
+    assert tile_cache.stats()["entries"] == 1
+
+
+def test_tile_revalidates_with_dataset_version(client, set_dataset_version):
+    set_dataset_version(5, datetime(2024, 1, 1))
+    response = client.get("/tiles/0/0/0.mvt")
+    etag = response.headers["etag"]
+    assert client.get("/tiles/0/0/0.mvt", headers={"If-None-Match": etag}).status_code == 304
+
+
+
+def test_tile_validators_follow_the_rendered_snapshot(client, set_dataset_version):
+    set_dataset_version(5, datetime(2024, 1, 1))
+    old = client.get("/tiles/0/0/0.mvt")
+
+    set_dataset_version(6, datetime(2024, 1, 2))
+    # While another request reloads, tiles are rendered from the version 5 snapshot
+    with columnar_engine._load_lock:
+        during = client.get("/tiles/0/0/0.mvt")
+    assert during.headers["etag"] == old.headers["etag"]
+
+    after = client.get("/tiles/0/0/0.mvt", headers={"If-None-Match": during.headers["etag"]})
+    assert after.status_code == 200
+
+def test_track_crossing_antimeridian_is_drawn_on_both_sides():
+    dataset = make_dataset(_track_rows(
+        "2022001N10178", None, "GAMMA", datetime(2022, 1, 1),
+        [(10.0, 178.0), (10.0, 179.5), (10.0, -179.5), (10.0, -178.0)],
+        [30.0, 35.0, 40.0, 45.0],
+    ))
+    west = _decode(render_tile(dataset, 1, 0, 0))["storms"]["features"]
+    east = _decode(render_tile(dataset, 1, 1, 0))["storms"]["features"]
+
+    # 178E -> 178W continues eastwards off the east tile and into the west one
+    assert east[0]["geometry"]["coordinates"] == [[4050, 3867], [4142, 3867]]
+    assert west[0]["geometry"]["coordinates"] == [[-46, 3867], [46, 3867]]
@@ -69,7 +69,53 @@ def create_schema(conn):
             CREATE INDEX IF NOT EXISTS idx_storms_id ON storms("ID")
         """)
         
+        # Create index matching the backend's month lookup
+        # (half-open genesis range, ordered by "ID", time)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_storms_genesis ON storms(genesis, "ID", time)
+        """)
+        
+        # Single-row table holding the dataset version; the backend keys its
+        # response caches on it, so it must change whenever storms change
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS dataset_metadata (
+                id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+                version BIGINT NOT NULL,
+                updated_at TIMESTAMP NOT NULL
+            )
+        """)
+        
+        conn.commit()
+
+
+def get_dataset_version(conn) -> Optional[int]:
+    """
+    Get the current dataset version.
+    Returns None if the updater has never completed a run.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT version FROM dataset_metadata")
+        result = cur.fetchone()
+        return result[0] if result else None
+
+
+def bump_dataset_version(conn) -> int:
+    """
+    Increment the dataset version and record the update time.
+    Returns the new version.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO dataset_metadata (id, version, updated_at)
+            VALUES (TRUE, 1, NOW() AT TIME ZONE 'UTC')
+            ON CONFLICT (id) DO UPDATE SET
+                version = dataset_metadata.version + 1,
+                updated_at = EXCLUDED.updated_at
+            RETURNING version
+        """)
+        version = cur.fetchone()[0]
         conn.commit()
+        return version
 
 
 def get_latest_track_date(conn) -> Optional[datetime]:
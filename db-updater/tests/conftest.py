@@ -104,6 +104,7 @@ def clean_db(db_connection):
     """Clean the database before each test"""
     with db_connection.cursor() as cur:
         cur.execute("DROP TABLE IF EXISTS storms CASCADE")
+        cur.execute("DROP TABLE IF EXISTS dataset_metadata CASCADE")
         db_connection.commit()
     yield db_connection
 
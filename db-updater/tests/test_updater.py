@@ -9,7 +9,9 @@ from database import (
     create_schema,
     get_latest_track_date,
     insert_track_points,
-    get_connection
+    get_connection,
+    get_dataset_version,
+    bump_dataset_version
 )
 from csv_parser import parse_ibtracs_csv
 # Import updater function in test that uses it to avoid issues
@@ -148,4 +150,57 @@ def test_full_update(clean_db):
         cur.execute("SELECT COUNT(*) FROM storms")
         count = cur.fetchone()[0]
         assert count > 0, "Should have inserted some track points"
+    
+    # A successful run bumps the dataset version
+    assert get_dataset_version(clean_db) == 1
+
 
+def test_noop_update_keeps_dataset_version(clean_db):
+    """Test that a run without new track points leaves the dataset version unchanged"""
+    test_csv = Path(__file__).parent.parent / "tests" / "data" / "ibtracs_sample.csv"
+    
+    if not test_csv.exists():
+        pytest.skip(f"Test CSV not found at {test_csv}. Run scripts/create_test_data.py first.")
+    
+    import importlib
+    import config
+    import database
+    importlib.reload(config)
+    importlib.reload(database)
+    from updater import update_database
+    
+    update_database(csv_path=str(test_csv))
+    assert get_dataset_version(clean_db) == 1
+    
+    # The same archive again has nothing newer than the latest track point
+    update_database(csv_path=str(test_csv))
+    assert get_dataset_version(clean_db) == 1
+
+
+
+def test_genesis_index_serves_month_query(clean_db):
+    """Test that a half-open genesis range is answered from idx_storms_genesis"""
+    create_schema(clean_db)
+    
+    with clean_db.cursor() as cur:
+        # Force the planner to use an index whenever one can serve the query
+        cur.execute("SET enable_seqscan = off")
+        cur.execute("""
+            EXPLAIN SELECT * FROM storms
+            WHERE genesis >= %s AND genesis < %s
+            ORDER BY "ID", time
+        """, (datetime(2020, 8, 1), datetime(2020, 9, 1)))
+        plan = "\n".join(row[0] for row in cur.fetchall())
+    
+    assert "idx_storms_genesis" in plan
+    assert "Seq Scan" not in plan
+
+
+def test_dataset_version_bump(clean_db):
+    """Test that the dataset version starts empty and increments on each bump"""
+    create_schema(clean_db)
+    assert get_dataset_version(clean_db) is None
+    
+    assert bump_dataset_version(clean_db) == 1
+    assert bump_dataset_version(clean_db) == 2
+    assert get_dataset_version(clean_db) == 2
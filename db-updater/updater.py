@@ -18,7 +18,8 @@ from database import (
     create_schema,
     get_latest_track_date,
     delete_storm_track_points,
-    insert_track_points
+    insert_track_points,
+    bump_dataset_version
 )
 from csv_parser import parse_ibtracs_csv
 
@@ -68,6 +69,8 @@ def update_database(csv_path: str = None):
     1. Fetches the latest IBTrACS archive data (or uses provided CSV)
     2. Processes and validates the data
     3. Updates the database with new/changed records
+    4. Bumps the dataset version so API caches are invalidated, but only
+       when rows were actually inserted, updated or deleted
     """
     print(f"[{datetime.now()}] Starting IBTrACS database update...")
     
@@ -103,7 +106,9 @@ def update_database(csv_path: str = None):
         track_points = parse_ibtracs_csv(csv_path, start_date=latest_date)
         
         if not track_points:
+            # Nothing changed: keep the version so API caches and client ETags stay valid
             print("No new track points to add.")
+            print("Dataset version unchanged")
             return
         
         print(f"Found {len(track_points)} new track points to insert")
@@ -118,6 +123,7 @@ def update_database(csv_path: str = None):
         
         # For storms that have new data, delete existing points after latest_date
         # This handles cases where a storm's track is updated
+        deleted_total = 0
         if latest_date:
             print("Cleaning up updated storm tracks...")
             for storm_id, points in storms_to_update.items():
@@ -126,6 +132,7 @@ def update_database(csv_path: str = None):
                 if min_new_date <= latest_date:
                     # This storm has updates, delete points after latest_date
                     deleted = delete_storm_track_points(conn, storm_id, latest_date)
+                    deleted_total += deleted
                     if deleted > 0:
                         print(f"  Deleted {deleted} old track points for storm {storm_id}")
         
@@ -143,6 +150,12 @@ def update_database(csv_path: str = None):
             except:
                 pass
         
+        if inserted or deleted_total:
+            version = bump_dataset_version(conn)
+            print(f"Dataset version is now {version}")
+        else:
+            print("Dataset version unchanged")
+        
         print(f"[{datetime.now()}] Database update completed successfully.")
         
     except Exception as e: